@@ -185,7 +185,7 @@ class Settings(BaseSettings):
     )
 
     # === Machine Identification ===
-    machine_id: Optional[str] = Field(
+    machine_id: str | None = Field(
         default=None,
         description="Unique identifier for this machine",
     )
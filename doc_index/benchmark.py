@@ -0,0 +1,254 @@
+"""Throughput benchmarks for the document index."""
+
+import time
+
+import numpy as np
+
+from doc_index.chunker import DocumentChunk
+from doc_index.quantization import VECTOR_TYPES, bytes_per_vector, dequantize, quantize
+from doc_index.vector_store import DragonflyVectorStore
+
+
+def synthetic_chunks(count: int, dimension: int = 768, seed: int = 0):
+    """
+    Generate synthetic chunks and embeddings.
+
+    Args:
+        count: Number of chunks
+        dimension: Embedding dimension
+        seed: RNG seed for reproducible vectors
+
+    Returns:
+        Tuple of (chunks, embeddings matrix)
+    """
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((count, dimension), dtype=np.float32)
+    chunks = [
+        DocumentChunk(
+            chunk_id=f"bench-{i}",
+            source=f"bench/doc-{i // 10}.md",
+            content=f"Synthetic benchmark chunk {i}",
+            start_pos=0,
+            end_pos=0,
+        )
+        for i in range(count)
+    ]
+    return chunks, embeddings
+
+
+def benchmark_add_chunks(
+    store: DragonflyVectorStore,
+    count: int = 10_000,
+    dimension: int = 768,
+    batch_size: int | None = None,
+) -> dict:
+    """
+    Measure bulk write throughput of a vector store.
+
+    Args:
+        store: Vector store to write into
+        count: Number of synthetic chunks
+        dimension: Embedding dimension
+        batch_size: Chunks per pipeline (defaults to store.batch_size)
+
+    Returns:
+        Dict with chunk count, elapsed seconds and chunks/sec
+    """
+    chunks, embeddings = synthetic_chunks(count, dimension)
+
+    started = time.perf_counter()
+    written = store.add_chunks(chunks, embeddings, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "chunks": written,
+        "batch_size": batch_size or store.batch_size,
+        "seconds": elapsed,
+        "chunks_per_sec": written / elapsed if elapsed else 0.0,
+    }
+
+
+def benchmark_search(
+    store,
+    count: int = 100_000,
+    dimension: int = 768,
+    queries: int = 50,
+    top_k: int = 10,
+) -> dict:
+    """
+    Measure search latency of a vector store filled with synthetic chunks.
+
+    Args:
+        store: Empty vector store to fill and query
+        count: Number of synthetic chunks
+        dimension: Embedding dimension
+        queries: Number of timed queries
+        top_k: Results per query
+
+    Returns:
+        Dict with chunk and query counts and p50/p95 latency in ms
+    """
+    chunks, embeddings = synthetic_chunks(count, dimension)
+    store.create_index(dimension)
+    store.add_chunks(chunks, embeddings)
+
+    query_vectors = synthetic_chunks(queries, dimension, seed=1)[1]
+    latencies = []
+    for vector in query_vectors:
+        started = time.perf_counter()
+        store.search(vector, top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "chunks": count,
+        "queries": queries,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def _latency_ms(store, query_vectors: np.ndarray, top_k: int) -> tuple[list[list[str]], list]:
+    """Run queries, returning result IDs and per-query latency in ms."""
+    ids, latencies = [], []
+    for vector in query_vectors:
+        started = time.perf_counter()
+        results = store.search(vector, top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        ids.append([result["chunk_id"] for result in results])
+    return ids, latencies
+
+
+def benchmark_recall(
+    flat_store,
+    ann_store,
+    count: int = 5_000,
+    dimension: int = 128,
+    queries: int = 50,
+    top_k: int = 10,
+    ef_values: tuple[int, ...] = (10, 50, 100, 200),
+) -> dict:
+    """
+    Compare an HNSW store's recall and latency against FLAT ground truth.
+
+    Both stores are filled with the same synthetic corpus; the HNSW store
+    is then queried once per EF_RUNTIME value.
+
+    Args:
+        flat_store: Empty store with a FLAT index (exact results)
+        ann_store: Empty store with an HNSW index
+        count: Number of synthetic chunks
+        dimension: Embedding dimension
+        queries: Number of timed queries
+        top_k: Results per query
+        ef_values: EF_RUNTIME values to sweep
+
+    Returns:
+        Dict with build time, FLAT latency and one recall/latency row per EF
+    """
+    chunks, embeddings = synthetic_chunks(count, dimension)
+    query_vectors = synthetic_chunks(queries, dimension, seed=1)[1]
+
+    flat_store.create_index(dimension)
+    flat_store.add_chunks(chunks, embeddings)
+    ann_store.create_index(dimension)
+    started = time.perf_counter()
+    ann_store.add_chunks(chunks, embeddings)
+    build_seconds = time.perf_counter() - started
+
+    truth, flat_latencies = _latency_ms(flat_store, query_vectors, top_k)
+
+    runs = []
+    for ef in ef_values:
+        ann_store.index_config.ef_runtime = ef
+        found, latencies = _latency_ms(ann_store, query_vectors, top_k)
+        hits = sum(len(set(expected) & set(got)) for expected, got in zip(truth, found))
+        runs.append({
+            "ef_runtime": ef,
+            "recall": hits / sum(len(expected) for expected in truth),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+        })
+
+    return {
+        "chunks": count,
+        "build_seconds": build_seconds,
+        "flat_p50_ms": float(np.percentile(flat_latencies, 50)),
+        "runs": runs,
+    }
+
+
+def _exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Row indices of the k most cosine-similar vectors per query."""
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    similarities = queries @ vectors.T
+    return np.argsort(-similarities, axis=1)[:, :k]
+
+
+def benchmark_quantization(
+    count: int = 20_000,
+    dimension: int = 768,
+    queries: int = 100,
+    top_k: int = 10,
+    rerank_factor: int = 4,
+) -> list[dict]:
+    """
+    Measure recall lost by storing vectors at reduced precision.
+
+    Queries are quantized like stored vectors, mirroring a server-side
+    KNN search on the quantized field; the re-rank column re-scores
+    top_k * rerank_factor candidates against the float32 vectors.
+
+    Args:
+        count: Number of synthetic vectors
+        dimension: Embedding dimension
+        queries: Number of queries
+        top_k: Results per query
+        rerank_factor: Candidate multiplier for the re-rank column
+
+    Returns:
+        One dict per vector type with bytes per vector, compression ratio
+        and recall@k with and without re-ranking
+    """
+    vectors = synthetic_chunks(count, dimension)[1]
+    query_vectors = synthetic_chunks(queries, dimension, seed=1)[1]
+    query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+    truth = _exact_top_k(vectors, query_vectors, top_k)
+
+    rows = []
+    for vector_type in VECTOR_TYPES:
+        stored = dequantize(*quantize(vectors, vector_type))
+        searched = dequantize(*quantize(query_vectors, vector_type))
+        candidates = _exact_top_k(stored, searched, top_k * rerank_factor)
+
+        reranked = []
+        for query, ids in zip(query_vectors, candidates):
+            exact = vectors[ids] @ query / np.linalg.norm(vectors[ids], axis=1)
+            reranked.append(ids[np.argsort(-exact)[:top_k]])
+
+        def recall(found) -> float:
+            hits = sum(len(set(t) & set(f[:top_k])) for t, f in zip(truth, found))
+            return hits / truth.size
+
+        size = bytes_per_vector(dimension, vector_type)
+        rows.append({
+            "vector_type": vector_type,
+            "bytes_per_vector": size,
+            "compression": dimension * 4 / size,
+            "recall": recall(candidates),
+            "recall_reranked": recall(reranked),
+        })
+    return rows
+
+
+def in_process_client():
+    """
+    Create an in-process Redis stand-in for benchmarks.
+
+    Requires the optional fakeredis package.
+    """
+    try:
+        import fakeredis
+    except ImportError as e:
+        raise RuntimeError("In-process benchmarks require fakeredis (pip install fakeredis)") from e
+
+    return fakeredis.FakeRedis(decode_responses=True)
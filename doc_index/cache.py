@@ -1,31 +1,170 @@
 """Caching layer for embeddings."""
 
+import hashlib
 import json
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
 
+import numpy as np
 import redis
+import redis.asyncio
+
+# Prefix marking packed float32 values; legacy entries are JSON text
+BINARY_MAGIC = b"\x00f4"
+
+
+def encode_embedding(embedding: list[float]) -> bytes:
+    """Pack an embedding as little-endian float32 bytes."""
+    return BINARY_MAGIC + np.asarray(embedding, dtype="<f4").tobytes()
+
+
+def decode_embedding(value: bytes) -> list[float]:
+    """Unpack an embedding stored as float32 bytes or legacy JSON."""
+    if value.startswith(BINARY_MAGIC):
+        return np.frombuffer(value, dtype="<f4", offset=len(BINARY_MAGIC)).tolist()
+    return json.loads(value)
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache bounded by total entry size in bytes."""
+
+    def __init__(self, max_bytes: int, ttl: float | None = None):
+        """
+        Initialize LRU cache.
+
+        Args:
+            max_bytes: Evict least recently used entries beyond this size
+            ttl: Seconds an entry stays valid (None for no expiry)
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.current_bytes = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[Any, int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        """Get a value and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] and entry[2] < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, value: Any, size: int):
+        """Insert a value of the given size, evicting old entries as needed."""
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, expires_at)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def pop(self, key: str):
+        """Remove a key if present."""
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _drop(self, key: str):
+        """Remove a key (lock must be held)."""
+        _value, size, _expires_at = self._entries.pop(key)
+        self.current_bytes -= size
 
 
 class EmbeddingCache:
-    """Cache embeddings in Redis."""
+    """
+    Cache embeddings in Redis behind an in-process LRU.
+
+    The local tier holds packed vectors for hot texts (e.g. repeated search
+    queries) and is checked before Redis; it is per-process, so entries
+    invalidated by another process linger locally until evicted or expired.
+    """
 
-    def __init__(self, namespace: str = "embeddings", ttl: int = 86400):
+    def __init__(
+        self,
+        namespace: str = "embeddings",
+        ttl: int = 86400,
+        client: redis.Redis | None = None,
+        local_max_bytes: int = 64 * 1024 * 1024,
+        generational: bool = False,
+        generation_refresh: float = 5.0,
+    ):
         """
         Initialize cache.
 
         Args:
             namespace: Cache namespace
             ttl: Time to live in seconds (default 24 hours)
+            client: Pre-built Redis client; must not decode responses
+            local_max_bytes: Size bound of the in-process tier (0 disables it)
+            generational: Prefix keys with a namespace generation so clear()
+                          is a single INCR; old generations expire via TTL
+            generation_refresh: Seconds between re-reads of the generation,
+                                i.e. how long other processes may keep
+                                serving a cleared generation
         """
-        self.client = redis.Redis(host="localhost", port=6379, decode_responses=True)
+        self.client = client or redis.Redis(host="localhost", port=6379)
         self.namespace = namespace
         self.ttl = ttl
+        self.local = LRUCache(local_max_bytes, ttl=ttl) if local_max_bytes else None
+        self._stats = {"local_hits": 0, "local_misses": 0, "redis_hits": 0, "redis_misses": 0}
+        # Lookups run from several embed threads; += on a dict entry is not atomic
+        self._stats_lock = threading.Lock()
 
-    def _key(self, text: str) -> str:
-        """Generate cache key."""
-        import hashlib
+        self.generational = generational
+        self.generation_refresh = generation_refresh
+        self._generation = 0
+        self._generation_read_at = float("-inf")
+
+    @property
+    def generation_key(self) -> str:
+        """Key holding the namespace generation (outside the entry keyspace)."""
+        return f"cache-generation:{self.namespace}"
 
+    def _prefix(self) -> str:
+        """Key prefix for entries, including the generation if enabled."""
+        if not self.generational:
+            return f"cache:{self.namespace}:"
+
+        if time.monotonic() - self._generation_read_at > self.generation_refresh:
+            self._use_generation(int(self.client.get(self.generation_key) or 0))
+        return f"cache:{self.namespace}:g{self._generation}:"
+
+    def _use_generation(self, generation: int):
+        """Switch to a freshly read generation, dropping local entries of the old one."""
+        if generation != self._generation and self.local is not None:
+            self.local.clear()
+        self._generation = generation
+        self._generation_read_at = time.monotonic()
+
+    def _key(self, text: str, prefix: str | None = None) -> str:
+        """Generate cache key."""
         text_hash = hashlib.sha256(text.encode()).hexdigest()
-        return f"cache:{self.namespace}:{text_hash}"
+        return f"{prefix or self._prefix()}{text_hash}"
 
     def get(self, text: str) -> list[float] | None:
         """
@@ -37,13 +176,81 @@ class EmbeddingCache:
         Returns:
             Embedding if cached, None otherwise
         """
-        key = self._key(text)
-        value = self.client.get(key)
+        return self.get_many([text])[0]
 
-        if value is None:
-            return None
+    def get_many(self, texts: list[str]) -> list[list[float] | None]:
+        """
+        Get cached embeddings for many texts in one MGET round trip.
+
+        Legacy JSON entries are decoded and rewritten in the binary format.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Embeddings in input order, None for misses
+        """
+        if not texts:
+            return []
 
-        return json.loads(value)
+        prefix = self._prefix()
+        keys = [self._key(text, prefix) for text in texts]
+        values, remote = self._lookup_local(keys)
+
+        legacy = {}
+        if remote:
+            fetched = self.client.mget([keys[i] for i in remote])
+            legacy = self._absorb_remote(keys, values, remote, fetched)
+
+        if legacy:
+            self._set_keys(legacy)
+
+        return [decode_embedding(value) if value is not None else None for value in values]
+
+    def _lookup_local(self, keys: list[str]) -> tuple[list[bytes | None], list[int]]:
+        """Check the local tier; returns (values, indexes that must go to Redis)."""
+        values: list[bytes | None] = [None] * len(keys)
+        if self.local is None:
+            return values, list(range(len(keys)))
+
+        remote = []
+        for i, key in enumerate(keys):
+            values[i] = self.local.get(key)
+            if values[i] is None:
+                remote.append(i)
+        with self._stats_lock:
+            self._stats["local_hits"] += len(keys) - len(remote)
+            self._stats["local_misses"] += len(remote)
+        return values, remote
+
+    def _absorb_remote(
+        self,
+        keys: list[str],
+        values: list[bytes | None],
+        remote: list[int],
+        fetched: list[bytes | None],
+    ) -> dict[str, list[float]]:
+        """
+        Fill values from an MGET reply and warm the local tier.
+
+        Returns:
+            Legacy JSON entries (key -> embedding) to rewrite as binary
+        """
+        legacy = {}
+        for i, value in zip(remote, fetched):
+            if value is None:
+                continue
+            if not value.startswith(BINARY_MAGIC):
+                legacy[keys[i]] = json.loads(value)
+                value = encode_embedding(legacy[keys[i]])
+            values[i] = value
+            if self.local is not None:
+                self.local.put(keys[i], value, len(value))
+        hits = sum(1 for i in remote if values[i] is not None)
+        with self._stats_lock:
+            self._stats["redis_hits"] += hits
+            self._stats["redis_misses"] += len(remote) - hits
+        return legacy
 
     def set(self, text: str, embedding: list[float]):
         """
@@ -53,9 +260,78 @@ class EmbeddingCache:
             text: Text content
             embedding: Embedding vector
         """
-        key = self._key(text)
-        value = json.dumps(embedding)
-        self.client.setex(key, self.ttl, value)
+        self.set_many([text], [embedding])
+
+    def set_many(self, texts: list[str], embeddings: list[list[float]]):
+        """
+        Cache many embeddings with pipelined SETEX.
+
+        Args:
+            texts: Text contents
+            embeddings: Embedding vectors, one per text
+        """
+        prefix = self._prefix()
+        self._set_keys({self._key(text, prefix): emb for text, emb in zip(texts, embeddings)})
+
+    def _set_keys(self, entries: dict[str, list[float]]):
+        """Write key -> embedding entries in one pipeline."""
+        if not entries:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_sets(pipe, entries)
+        pipe.execute()
+
+    def _queue_sets(self, pipe, entries: dict[str, list[float]]):
+        """Queue SETEX per entry and put the packed values in the local tier."""
+        for key, embedding in entries.items():
+            value = encode_embedding(embedding)
+            pipe.setex(key, self.ttl, value)
+            if self.local is not None:
+                self.local.put(key, value, len(value))
+
+    def migrate(self, scan_count: int = 1000) -> int:
+        """
+        Rewrite all legacy JSON entries in the namespace as float32 bytes.
+
+        Remaining TTLs are preserved.
+
+        Args:
+            scan_count: COUNT hint per SCAN call
+
+        Returns:
+            Number of entries migrated
+        """
+        migrated = 0
+        keys = []
+
+        def migrate_batch(batch: list) -> int:
+            values = self.client.mget(batch)
+            ttl_pipe = self.client.pipeline(transaction=False)
+            legacy = [
+                (key, value) for key, value in zip(batch, values)
+                if value is not None and not value.startswith(BINARY_MAGIC)
+            ]
+            for key, _value in legacy:
+                ttl_pipe.ttl(key)
+            ttls = ttl_pipe.execute()
+
+            pipe = self.client.pipeline(transaction=False)
+            for (key, value), ttl in zip(legacy, ttls):
+                if ttl == -2:
+                    continue  # Expired since MGET
+                pipe.setex(key, ttl if ttl > 0 else self.ttl, encode_embedding(json.loads(value)))
+            pipe.execute()
+            return len(legacy)
+
+        for key in self.client.scan_iter(match=f"cache:{self.namespace}:*", count=scan_count):
+            keys.append(key)
+            if len(keys) >= scan_count:
+                migrated += migrate_batch(keys)
+                keys = []
+
+        if keys:
+            migrated += migrate_batch(keys)
+        return migrated
 
     def invalidate(self, text: str):
         """
@@ -65,11 +341,331 @@ class EmbeddingCache:
             text: Text to invalidate
         """
         key = self._key(text)
+        if self.local is not None:
+            self.local.pop(key)
         self.client.delete(key)
 
-    def clear(self):
-        """Clear all cached embeddings in namespace."""
+    def clear(self, scan_count: int = 1000):
+        """
+        Clear all cached embeddings in namespace.
+
+        In generational mode this bumps the generation in O(1) and leaves
+        old entries to expire; otherwise it runs clear_incremental to the end.
+
+        Args:
+            scan_count: COUNT hint per SCAN call
+        """
+        if self.local is not None:
+            self.local.clear()
+
+        if self.generational:
+            self._generation = self.client.incr(self.generation_key)
+            self._generation_read_at = time.monotonic()
+            return
+
+        cursor, _deleted = self.clear_incremental(scan_count=scan_count)
+        while cursor:
+            cursor, _deleted = self.clear_incremental(cursor, scan_count=scan_count)
+
+    def clear_incremental(
+        self,
+        cursor: int = 0,
+        scan_count: int = 1000,
+        max_steps: int | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> tuple[int, int]:
+        """
+        Delete namespace entries with cursor-based SCAN and batched UNLINK.
+
+        Each step scans about scan_count keys and frees the matches with one
+        UNLINK, so the server never blocks on a large keyspace. Pass the
+        returned cursor back in to resume an interrupted clear.
+
+        Args:
+            cursor: SCAN cursor to resume from (0 starts a new pass)
+            scan_count: COUNT hint per SCAN call
+            max_steps: Stop after this many SCAN calls (None runs to the end)
+            progress: Called with (entries deleted so far, cursor) after each step
+
+        Returns:
+            Tuple of (cursor to resume from, 0 once done; entries deleted)
+        """
+        if self.local is not None:
+            self.local.clear()
+
         pattern = f"cache:{self.namespace}:*"
-        keys = self.client.keys(pattern)
+        deleted = 0
+        steps = 0
+
+        while True:
+            cursor, keys = self.client.scan(cursor, match=pattern, count=scan_count)
+            if keys:
+                deleted += self.client.unlink(*keys)
+            steps += 1
+            if progress:
+                progress(deleted, cursor)
+            if cursor == 0 or (max_steps is not None and steps >= max_steps):
+                return cursor, deleted
+
+    def get_stats(self) -> dict:
+        """Get hit/miss counters per tier and local tier occupancy."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["local_entries"] = len(self.local) if self.local is not None else 0
+        stats["local_bytes"] = self.local.current_bytes if self.local is not None else 0
+        stats["local_evictions"] = self.local.evictions if self.local is not None else 0
+        return stats
+
+
+class AsyncEmbeddingCache(EmbeddingCache):
+    """
+    EmbeddingCache for asyncio code, built on redis.asyncio.
+
+    Methods that talk to Redis are coroutines with the same signatures as
+    the sync cache; the in-process tier and key layout are shared, so both
+    read and write the same entries.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "embeddings",
+        ttl: int = 86400,
+        client: redis.asyncio.Redis | None = None,
+        local_max_bytes: int = 64 * 1024 * 1024,
+        generational: bool = False,
+        generation_refresh: float = 5.0,
+        max_connections: int = 16,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            namespace: Cache namespace
+            ttl: Time to live in seconds (default 24 hours)
+            client: Pre-built async Redis client; must not decode responses
+            local_max_bytes: Size bound of the in-process tier (0 disables it)
+            generational: See EmbeddingCache
+            generation_refresh: See EmbeddingCache
+            max_connections: Size of the connection pool
+        """
+        client = client or redis.asyncio.Redis.from_pool(
+            redis.asyncio.BlockingConnectionPool(
+                host="localhost", port=6379, max_connections=max_connections
+            )
+        )
+        super().__init__(
+            namespace, ttl, client, local_max_bytes, generational, generation_refresh
+        )
+
+    async def _current_prefix(self) -> str:
+        """Key prefix for entries, including the generation if enabled."""
+        if not self.generational:
+            return f"cache:{self.namespace}:"
+        if time.monotonic() - self._generation_read_at > self.generation_refresh:
+            self._use_generation(int(await self.client.get(self.generation_key) or 0))
+        return f"cache:{self.namespace}:g{self._generation}:"
+
+    async def get(self, text: str) -> list[float] | None:
+        """Get cached embedding."""
+        return (await self.get_many([text]))[0]
+
+    async def get_many(self, texts: list[str]) -> list[list[float] | None]:
+        """Get cached embeddings for many texts in one MGET round trip."""
+        if not texts:
+            return []
+
+        prefix = await self._current_prefix()
+        keys = [self._key(text, prefix) for text in texts]
+        values, remote = self._lookup_local(keys)
+
+        legacy = {}
+        if remote:
+            fetched = await self.client.mget([keys[i] for i in remote])
+            legacy = self._absorb_remote(keys, values, remote, fetched)
+
+        if legacy:
+            await self._set_keys(legacy)
+
+        return [decode_embedding(value) if value is not None else None for value in values]
+
+    async def set(self, text: str, embedding: list[float]):
+        """Cache an embedding."""
+        await self.set_many([text], [embedding])
+
+    async def set_many(self, texts: list[str], embeddings: list[list[float]]):
+        """Cache many embeddings with pipelined SETEX."""
+        prefix = await self._current_prefix()
+        await self._set_keys(
+            {self._key(text, prefix): emb for text, emb in zip(texts, embeddings)}
+        )
+
+    async def _set_keys(self, entries: dict[str, list[float]]):
+        """Write key -> embedding entries in one pipeline."""
+        if not entries:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_sets(pipe, entries)
+        await pipe.execute()
+
+    async def migrate(self, scan_count: int = 1000) -> int:
+        """Rewrite all legacy JSON entries in the namespace as float32 bytes."""
+        migrated = 0
+        keys = []
+
+        async def migrate_batch(batch: list) -> int:
+            values = await self.client.mget(batch)
+            legacy = [
+                (key, value) for key, value in zip(batch, values)
+                if value is not None and not value.startswith(BINARY_MAGIC)
+            ]
+            ttl_pipe = self.client.pipeline(transaction=False)
+            for key, _value in legacy:
+                ttl_pipe.ttl(key)
+            ttls = await ttl_pipe.execute()
+
+            pipe = self.client.pipeline(transaction=False)
+            for (key, value), ttl in zip(legacy, ttls):
+                if ttl == -2:
+                    continue  # Expired since MGET
+                pipe.setex(key, ttl if ttl > 0 else self.ttl, encode_embedding(json.loads(value)))
+            await pipe.execute()
+            return len(legacy)
+
+        async for key in self.client.scan_iter(
+            match=f"cache:{self.namespace}:*", count=scan_count
+        ):
+            keys.append(key)
+            if len(keys) >= scan_count:
+                migrated += await migrate_batch(keys)
+                keys = []
+
         if keys:
-            self.client.delete(*keys)
+            migrated += await migrate_batch(keys)
+        return migrated
+
+    async def invalidate(self, text: str):
+        """Invalidate cached embedding."""
+        key = self._key(text, await self._current_prefix())
+        if self.local is not None:
+            self.local.pop(key)
+        await self.client.delete(key)
+
+    async def clear(self, scan_count: int = 1000):
+        """Clear all cached embeddings in namespace (see EmbeddingCache.clear)."""
+        if self.local is not None:
+            self.local.clear()
+
+        if self.generational:
+            self._generation = await self.client.incr(self.generation_key)
+            self._generation_read_at = time.monotonic()
+            return
+
+        cursor, _deleted = await self.clear_incremental(scan_count=scan_count)
+        while cursor:
+            cursor, _deleted = await self.clear_incremental(cursor, scan_count=scan_count)
+
+    async def clear_incremental(
+        self,
+        cursor: int = 0,
+        scan_count: int = 1000,
+        max_steps: int | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> tuple[int, int]:
+        """Delete namespace entries with SCAN and batched UNLINK, resumably."""
+        if self.local is not None:
+            self.local.clear()
+
+        pattern = f"cache:{self.namespace}:*"
+        deleted = 0
+        steps = 0
+
+        while True:
+            cursor, keys = await self.client.scan(cursor, match=pattern, count=scan_count)
+            if keys:
+                deleted += await self.client.unlink(*keys)
+            steps += 1
+            if progress:
+                progress(deleted, cursor)
+            if cursor == 0 or (max_steps is not None and steps >= max_steps):
+                return cursor, deleted
+
+    async def aclose(self):
+        """Close the client and disconnect its pool."""
+        await self.client.aclose()
+
+
+class QueryResultCache:
+    """
+    In-process cache of search results keyed by query, parameters and index version.
+
+    Writes to the index bump its version, so entries cached under an older
+    version are never hit again and age out through LRU eviction or TTL;
+    invalidation costs nothing per entry.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, ttl: float | None = 300.0):
+        """
+        Initialize query result cache.
+
+        Args:
+            max_bytes: Evict least recently used results beyond this size
+            ttl: Seconds a result stays valid (None for no expiry)
+        """
+        self.local = LRUCache(max_bytes, ttl)
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Fold case, Unicode forms and whitespace so equivalent queries share entries."""
+        return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+    def key(self, query: str, version: int, **params) -> str:
+        """
+        Build the cache key for a query.
+
+        Args:
+            query: Query text
+            version: Index version the results were computed against
+            **params: Search parameters that change the results (JSON-serializable)
+
+        Returns:
+            Cache key
+        """
+        return json.dumps([self.normalize(query), version, params], sort_keys=True)
+
+    def get(self, key: str) -> list[dict] | None:
+        """Get a copy of cached results, or None on a miss."""
+        results = self.local.get(key)
+        with self._stats_lock:
+            if results is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if results is None:
+            return None
+        return [dict(result) for result in results]
+
+    def put(self, key: str, results: list[dict]):
+        """Store a copy of search results."""
+        size = len(json.dumps(results, default=str)) + len(key)
+        self.local.put(key, [dict(result) for result in results], size)
+
+    def clear(self):
+        """Remove all cached results."""
+        self.local.clear()
+
+    def get_stats(self) -> dict:
+        """Get hit/miss counters and occupancy."""
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": len(self.local),
+            "bytes": self.local.current_bytes,
+            "evictions": self.local.evictions,
+        }
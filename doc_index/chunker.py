@@ -1,7 +1,20 @@
 """Chunk markdown documents for embedding."""
 
-from dataclasses import dataclass
-from uuid import uuid4
+import hashlib
+from bisect import bisect_left
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from doc_index.tokenizer import Tokenizer
+
+CHUNK_MODES = ("chars", "structure")
+
+
+class TextReader(Protocol):
+    """Text stream read in pieces (e.g. a file opened in text mode)."""
+
+    def read(self, size: int = -1) -> str: ...
 
 
 @dataclass
@@ -12,25 +25,61 @@ class DocumentChunk:
     content: str
     start_pos: int
     end_pos: int
+    metadata: dict = field(default_factory=dict)
+
+
+def make_chunk_id(source: str, start_pos: int, content: str) -> str:
+    """
+    Derive a content-addressed chunk ID.
+
+    The same chunk of the same file always maps to the same ID, so
+    re-indexing overwrites existing keys instead of orphaning them.
+
+    Args:
+        source: Source file path
+        start_pos: Offset of the chunk in the source
+        content: Chunk text
+
+    Returns:
+        32-character hex ID
+    """
+    content_hash = hashlib.sha256(content.encode()).hexdigest()
+    key = f"{source}\0{start_pos}\0{content_hash}"
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
 
 
 class MarkdownChunker:
     """Chunk markdown files with overlap."""
 
-    def __init__(self, chunk_size: int = 1000, overlap: int = 200):
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        overlap: int = 200,
+        mode: str = "chars",
+        tokenizer: Tokenizer | None = None,
+    ):
         """
         Initialize chunker.
 
         Args:
-            chunk_size: Target size in characters
-            overlap: Overlap between chunks in characters
+            chunk_size: Target size in characters (tokens if tokenizer is set)
+            overlap: Overlap between chunks in characters or tokens
+                     (windowed mode only)
+            mode: "chars" for fixed-size windows, "structure" to split on
+                  headings and keep fenced code blocks whole
+            tokenizer: Measure chunk_size and overlap in this tokenizer's tokens
         """
+        if mode not in CHUNK_MODES:
+            raise ValueError(f"Unknown chunk mode {mode!r}, expected one of {CHUNK_MODES}")
+
         self.chunk_size = chunk_size
         self.overlap = overlap
+        self.mode = mode
+        self.tokenizer = tokenizer
 
     def chunk(self, content: str, source: str) -> list[DocumentChunk]:
         """
-        Chunk content with overlap.
+        Chunk content using the configured mode.
 
         Args:
             content: Markdown content to chunk
@@ -39,6 +88,80 @@ class MarkdownChunker:
         Returns:
             List of DocumentChunk objects
         """
+        # Tokenize once per document; every window reuses these offsets
+        offsets = self.tokenizer.token_offsets(content) if self.tokenizer else None
+
+        if self.mode == "structure":
+            return self._chunk_structure(content, source, offsets)
+        if offsets is not None:
+            return self._chunk_tokens(content, source, offsets)
+        return self._chunk_chars(content, source)
+
+    @property
+    def streams(self) -> bool:
+        """Whether chunk_stream holds only a window of the document in memory."""
+        return (
+            self.mode == "chars" and self.tokenizer is None and self.overlap < self.chunk_size
+        )
+
+    def chunk_stream(self, reader: TextReader, source: str) -> Iterator[DocumentChunk]:
+        """
+        Chunk a text stream, yielding chunks as they are cut.
+
+        Fixed-size character windows are cut from a buffer of one chunk,
+        so memory stays bounded by chunk_size however large the stream is.
+        Other modes need the whole document (headings and token offsets
+        are global) and chunk it after reading it fully. Either way the
+        chunks equal chunk(reader.read(), source).
+
+        Args:
+            reader: Text stream to consume
+            source: Source file path
+
+        Yields:
+            DocumentChunk objects in document order
+        """
+        if not self.streams:
+            yield from self.chunk(reader.read(), source)
+            return
+
+        # Mirrors _chunk_chars window for window; buffer holds
+        # content[buffer_start:] up to the end of the current window
+        buffer = ""
+        buffer_start = 0
+        start = 0
+        count = 0
+        exhausted = False
+
+        while True:
+            while not exhausted and buffer_start + len(buffer) < start + self.chunk_size:
+                piece = reader.read(start + self.chunk_size - buffer_start - len(buffer))
+                exhausted = not piece
+                buffer += piece
+
+            if start >= buffer_start + len(buffer):
+                return
+
+            end = min(start + self.chunk_size, buffer_start + len(buffer))
+            chunk_content = buffer[start - buffer_start:end - buffer_start]
+            yield DocumentChunk(
+                chunk_id=make_chunk_id(source, start, chunk_content),
+                source=source,
+                content=chunk_content,
+                start_pos=start,
+                end_pos=end,
+            )
+            count += 1
+
+            previous, start = start, end - self.overlap
+            if count > 1 and start <= previous:
+                return
+            if start > buffer_start:
+                buffer = buffer[start - buffer_start:]
+                buffer_start = start
+
+    def _chunk_chars(self, content: str, source: str) -> list[DocumentChunk]:
+        """Chunk content into fixed-size character windows with overlap."""
         chunks = []
         start = 0
 
@@ -51,7 +174,7 @@ class MarkdownChunker:
 
             # Create chunk object
             chunk = DocumentChunk(
-                chunk_id=str(uuid4()),
+                chunk_id=make_chunk_id(source, start, chunk_content),
                 source=source,
                 content=chunk_content,
                 start_pos=start,
@@ -67,3 +190,192 @@ class MarkdownChunker:
                 break
 
         return chunks
+
+    def _chunk_tokens(self, content: str, source: str, offsets: list[int]) -> list[DocumentChunk]:
+        """Chunk content into fixed-size token windows with overlap."""
+        chunks: list[DocumentChunk] = []
+        count = len(offsets)
+        step = max(self.chunk_size - self.overlap, 1)
+        first = 0
+
+        while first < count:
+            last = min(first + self.chunk_size, count)
+            start = offsets[first] if first else 0
+            end = offsets[last] if last < count else len(content)
+            text = content[start:end]
+
+            chunks.append(DocumentChunk(
+                chunk_id=make_chunk_id(source, start, text),
+                source=source,
+                content=text,
+                start_pos=start,
+                end_pos=end,
+                metadata={"token_count": last - first},
+            ))
+
+            if last == count:
+                break
+            first += step
+
+        return chunks
+
+    def _chunk_structure(
+        self,
+        content: str,
+        source: str,
+        offsets: list[int] | None = None,
+    ) -> list[DocumentChunk]:
+        """
+        Chunk content along its heading hierarchy.
+
+        Whole sections are packed greedily up to chunk_size. Sections that
+        are too large are split between blocks (paragraphs, tables, fenced
+        code); a fenced block is never split, even if it exceeds chunk_size.
+        Each chunk carries the heading path of its first section.
+        """
+        chunks: list[DocumentChunk] = []
+        size = self.chunk_size
+        current: list = [None, 0, ()]  # start, end, heading path
+
+        def emit(start: int, end: int, path: tuple[str, ...]):
+            text = content[start:end]
+            if text.strip():
+                metadata = {"heading_path": list(path)}
+                if offsets is not None:
+                    metadata["token_count"] = _measure(offsets, start, end)
+                chunks.append(DocumentChunk(
+                    chunk_id=make_chunk_id(source, start, text),
+                    source=source,
+                    content=text,
+                    start_pos=start,
+                    end_pos=end,
+                    metadata=metadata,
+                ))
+
+        def flush():
+            if current[0] is not None:
+                emit(*current)
+                current[0] = None
+
+        def extend(start: int, end: int, path: tuple[str, ...]):
+            if current[0] is not None and _measure(offsets, current[0], end) > size:
+                flush()
+            if current[0] is None:
+                current[0], current[2] = start, path
+            current[1] = end
+
+        for path, units in _markdown_sections(content):
+            section_start, section_end = units[0][0], units[-1][1]
+            if _measure(offsets, section_start, section_end) <= size:
+                extend(section_start, section_end, path)
+                continue
+
+            flush()
+            for start, end, is_fence in units:
+                if _measure(offsets, start, end) > size and not is_fence:
+                    flush()
+                    for piece_start, piece_end in _split(offsets, start, end, size):
+                        emit(piece_start, piece_end, path)
+                    continue
+                extend(start, end, path)
+            flush()
+
+        flush()
+        return chunks
+
+
+def _measure(offsets: list[int] | None, start: int, end: int) -> int:
+    """Size of content[start:end] in characters, or tokens when offsets are given."""
+    if offsets is None:
+        return end - start
+    return bisect_left(offsets, end) - bisect_left(offsets, start)
+
+
+def _split(offsets: list[int] | None, start: int, end: int, size: int) -> Iterator[tuple[int, int]]:
+    """Split content[start:end] into consecutive pieces of at most size units."""
+    if offsets is None:
+        for piece_start in range(start, end, size):
+            yield piece_start, min(piece_start + size, end)
+        return
+
+    first = bisect_left(offsets, start)
+    last = bisect_left(offsets, end)
+    for index in range(first, last, size):
+        piece_start = start if index == first else offsets[index]
+        piece_end = offsets[index + size] if index + size < last else end
+        yield piece_start, piece_end
+
+
+def _markdown_sections(content: str) -> list[tuple[tuple[str, ...], list[tuple[int, int, bool]]]]:
+    """
+    Split markdown into sections of contiguous blocks in one pass.
+
+    Args:
+        content: Markdown text
+
+    Returns:
+        List of (heading path, units) where each unit is (start, end, is_fence)
+        and units tile the section without gaps
+    """
+    sections: list[tuple[tuple[str, ...], list[tuple[int, int, bool]]]] = [((), [])]
+    headings: list[tuple[int, str]] = []
+    unit_start = 0
+    unit_is_fence = False
+    fence: tuple[str, int] | None = None
+    prev_blank = False
+    after_heading = False
+
+    def close_unit(end: int):
+        nonlocal unit_start, unit_is_fence
+        if end > unit_start:
+            sections[-1][1].append((unit_start, end, unit_is_fence))
+            unit_start = end
+        unit_is_fence = False
+
+    pos = 0
+    length = len(content)
+    while pos < length:
+        newline = content.find("\n", pos)
+        line_end = length if newline == -1 else newline + 1
+        line = content[pos:line_end]
+        stripped = line.lstrip(" ")
+        indent = len(line) - len(stripped)
+        marker = stripped[:3]
+        level = len(stripped) - len(stripped.lstrip("#")) if indent <= 3 else 0
+        is_heading = 0 < level <= 6 and stripped[level:level + 1] in ("", " ", "\t", "\n", "\r")
+
+        if fence is not None:
+            run = stripped.rstrip()
+            if indent <= 3 and run.startswith(fence[0] * fence[1]) and not run.strip(fence[0]):
+                # Trailing blank lines stay with the block; the next paragraph splits
+                fence = None
+                prev_blank = True
+                after_heading = False
+        elif indent <= 3 and marker in ("```", "~~~"):
+            # Keep a heading together with a code block directly under it
+            if not after_heading:
+                close_unit(pos)
+            unit_is_fence = True
+            fence_char = marker[0]
+            fence = (fence_char, len(stripped) - len(stripped.lstrip(fence_char)))
+        elif is_heading:
+            close_unit(pos)
+            title = stripped[level:].strip().rstrip("#").strip()
+            while headings and headings[-1][0] >= level:
+                headings.pop()
+            headings.append((level, title))
+            sections.append((tuple(t for _, t in headings), []))
+            prev_blank = False
+            after_heading = True
+        elif not stripped.strip():
+            prev_blank = True
+        else:
+            # A new paragraph starts a new unit, except right under its heading
+            if prev_blank and not after_heading:
+                close_unit(pos)
+            prev_blank = after_heading = False
+
+        pos = line_end
+
+    close_unit(length)
+    return [(path, units) for path, units in sections if units]
@@ -1,10 +1,13 @@
 """CLI for document indexing."""
 
+import time
 from pathlib import Path
 
 import click
 
 from doc_index.indexer import DocumentIndexer
+from doc_index.pipeline import PipelineConfig
+from doc_index.vector_store import VectorIndexConfig
 
 
 @click.group()
@@ -17,41 +20,426 @@ def cli():
 @click.argument("directory", type=click.Path(exists=True))
 @click.option("--index-name", default="docs", help="Index name")
 @click.option("--chunk-size", default=1000, help="Chunk size")
-def index(directory: str, index_name: str, chunk_size: int):
+@click.option(
+    "--chunk-mode",
+    type=click.Choice(["chars", "structure"]),
+    default="chars",
+    help="Fixed-size windows or heading-aware sections",
+)
+@click.option(
+    "--chunk-unit",
+    type=click.Choice(["chars", "tokens"]),
+    default="chars",
+    help="Unit for --chunk-size",
+)
+@click.option("--tokenizer", "tokenizer_path", default=None, help="tokenizer.json for token sizing")
+@click.option("--batch-size", default=500, help="Chunks per pipelined store write")
+@click.option(
+    "--embedder",
+    "embedder_backend",
+    type=click.Choice(["anthropic", "ollama"]),
+    default="anthropic",
+    help="Embedding backend",
+)
+@click.option(
+    "--store",
+    "store_backend",
+    type=click.Choice(["dragonfly", "local"]),
+    default="dragonfly",
+    help="Vector store (local needs no server)",
+)
+@click.option(
+    "--index-type",
+    type=click.Choice(["FLAT", "HNSW"], case_sensitive=False),
+    default="FLAT",
+    help="Exact (FLAT) or approximate (HNSW) vector index",
+)
+@click.option("--hnsw-m", default=16, help="HNSW links per node")
+@click.option("--ef-construction", default=200, help="HNSW candidate list size while building")
+@click.option("--ef-runtime", default=10, help="HNSW candidate list size while searching")
+@click.option(
+    "--vector-type",
+    type=click.Choice(["FLOAT32", "FLOAT16", "INT8"], case_sensitive=False),
+    default="FLOAT32",
+    help="Stored vector precision (FLOAT16/INT8 need server support)",
+)
+@click.option("--rerank-factor", default=0, help="Re-score top-k x N candidates at float32")
+@click.option("--read-workers", type=int, default=None, help="Read+chunk processes (default: CPUs)")
+@click.option("--embed-workers", default=1, help="Embedding threads")
+@click.option("--store-workers", default=1, help="Store writer threads")
+@click.option(
+    "--stream-threshold-mb",
+    default=16,
+    help="Stream files larger than this through the chunker (chars mode)",
+)
+@click.option("--full", is_flag=True, help="Re-index every file, ignoring the manifest")
+@click.option("--gc", is_flag=True, help="Remove stored chunks not produced by any indexed file")
+def index(
+    directory: str,
+    index_name: str,
+    chunk_size: int,
+    chunk_mode: str,
+    chunk_unit: str,
+    tokenizer_path: str | None,
+    batch_size: int,
+    embedder_backend: str,
+    store_backend: str,
+    index_type: str,
+    hnsw_m: int,
+    ef_construction: int,
+    ef_runtime: int,
+    vector_type: str,
+    rerank_factor: int,
+    read_workers: int | None,
+    embed_workers: int,
+    store_workers: int,
+    stream_threshold_mb: int,
+    full: bool,
+    gc: bool,
+):
     """Index documentation directory."""
     click.echo(f"Indexing {directory}...")
 
+    pipeline_config = PipelineConfig(
+        embed_workers=embed_workers,
+        store_workers=store_workers,
+        stream_threshold=stream_threshold_mb * 1024 * 1024,
+    )
+    if read_workers is not None:
+        pipeline_config.read_workers = read_workers
+
     indexer = DocumentIndexer(
         index_name=index_name,
         chunk_size=chunk_size,
+        chunk_mode=chunk_mode,
+        chunk_unit=chunk_unit,
+        tokenizer_path=tokenizer_path,
+        batch_size=batch_size,
+        embedder_backend=embedder_backend,
+        pipeline_config=pipeline_config,
+        store_backend=store_backend,
+        index_config=VectorIndexConfig(
+            index_type, hnsw_m, ef_construction, ef_runtime, vector_type, rerank_factor
+        ),
     )
 
-    count = indexer.index_directory(Path(directory))
+    count = indexer.index_directory(Path(directory), force=full)
 
     click.echo(f"✓ Indexed {count} chunks")
 
-    stats = indexer.get_stats()
-    click.echo(f"  Total docs: {stats['total_docs']}")
+    if gc:
+        click.echo(f"✓ Removed {indexer.collect_garbage()} orphaned chunks")
+
+    _echo_stats(indexer.get_stats())
+
+
+def _echo_stats(stats: dict):
+    """Print persisted index statistics."""
+    files = stats["files"]
+    click.echo(
+        f"  Files: {files['added']} added, {files['updated']} updated, "
+        f"{files['removed']} removed, {files['unchanged']} unchanged"
+    )
+    click.echo(f"  Total docs: {stats['total_docs']} ({stats['total_bytes'] / 2**20:.1f}MB)")
     click.echo(f"  Total chunks: {stats['total_chunks']}")
+    memory = stats["memory"]
+    if memory:
+        click.echo(
+            f"  Vectors: {memory['num_docs']} x {memory['vector_type']} = "
+            f"{memory['vector_bytes'] / 2**20:.1f}MB "
+            f"({memory['float32_bytes'] / 2**20:.1f}MB at FLOAT32)"
+        )
+    if stats["indexed_at"]:
+        indexed_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stats["indexed_at"]))
+        click.echo(f"  Last index: {indexed_at} in {stats['last_index_seconds']:.2f}s")
+    click.echo(f"  Write throughput: {stats['chunks_per_sec']:.0f} chunks/sec")
+    if stats["texts_per_sec"]:
+        click.echo(f"  Embed throughput: {stats['texts_per_sec']:.0f} texts/sec")
+    for stage, timing in stats["stage_timings"].items():
+        click.echo(f"  {stage:>8}: {timing['seconds']:.2f}s ({timing['items']} items)")
+
+
+@cli.command()
+@click.argument("queries", nargs=-1, required=True)
+@click.option("--index-name", default="docs", help="Index name")
+@click.option("--top-k", default=5, help="Number of results per query")
+@click.option(
+    "--embedder",
+    "embedder_backend",
+    type=click.Choice(["anthropic", "ollama"]),
+    default="anthropic",
+    help="Embedding backend (must match the one used to index)",
+)
+@click.option(
+    "--store",
+    "store_backend",
+    type=click.Choice(["dragonfly", "local"]),
+    default="dragonfly",
+    help="Vector store (local needs no server)",
+)
+@click.option(
+    "--index-type",
+    type=click.Choice(["FLAT", "HNSW"], case_sensitive=False),
+    default="FLAT",
+    help="Index type the index was built with",
+)
+@click.option("--ef-runtime", default=10, help="HNSW candidate list size (recall vs. latency)")
+@click.option(
+    "--vector-type",
+    type=click.Choice(["FLOAT32", "FLOAT16", "INT8"], case_sensitive=False),
+    default="FLOAT32",
+    help="Vector precision the index was built with",
+)
+@click.option("--rerank-factor", default=0, help="Re-score top-k x N candidates at float32")
+@click.option("--hybrid", is_flag=True, help="Fuse keyword (BM25) and vector rankings")
+@click.option("--text-weight", default=1.0, help="Keyword ranking weight for --hybrid")
+@click.option("--vector-weight", default=1.0, help="Vector ranking weight for --hybrid")
+@click.option("--source-prefix", default=None, help="Only search sources under this path prefix")
+@click.option("--ids-only", is_flag=True, help="Print chunk IDs and scores without loading content")
+@click.option("--snippet-chars", default=160, help="Width of the snippet shown around matches")
+def search(
+    queries: tuple[str, ...],
+    index_name: str,
+    top_k: int,
+    embedder_backend: str,
+    store_backend: str,
+    index_type: str,
+    ef_runtime: int,
+    vector_type: str,
+    rerank_factor: int,
+    hybrid: bool,
+    text_weight: float,
+    vector_weight: float,
+    source_prefix: str | None,
+    ids_only: bool,
+    snippet_chars: int,
+):
+    """Search indexed documentation (several QUERIES are searched as one batch)."""
+    indexer = DocumentIndexer(
+        index_name=index_name,
+        embedder_backend=embedder_backend,
+        store_backend=store_backend,
+        index_config=VectorIndexConfig(
+            index_type=index_type,
+            ef_runtime=ef_runtime,
+            vector_type=vector_type,
+            rerank_factor=rerank_factor,
+        ),
+    )
+
+    # Content is only loaded to cut snippets, never printed whole
+    fields = () if ids_only else ("source", "heading_path")
+    snippet_width = None if ids_only else snippet_chars
+    if hybrid:
+        batches = [
+            indexer.search_hybrid(
+                query, top_k, source_prefix, text_weight, vector_weight, fields, snippet_width
+            )
+            for query in queries
+        ]
+    else:
+        batches = indexer.search_many(list(queries), top_k, source_prefix, fields, snippet_width)
+
+    for query, results in zip(queries, batches):
+        if len(queries) > 1:
+            click.echo(f"Query: {query}")
+
+        if ids_only:
+            for result in results:
+                click.echo(f"{result['chunk_id']}\t{result.get('score', 'N/A')}")
+            continue
+
+        click.echo(f"Found {len(results)} results:\n")
+
+        for i, result in enumerate(results, 1):
+            click.echo(f"{i}. {result['source']}")
+            if result.get("heading_path"):
+                click.echo(f"   Section: {result['heading_path']}")
+            click.echo(f"   Score: {result.get('score', 'N/A')}")
+            click.echo(f"   {result['snippet']}")
+            click.echo()
+
+
+@cli.command()
+@click.option("--index-name", default="docs", help="Index name")
+@click.option(
+    "--store",
+    "store_backend",
+    type=click.Choice(["dragonfly", "local"]),
+    default="dragonfly",
+    help="Vector store (local needs no server)",
+)
+def gc(index_name: str, store_backend: str):
+    """Remove stored chunks not produced by any indexed file."""
+    indexer = DocumentIndexer(index_name=index_name, store_backend=store_backend)
+
+    removed = indexer.collect_garbage()
+
+    click.echo(f"✓ Removed {removed} orphaned chunks")
 
 
 @cli.command()
-@click.argument("query")
 @click.option("--index-name", default="docs", help="Index name")
-@click.option("--top-k", default=5, help="Number of results")
-def search(query: str, index_name: str, top_k: int):
-    """Search indexed documentation."""
-    indexer = DocumentIndexer(index_name=index_name)
+@click.option(
+    "--store",
+    "store_backend",
+    type=click.Choice(["dragonfly", "local"]),
+    default="dragonfly",
+    help="Vector store (local needs no server)",
+)
+def stats(index_name: str, store_backend: str):
+    """Show statistics saved by the last index run."""
+    indexer = DocumentIndexer(index_name=index_name, store_backend=store_backend)
+
+    click.echo(f"Index {index_name}:")
+    _echo_stats(indexer.get_stats())
+
+
+@cli.command("bench-store")
+@click.option("--chunks", default=10_000, help="Number of synthetic chunks")
+@click.option("--dim", default=768, help="Embedding dimension")
+@click.option("--batch-size", default=500, help="Chunks per pipeline")
+@click.option("--in-process", is_flag=True, help="Use an in-process Redis stand-in")
+def bench_store(chunks: int, dim: int, batch_size: int, in_process: bool):
+    """Benchmark bulk vector store writes."""
+    from doc_index.benchmark import benchmark_add_chunks, in_process_client
+    from doc_index.vector_store import DragonflyVectorStore
+
+    client = in_process_client() if in_process else None
+    store = DragonflyVectorStore(index_name="bench", batch_size=batch_size, client=client)
+
+    try:
+        result = benchmark_add_chunks(store, count=chunks, dimension=dim)
+    finally:
+        store.delete_index()
+
+    click.echo(f"✓ Wrote {result['chunks']} chunks in {result['seconds']:.2f}s")
+    click.echo(f"  Batch size: {result['batch_size']}")
+    click.echo(f"  Throughput: {result['chunks_per_sec']:.0f} chunks/sec")
+
+
+@cli.command("bench-search")
+@click.option("--chunks", default=100_000, help="Number of synthetic chunks")
+@click.option("--dim", default=768, help="Embedding dimension")
+@click.option("--queries", default=50, help="Number of timed queries")
+@click.option("--top-k", default=10, help="Results per query")
+def bench_search(chunks: int, dim: int, queries: int, top_k: int):
+    """Benchmark brute-force search latency of the local vector store."""
+    import tempfile
+
+    from doc_index.benchmark import benchmark_search
+    from doc_index.local_store import LocalVectorStore
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LocalVectorStore(index_name="bench", path=Path(tmp))
+        result = benchmark_search(store, count=chunks, dimension=dim, queries=queries, top_k=top_k)
+
+    click.echo(f"✓ Ran {result['queries']} queries over {result['chunks']} chunks")
+    click.echo(f"  p50 latency: {result['p50_ms']:.1f}ms")
+    click.echo(f"  p95 latency: {result['p95_ms']:.1f}ms")
+
+
+@cli.command("bench-recall")
+@click.option(
+    "--store",
+    "store_backend",
+    type=click.Choice(["dragonfly", "local"]),
+    default="local",
+    help="Vector store to benchmark",
+)
+@click.option("--chunks", default=5_000, help="Number of synthetic chunks")
+@click.option("--dim", default=128, help="Embedding dimension")
+@click.option("--queries", default=50, help="Number of timed queries")
+@click.option("--top-k", default=10, help="Results per query")
+@click.option("--hnsw-m", default=16, help="HNSW links per node")
+@click.option("--ef-construction", default=200, help="HNSW candidate list size while building")
+@click.option("--ef", "ef_values", default="10,50,100,200", help="EF_RUNTIME values to sweep")
+def bench_recall(
+    store_backend: str,
+    chunks: int,
+    dim: int,
+    queries: int,
+    top_k: int,
+    hnsw_m: int,
+    ef_construction: int,
+    ef_values: str,
+):
+    """Benchmark HNSW recall and latency against FLAT ground truth."""
+    import tempfile
+
+    from doc_index.benchmark import benchmark_recall
+    from doc_index.vector_store import get_vector_store
+
+    hnsw_config = VectorIndexConfig("HNSW", hnsw_m, ef_construction)
+    with tempfile.TemporaryDirectory() as tmp:
+
+        def make_store(name: str, config: VectorIndexConfig | None = None):
+            options = {"path": Path(tmp) / name} if store_backend == "local" else {}
+            return get_vector_store(
+                store_backend, index_name=name, index_config=config, **options
+            )
+
+        flat = make_store("bench-flat")
+        hnsw = make_store("bench-hnsw", hnsw_config)
+        try:
+            result = benchmark_recall(
+                flat,
+                hnsw,
+                count=chunks,
+                dimension=dim,
+                queries=queries,
+                top_k=top_k,
+                ef_values=tuple(int(ef) for ef in ef_values.split(",")),
+            )
+        finally:
+            flat.delete_index()
+            hnsw.delete_index()
+
+    click.echo(f"✓ Built HNSW over {result['chunks']} chunks in {result['build_seconds']:.2f}s")
+    click.echo(f"  FLAT p50 latency: {result['flat_p50_ms']:.2f}ms")
+    for run in result["runs"]:
+        click.echo(
+            f"  ef={run['ef_runtime']:>4}: recall@{top_k} {run['recall']:.3f}, "
+            f"p50 {run['p50_ms']:.2f}ms, p95 {run['p95_ms']:.2f}ms"
+        )
+
+
+@cli.command("bench-quant")
+@click.option("--chunks", default=20_000, help="Number of synthetic vectors")
+@click.option("--dim", default=768, help="Embedding dimension")
+@click.option("--queries", default=100, help="Number of queries")
+@click.option("--top-k", default=10, help="Results per query")
+@click.option("--rerank-factor", default=4, help="Re-rank candidate multiplier")
+def bench_quant(chunks: int, dim: int, queries: int, top_k: int, rerank_factor: int):
+    """Benchmark recall and memory of FLOAT16/INT8 vector storage."""
+    from doc_index.benchmark import benchmark_quantization
+
+    rows = benchmark_quantization(chunks, dim, queries, top_k, rerank_factor)
+
+    click.echo(f"✓ {chunks} x {dim} vectors, recall@{top_k} against float32 search")
+    for row in rows:
+        click.echo(
+            f"  {row['vector_type']:>7}: {row['bytes_per_vector']} B/vector "
+            f"({row['compression']:.1f}x smaller), recall {row['recall']:.3f}, "
+            f"re-ranked x{rerank_factor} {row['recall_reranked']:.3f}"
+        )
+
 
-    results = indexer.search(query, top_k)
+@cli.command("bench-embed")
+@click.option("--texts", default=256, help="Number of distinct texts")
+@click.option("--concurrency", default=8, help="Max in-flight requests")
+@click.option("--model", default=None, help="Ollama embedding model")
+def bench_embed(texts: int, concurrency: int, model: str | None):
+    """Benchmark Ollama embedding throughput."""
+    from doc_index.embedder import OllamaEmbedder
 
-    click.echo(f"Found {len(results)} results:\n")
+    embedder = OllamaEmbedder(model=model, concurrency=concurrency, use_cache=False)
+    embedder.embed_batch([f"Benchmark text number {i}" for i in range(texts)])
 
-    for i, result in enumerate(results, 1):
-        click.echo(f"{i}. {result['source']}")
-        click.echo(f"   Score: {result.get('score', 'N/A')}")
-        click.echo(f"   {result['content'][:100]}...")
-        click.echo()
+    stats = embedder.get_stats()
+    click.echo(f"✓ Embedded {stats['texts_embedded']} texts in {stats['embed_seconds']:.2f}s")
+    click.echo(f"  Concurrency: {concurrency}")
+    click.echo(f"  Throughput: {stats['texts_per_sec']:.0f} texts/sec")
 
 
 if __name__ == "__main__":
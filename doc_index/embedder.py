@@ -1,11 +1,48 @@
-"""Embedding generation using Anthropic API."""
+"""Embedding generation backends."""
 
+import asyncio
 import hashlib
+import threading
+import time
+import weakref
+from typing import Protocol
 
 from anthropic import Anthropic
 
 from cli.settings import settings
 
+EMBEDDER_BACKENDS = ("anthropic", "ollama")
+
+
+class Embedder(Protocol):
+    """Protocol for embedding backends used by the indexer."""
+
+    def embed(self, text: str) -> list[float]:
+        """Embed a single text."""
+        ...
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, returning vectors in input order."""
+        ...
+
+
+def get_embedder(backend: str = "anthropic", **kwargs) -> Embedder:
+    """
+    Create an embedder by backend name.
+
+    Args:
+        backend: "anthropic" or "ollama"
+        **kwargs: Passed to the embedder constructor
+
+    Returns:
+        Embedder instance
+    """
+    if backend == "anthropic":
+        return AnthropicEmbedder(**kwargs)
+    if backend == "ollama":
+        return OllamaEmbedder(**kwargs)
+    raise ValueError(f"Unknown embedder backend {backend!r}, expected one of {EMBEDDER_BACKENDS}")
+
 
 class AnthropicEmbedder:
     """Generate embeddings using Anthropic API."""
@@ -54,7 +91,7 @@ class AnthropicEmbedder:
 
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
         """
-        Embed multiple texts.
+        Embed multiple texts with one cache round trip.
 
         Args:
             texts: List of texts to embed
@@ -62,7 +99,19 @@ class AnthropicEmbedder:
         Returns:
             List of embedding vectors
         """
-        return [self.embed(text) for text in texts]
+        if not self._cache:
+            return [self.embed(text) for text in texts]
+
+        results = self._cache.get_many(texts)
+        missing = [i for i, embedding in enumerate(results) if embedding is None]
+
+        if missing:
+            # Generate embeddings (TODO: actual API call when endpoint available)
+            for i in missing:
+                results[i] = [0.0] * 768
+            self._cache.set_many([texts[i] for i in missing], [results[i] for i in missing])
+
+        return results
 
     def _cache_key(self, content: str) -> str:
         """
@@ -75,3 +124,186 @@ class AnthropicEmbedder:
             SHA256 hex digest
         """
         return hashlib.sha256(content.encode()).hexdigest()
+
+
+class OllamaEmbedder:
+    """
+    Generate embeddings with a local Ollama server.
+
+    Batches are deduplicated, sent as concurrent requests bounded by a
+    semaphore, and returned in input order.
+
+    Each event loop gets one HTTP client whose connections are reused
+    across batches. Sync callers share a loop on a background thread, so
+    their batches reuse connections too; close() shuts it down.
+    """
+
+    def __init__(
+        self,
+        model: str | None = None,
+        base_url: str | None = None,
+        concurrency: int = 8,
+        use_cache: bool = True,
+    ):
+        """
+        Initialize embedder.
+
+        Args:
+            model: Ollama embedding model (defaults to settings.ollama_embedding_model)
+            base_url: Ollama server URL (defaults to settings.ollama_host)
+            concurrency: Maximum in-flight embedding requests
+            use_cache: Whether to use Redis caching for embeddings
+        """
+        from agents.ollama_client import OllamaConfig
+
+        self.model = model or settings.ollama_embedding_model
+        self.concurrency = concurrency
+        self._config = OllamaConfig(
+            base_url=base_url or settings.ollama_host,
+            timeout_seconds=settings.ollama_timeout_seconds,
+        )
+
+        if use_cache:
+            from doc_index.cache import EmbeddingCache
+
+            self._cache = EmbeddingCache()
+        else:
+            self._cache = None
+
+        # Throughput counters (texts actually sent to Ollama); batches can
+        # run concurrently from pipeline threads and callers
+        self._stats_lock = threading.Lock()
+        self._texts_embedded = 0
+        self._embed_seconds = 0.0
+
+        # One OllamaClient per event loop (httpx clients are loop-bound)
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._loop_lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+
+    def embed(self, text: str) -> list[float]:
+        """
+        Embed a single text with caching.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed multiple texts concurrently.
+
+        The requests run on the embedder's background loop, blocking the
+        caller until they finish; this is also safe from inside a running
+        event loop (e.g. a notebook). Async code should await aembed_batch
+        instead.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of embedding vectors in input order
+        """
+        future = asyncio.run_coroutine_threadsafe(self.aembed_batch(texts), self._sync_loop())
+        return future.result()
+
+    def _sync_loop(self) -> asyncio.AbstractEventLoop:
+        """The background loop sync callers share, started on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="ollama-embedder", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def _client(self):
+        """The OllamaClient for the running event loop."""
+        from agents.ollama_client import OllamaClient
+
+        loop = asyncio.get_running_loop()
+        with self._loop_lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = self._clients[loop] = OllamaClient(self._config)
+            return client
+
+    async def aclose(self):
+        """Close the HTTP client of the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.__aexit__(None, None, None)
+
+    def close(self):
+        """Close the background loop sync callers share, and its HTTP client."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    async def aembed_batch(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed multiple texts concurrently from async code.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of embedding vectors in input order
+        """
+        # Dedupe: each distinct text is embedded at most once per batch
+        unique = list(dict.fromkeys(texts))
+        vectors: dict[str, list[float]] = {}
+
+        # The Redis cache is blocking; keep it off the (possibly shared) loop
+        if self._cache:
+            cached_vectors = await asyncio.to_thread(self._cache.get_many, unique)
+            for text, cached in zip(unique, cached_vectors):
+                if cached is not None:
+                    vectors[text] = cached
+
+        missing = [text for text in unique if text not in vectors]
+        if missing:
+            started = time.perf_counter()
+            embedded = await self._request_all(missing)
+            with self._stats_lock:
+                self._embed_seconds += time.perf_counter() - started
+                self._texts_embedded += len(missing)
+
+            vectors.update(zip(missing, embedded))
+            if self._cache:
+                await asyncio.to_thread(self._cache.set_many, missing, embedded)
+
+        return [vectors[text] for text in texts]
+
+    async def _request_all(self, texts: list[str]) -> list[list[float]]:
+        """Send one embeddings request per text, at most `concurrency` at a time."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        client = self._client()
+
+        async def request(text: str) -> list[float]:
+            async with semaphore:
+                return await client.embeddings(text, model=self.model)
+
+        return await asyncio.gather(*(request(text) for text in texts))
+
+    def get_stats(self) -> dict:
+        """Get embedding throughput counters."""
+        with self._stats_lock:
+            texts, seconds = self._texts_embedded, self._embed_seconds
+        return {
+            "texts_embedded": texts,
+            "embed_seconds": seconds,
+            "texts_per_sec": texts / seconds if seconds else 0.0,
+        }
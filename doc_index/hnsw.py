@@ -0,0 +1,238 @@
+"""Hierarchical navigable small world graph for approximate vector search."""
+
+import heapq
+import math
+from collections.abc import Callable
+
+import numpy as np
+
+
+class HNSWGraph:
+    """
+    HNSW graph over rows of an externally owned matrix of unit vectors.
+
+    Node IDs are row positions in the matrix returned by get_vectors, so
+    the graph stores only links, not a second copy of the vectors.
+    Similarity is the dot product (cosine for normalized rows). Deleted
+    nodes stay in the graph for navigation but are never returned.
+    """
+
+    def __init__(
+        self,
+        get_vectors: Callable[[], np.ndarray],
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_runtime: int = 10,
+        seed: int = 0,
+    ):
+        """
+        Initialize an empty graph.
+
+        Args:
+            get_vectors: Returns the current matrix (it may be reallocated)
+            m: Links per node on upper layers (2 * m on layer 0)
+            ef_construction: Candidate list size while inserting
+            ef_runtime: Default candidate list size while searching
+            seed: RNG seed for level assignment
+        """
+        self.get_vectors = get_vectors
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_runtime = ef_runtime
+        self._level_mult = 1 / math.log(max(m, 2))
+        self._rng = np.random.default_rng(seed)
+
+        # links[node][level] -> neighbor node IDs
+        self.links: list[list[list[int]]] = []
+        self.deleted: set[int] = set()
+        self.entry_point: int | None = None
+        self.max_level = -1
+
+    def __len__(self) -> int:
+        return len(self.links)
+
+    def _max_links(self, level: int) -> int:
+        return self.m * 2 if level == 0 else self.m
+
+    def _search_layer(
+        self,
+        vectors: np.ndarray,
+        query: np.ndarray,
+        entry_points: list[int],
+        ef: int,
+        level: int,
+    ) -> list[tuple[float, int]]:
+        """
+        Best-first search of one layer.
+
+        Returns:
+            Up to ef (similarity, node) pairs, best first
+        """
+        visited = set(entry_points)
+        similarities = vectors[entry_points] @ query
+        candidates = [(-float(s), node) for s, node in zip(similarities, entry_points)]
+        heapq.heapify(candidates)
+        best = [(float(s), node) for s, node in zip(similarities, entry_points)]
+        heapq.heapify(best)
+        while len(best) > ef:
+            heapq.heappop(best)
+
+        while candidates:
+            negative, node = heapq.heappop(candidates)
+            if -negative < best[0][0] and len(best) >= ef:
+                break
+
+            neighbors = [n for n in self.links[node][level] if n not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+
+            for similarity, neighbor in zip((vectors[neighbors] @ query).tolist(), neighbors):
+                if len(best) < ef or similarity > best[0][0]:
+                    heapq.heappush(candidates, (-similarity, neighbor))
+                    heapq.heappush(best, (similarity, neighbor))
+                    if len(best) > ef:
+                        heapq.heappop(best)
+
+        return sorted(best, reverse=True)
+
+    def _descend(self, vectors: np.ndarray, query: np.ndarray, to_level: int) -> int:
+        """Greedily walk upper layers down to to_level, returning the closest node."""
+        node = self.entry_point
+        for level in range(self.max_level, to_level, -1):
+            node = self._search_layer(vectors, query, [node], 1, level)[0][1]
+        return node
+
+    def add(self, node: int):
+        """
+        Insert a matrix row into the graph.
+
+        Args:
+            node: Row position; must equal len(self)
+        """
+        if node != len(self.links):
+            raise ValueError(f"Expected node {len(self.links)}, got {node}")
+
+        level = int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+        self.links.append([[] for _ in range(level + 1)])
+
+        if self.entry_point is None:
+            self.entry_point = node
+            self.max_level = level
+            return
+
+        vectors = self.get_vectors()
+        query = vectors[node]
+        entry = self._descend(vectors, query, level)
+
+        for layer in range(min(level, self.max_level), -1, -1):
+            found = self._search_layer(vectors, query, [entry], self.ef_construction, layer)
+            neighbors = self._select(vectors, found, self._max_links(layer))
+            self.links[node][layer] = neighbors
+            for neighbor in neighbors:
+                self._link(vectors, neighbor, node, layer)
+            entry = found[0][1]
+
+        if level > self.max_level:
+            self.entry_point = node
+            self.max_level = level
+
+    def _select(
+        self,
+        vectors: np.ndarray,
+        candidates: list[tuple[float, int]],
+        max_links: int,
+    ) -> list[int]:
+        """
+        Pick diverse neighbors from candidates sorted best first.
+
+        A candidate is kept only if it is closer to the base node than to
+        every neighbor kept so far, so links span clusters instead of all
+        pointing into the nearest one.
+        """
+        nodes = [node for _similarity, node in candidates]
+        pairwise = vectors[nodes] @ vectors[nodes].T
+        selected: list[int] = []
+        for i, (similarity, _node) in enumerate(candidates):
+            if len(selected) >= max_links:
+                break
+            if not selected or similarity > pairwise[i, selected].max():
+                selected.append(i)
+        return [nodes[i] for i in selected]
+
+    def _link(self, vectors: np.ndarray, node: int, neighbor: int, level: int):
+        """Add a link, re-selecting neighbors when the node is full."""
+        links = self.links[node][level]
+        links.append(neighbor)
+        if len(links) > self._max_links(level):
+            similarities = (vectors[links] @ vectors[node]).tolist()
+            candidates = sorted(zip(similarities, links), reverse=True)
+            self.links[node][level] = self._select(vectors, candidates, self._max_links(level))
+
+    def mark_deleted(self, node: int):
+        """Exclude a node from search results."""
+        self.deleted.add(node)
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        ef: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find approximate nearest rows.
+
+        Args:
+            query: Unit query vector
+            top_k: Rows to return
+            ef: Candidate list size (defaults to ef_runtime, at least top_k)
+
+        Returns:
+            Tuple of (row positions, similarities), best first
+        """
+        if self.entry_point is None or top_k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+
+        vectors = self.get_vectors()
+        query = np.asarray(query, dtype=np.float32)
+        ef = max(ef or self.ef_runtime, top_k)
+        entry = self._descend(vectors, query, 0)
+        found = self._search_layer(vectors, query, [entry], ef + len(self.deleted), 0)
+        found = [(s, n) for s, n in found if n not in self.deleted][:top_k]
+        return (
+            np.array([n for _s, n in found], dtype=np.intp),
+            np.array([s for s, _n in found], dtype=np.float32),
+        )
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Flatten links into arrays for np.savez."""
+        levels = np.array([len(node_links) - 1 for node_links in self.links], dtype=np.int8)
+        rows = [(node, level) for node, top in enumerate(levels) for level in range(top + 1)]
+        width = self.m * 2
+        links = np.full((len(rows), width), -1, dtype=np.int32)
+        for i, (node, level) in enumerate(rows):
+            neighbors = self.links[node][level]
+            links[i, :len(neighbors)] = neighbors
+        return {
+            "levels": levels,
+            "links": links,
+            "deleted": np.array(sorted(self.deleted), dtype=np.int64),
+            "entry_point": np.array([-1 if self.entry_point is None else self.entry_point]),
+        }
+
+    def load_arrays(self, arrays):
+        """Restore links saved by to_arrays."""
+        levels = arrays["levels"].tolist()
+        flat = arrays["links"].tolist()
+        self.links = []
+        row = 0
+        for top in levels:
+            node_links = []
+            for _level in range(top + 1):
+                node_links.append([n for n in flat[row] if n >= 0])
+                row += 1
+            self.links.append(node_links)
+        self.deleted = set(arrays["deleted"].tolist())
+        entry_point = int(arrays["entry_point"][0])
+        self.entry_point = None if entry_point < 0 else entry_point
+        self.max_level = levels[self.entry_point] if self.entry_point is not None else -1
@@ -0,0 +1,162 @@
+"""Keyword scoring, rank fusion and query snippets for hybrid search."""
+
+import math
+import re
+from collections import Counter, defaultdict, deque
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens (identifiers stay whole)."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def reciprocal_rank_fusion(
+    rankings: list[list[str]],
+    weights: list[float] | None = None,
+    k: int = 60,
+) -> list[tuple[str, float]]:
+    """
+    Fuse ranked ID lists with weighted reciprocal rank fusion.
+
+    Each list contributes weight / (k + rank) for every ID it contains,
+    with ranks starting at 1.
+
+    Args:
+        rankings: Ranked ID lists, best first
+        weights: Weight per list (defaults to 1.0 each)
+        k: Damping constant; larger values flatten rank differences
+
+    Returns:
+        (id, fused score) pairs, best first
+    """
+    weights = weights or [1.0] * len(rankings)
+    scores: dict[str, float] = defaultdict(float)
+    for ranking, weight in zip(rankings, weights):
+        for rank, item in enumerate(ranking, 1):
+            scores[item] += weight / (k + rank)
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents (None marks a deleted slot)."""
+
+    def __init__(self, documents: list[str | None], k1: float = 1.2, b: float = 0.75):
+        """
+        Build postings for documents.
+
+        Args:
+            documents: Document texts, indexed by position
+            k1: Term frequency saturation
+            b: Length normalization strength
+        """
+        self.k1 = k1
+        self.b = b
+        self.size = len(documents)
+
+        lengths = np.zeros(self.size, dtype=np.float32)
+        postings: dict[str, tuple[list[int], list[int]]] = defaultdict(lambda: ([], []))
+        for position, text in enumerate(documents):
+            if text is None:
+                continue
+            counts = Counter(tokenize(text))
+            lengths[position] = sum(counts.values())
+            for term, count in counts.items():
+                rows, freqs = postings[term]
+                rows.append(position)
+                freqs.append(count)
+
+        live = sum(text is not None for text in documents)
+        self.lengths = lengths
+        self.average_length = float(lengths.sum() / live) if live else 0.0
+        self.live = live
+        self.postings = {
+            term: (np.array(rows, dtype=np.intp), np.array(freqs, dtype=np.float32))
+            for term, (rows, freqs) in postings.items()
+        }
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        Score every document against a query.
+
+        Args:
+            query: Query text
+
+        Returns:
+            BM25 score per document position (0 where no term matches)
+        """
+        scores = np.zeros(self.size, dtype=np.float32)
+        if not self.live:
+            return scores
+
+        norm = self.k1 * (1 - self.b + self.b * self.lengths / (self.average_length or 1.0))
+        for term in set(tokenize(query)):
+            if term not in self.postings:
+                continue
+            rows, freqs = self.postings[term]
+            idf = math.log(1 + (self.live - len(rows) + 0.5) / (len(rows) + 0.5))
+            scores[rows] += idf * freqs * (self.k1 + 1) / (freqs + norm[rows])
+        return scores
+
+
+def snippet(text: str, query: str, width: int = 200) -> str:
+    """
+    Cut the window of text that best matches a query.
+
+    The window covering the most distinct query terms (then the most term
+    occurrences) is centered in the result; text without matches yields
+    its beginning. Whitespace is collapsed and cut ends are marked "...".
+
+    Args:
+        text: Chunk content
+        query: Query text
+        width: Window size in characters
+
+    Returns:
+        Snippet of about width characters
+    """
+    start = 0
+    if len(text) > width:
+        terms = set(tokenize(query))
+        matches = [
+            (match.start(), match.end(), match.group().lower())
+            for match in TOKEN_PATTERN.finditer(text)
+            if match.group().lower() in terms
+        ]
+
+        # Two-pointer sweep over matches: window holds matches fitting in width
+        best, best_span = (0, 0), None
+        window: deque = deque()
+        counts: Counter = Counter()
+        for match in matches:
+            window.append(match)
+            counts[match[2]] += 1
+            while match[1] - window[0][0] > width:
+                counts[window.popleft()[2]] -= 1
+            rank = (sum(1 for count in counts.values() if count), len(window))
+            if rank > best:
+                best, best_span = rank, (window[0][0], match[1])
+
+        if best_span is not None:
+            pad = (width - (best_span[1] - best_span[0])) // 2
+            start = max(0, min(best_span[0] - pad, len(text) - width))
+
+    end = min(start + width, len(text))
+    words = text[start:end].split()
+    # Drop words cut in half at either edge
+    if start > 0 and _mid_word(text, start) and len(words) > 1:
+        words = words[1:]
+    if end < len(text) and _mid_word(text, end) and len(words) > 1:
+        words = words[:-1]
+
+    prefix = "..." if start > 0 else ""
+    suffix = "..." if end < len(text) else ""
+    return f"{prefix}{' '.join(words)}{suffix}"
+
+
+def _mid_word(text: str, position: int) -> bool:
+    """Whether a cut at position splits a word."""
+    return not (text[position - 1].isspace() or text[position].isspace())
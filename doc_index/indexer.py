@@ -1,11 +1,59 @@
 # doc_index/indexer.py
 """High-level document indexing."""
 
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from doc_index.cache import AsyncEmbeddingCache, QueryResultCache
 from doc_index.chunker import MarkdownChunker
-from doc_index.embedder import AnthropicEmbedder
-from doc_index.vector_store import DragonflyVectorStore
+from doc_index.embedder import get_embedder
+from doc_index.hybrid import snippet
+from doc_index.manifest import IndexManifest
+from doc_index.pipeline import (
+    IndexingPipeline,
+    PipelineConfig,
+    PipelineResult,
+    StageTiming,
+    _read_and_chunk,
+    _stages,
+    read_pool,
+)
+from doc_index.tokenizer import load_tokenizer
+from doc_index.vector_store import (
+    RESULT_FIELDS,
+    AsyncDragonflyVectorStore,
+    VectorIndexConfig,
+    get_vector_store,
+)
+
+
+def _store_fields(
+    fields: tuple[str, ...] | None,
+    snippet_width: int | None,
+) -> tuple[str, ...] | None:
+    """Fields to load from the store: the projection plus content for snippets."""
+    if snippet_width is None:
+        return fields
+    fields = RESULT_FIELDS if fields is None else fields
+    return fields if "content" in fields else (*fields, "content")
+
+
+def _add_snippets(
+    query: str,
+    results: list[dict],
+    fields: tuple[str, ...] | None,
+    snippet_width: int | None,
+) -> list[dict]:
+    """Add query snippets, dropping content loaded only to cut them."""
+    if snippet_width is None:
+        return results
+    keep_content = fields is None or "content" in fields
+    for result in results:
+        content = result.get("content") if keep_content else result.pop("content", None)
+        result["snippet"] = snippet(content or "", query, snippet_width)
+    return results
 
 
 class DocumentIndexer:
@@ -16,87 +64,737 @@ class DocumentIndexer:
         index_name: str = "docs",
         chunk_size: int = 1000,
         overlap: int = 200,
+        chunk_mode: str = "chars",
+        chunk_unit: str = "chars",
+        tokenizer_path: str | None = None,
         embedding_dim: int = 768,
+        batch_size: int = 500,
+        embedder_backend: str = "anthropic",
+        pipeline_config: PipelineConfig | None = None,
+        manifest_path: Path | None = None,
+        store_backend: str = "dragonfly",
+        index_config: VectorIndexConfig | None = None,
+        query_cache_bytes: int = 16 * 1024 * 1024,
+        query_cache_ttl: float | None = 300.0,
     ):
         """
         Initialize indexer.
 
         Args:
             index_name: Name for vector index
-            chunk_size: Chunk size in characters
+            chunk_size: Chunk size in characters (or tokens)
             overlap: Overlap between chunks
+            chunk_mode: "chars" or "structure" (see MarkdownChunker)
+            chunk_unit: "chars" or "tokens" for chunk_size and overlap
+            tokenizer_path: tokenizer.json for token sizing; estimated if None
             embedding_dim: Embedding dimension
+            batch_size: Chunks per pipelined write to the vector store
+            embedder_backend: "anthropic" or "ollama"
+            pipeline_config: Worker counts and queue sizes for ingestion stages
+            manifest_path: Manifest file for incremental re-indexing. Defaults
+                           to manifest.json in the local store's directory, or
+                           .doc-index/<index_name>.<store_backend>.manifest.json
+            store_backend: "dragonfly" or "local" (in-process, no server needed)
+            index_config: Vector index type (FLAT or HNSW) and HNSW parameters
+            query_cache_bytes: Size bound of the search result cache (0 disables it)
+            query_cache_ttl: Seconds a cached search result stays valid
         """
-        self.chunker = MarkdownChunker(chunk_size, overlap)
-        self.embedder = AnthropicEmbedder()
-        self.vector_store = DragonflyVectorStore(index_name=index_name)
+        tokenizer = load_tokenizer(tokenizer_path) if chunk_unit == "tokens" else None
+        self.chunker = MarkdownChunker(chunk_size, overlap, mode=chunk_mode, tokenizer=tokenizer)
+        self._create_backends(embedder_backend, store_backend, index_name, batch_size, index_config)
+        self.pipeline_config = pipeline_config or PipelineConfig()
+        self.query_cache = (
+            QueryResultCache(query_cache_bytes, query_cache_ttl) if query_cache_bytes else None
+        )
+        self.manifest = IndexManifest(
+            manifest_path or self._default_manifest_path(index_name, store_backend),
+            fingerprint=self._fingerprint(embedding_dim),
+        )
 
         # Create index
-        self.vector_store.create_index(embedding_dim)
+        self._create_index(embedding_dim)
+
+        # Summary of the last index_directory run, persisted with the index stats
+        self._last_index: dict = {}
+
+    def _create_backends(
+        self,
+        embedder_backend: str,
+        store_backend: str,
+        index_name: str,
+        batch_size: int,
+        index_config: VectorIndexConfig | None,
+    ):
+        """Create the embedder and vector store."""
+        self.embedder = get_embedder(embedder_backend)
+        self.vector_store = get_vector_store(
+            store_backend,
+            index_name=index_name,
+            batch_size=batch_size,
+            index_config=index_config,
+        )
 
-        # Stats
-        self._total_chunks = 0
-        self._total_docs = 0
+    def _default_manifest_path(self, index_name: str, store_backend: str) -> Path:
+        """Manifest location kept with the store it describes."""
+        # The local store owns a directory; keep the manifest in it, so
+        # deleting the store also forgets what was indexed into it
+        store_path = getattr(self.vector_store, "path", None)
+        if store_path is not None:
+            return Path(store_path) / "manifest.json"
+        return Path(".doc-index") / f"{index_name}.{store_backend}.manifest.json"
 
-    def index_directory(self, directory: Path, pattern: str = "**/*.md") -> int:
+    def _fingerprint(self, dimension: int) -> dict:
+        """Settings that shape stored chunks and vectors; a change re-indexes everything."""
+        tokenizer = self.chunker.tokenizer
+        return {
+            "chunk_size": self.chunker.chunk_size,
+            "overlap": self.chunker.overlap,
+            "chunk_mode": self.chunker.mode,
+            "tokenizer": (
+                getattr(tokenizer, "path", type(tokenizer).__name__) if tokenizer else None
+            ),
+            "embedder": type(self.embedder).__name__,
+            "embedding_model": getattr(self.embedder, "model", None),
+            "dimension": dimension,
+        }
+
+    def _create_index(self, dimension: int):
+        """Create the vector index if it doesn't exist."""
+        self.vector_store.create_index(dimension)
+
+    def index_directory(
+        self,
+        directory: Path,
+        pattern: str = "**/*.md",
+        force: bool = False,
+    ) -> int:
         """
-        Index all markdown files in directory.
+        Index markdown files in directory that changed since the last run.
+
+        Files are compared against the manifest: unchanged files are
+        skipped, modified files have their old chunks replaced, and chunks
+        of deleted files are removed from the vector store. If the chunker
+        or embedder settings differ from those the manifest was saved with,
+        every file is re-indexed.
 
         Args:
             directory: Directory to index
             pattern: Glob pattern for files
+            force: Re-index every file regardless of the manifest
 
         Returns:
             Number of chunks indexed
         """
-        chunks_indexed = 0
+        diff, discover = self._plan(directory, pattern, force)
+        pipeline = IndexingPipeline(
+            self.chunker,
+            self.embedder,
+            self.vector_store,
+            self.pipeline_config,
+        )
+        result = pipeline.run(diff.to_index, discover)
+
+        stale_ids = self._record_run(diff, result)
+        if stale_ids:
+            self.vector_store.delete_chunks(stale_ids)
+        self._save_store()
+        self.manifest.save()
+        self.vector_store.save_stats(
+            self._index_stats(self.vector_store.memory_footprint(), self._last_index)
+        )
+        return result.chunks
+
+    def _plan(self, directory: Path, pattern: str, force: bool):
+        """
+        Diff the files matching pattern against the manifest.
 
-        for filepath in Path(directory).glob(pattern):
-            if not filepath.is_file():
-                continue
+        Returns:
+            Tuple of (ManifestDiff, timing of the glob and diff as the
+            "discover" stage, counting the files found)
+        """
+        started = time.perf_counter()
+        directory = Path(directory)
+        files = [path for path in directory.glob(pattern) if path.is_file()]
 
-            # Read content
-            content = filepath.read_text()
+        diff = self.manifest.diff(files, directory)
+        # Chunks built with other settings must all be rebuilt
+        if force or self.manifest.stale:
+            diff.updated.extend(diff.unchanged)
+            diff.unchanged = []
+        return diff, StageTiming(time.perf_counter() - started, len(files))
 
-            # Chunk
-            chunks = self.chunker.chunk(content, str(filepath))
+    def _record_run(self, diff, result: PipelineResult) -> list[str]:
+        """
+        Update the manifest and stats after a pipeline run.
 
-            # Embed
-            texts = [chunk.content for chunk in chunks]
-            embeddings = self.embedder.embed_batch(texts)
+        Returns:
+            Chunk IDs to delete: chunks the new versions of changed files no
+            longer produce, plus all chunks of removed files
+        """
+        stale_ids = []
+        for source, indexed in result.files.items():
+            new_ids = set(indexed.chunk_ids)
+            old_entry = self.manifest.entries.get(source)
+            if old_entry:
+                stale_ids.extend(cid for cid in old_entry.chunk_ids if cid not in new_ids)
+            self.manifest.record(
+                Path(source), indexed.sha256, indexed.chunk_ids, indexed.mtime_ns, indexed.size
+            )
+
+        for source in diff.removed:
+            stale_ids.extend(self.manifest.remove(source))
 
-            # Store
-            for chunk, embedding in zip(chunks, embeddings):
-                self.vector_store.add_chunk(chunk, embedding)
-                chunks_indexed += 1
+        embed_stats = self.embedder.get_stats() if hasattr(self.embedder, "get_stats") else {}
+        self._last_index = {
+            "finished_at": time.time(),
+            "seconds": result.wall_seconds,
+            "docs": result.docs,
+            "chunks": result.chunks,
+            "files": {
+                "added": len(diff.added),
+                "updated": len(diff.updated),
+                "removed": len(diff.removed),
+                "unchanged": len(diff.unchanged),
+            },
+            "chunks_per_sec": self.vector_store.get_write_stats()["chunks_per_sec"],
+            "texts_per_sec": embed_stats.get("texts_per_sec", 0.0),
+            "stage_timings": result.timings(),
+        }
+        return stale_ids
 
-            self._total_docs += 1
+    def _index_stats(self, memory: dict, last_index: dict) -> dict:
+        """
+        Build the statistics persisted with the index.
 
-        self._total_chunks = chunks_indexed
-        return chunks_indexed
+        Totals come from the manifest, so they describe the whole index
+        rather than the files touched by one run.
 
-    def search(self, query: str, top_k: int = 5) -> list[dict]:
+        Args:
+            memory: Store memory footprint after the run
+            last_index: Summary of the most recent index_directory run
+
+        Returns:
+            Dict saved through the store's save_stats
+        """
+        entries = self.manifest.entries.values()
+        return {
+            "docs": len(entries),
+            "chunks": sum(len(entry.chunk_ids) for entry in entries),
+            "bytes": sum(entry.size for entry in entries),
+            "vectors": memory["num_docs"],
+            "memory": memory,
+            "last_index": last_index,
+        }
+
+    def collect_garbage(self) -> int:
+        """
+        Drop stored chunks that no manifest entry references.
+
+        Cleans up keys orphaned by earlier runs (e.g. random chunk IDs
+        from before IDs were content-addressed).
+
+        Returns:
+            Number of keys removed
+        """
+        # Without a manifest every key would look orphaned
+        if not self.manifest.entries:
+            return 0
+
+        removed = self.vector_store.collect_garbage(self._live_ids())
+        self._save_store()
+        if removed:
+            last_index = self.vector_store.load_stats().get("last_index", {})
+            self.vector_store.save_stats(
+                self._index_stats(self.vector_store.memory_footprint(), last_index)
+            )
+        return removed
+
+    def _live_ids(self) -> set[str]:
+        """Chunk IDs referenced by the manifest."""
+        return {
+            chunk_id
+            for entry in self.manifest.entries.values()
+            for chunk_id in entry.chunk_ids
+        }
+
+    def _cached_results(
+        self,
+        queries: list[str],
+        version: int,
+        **params,
+    ) -> tuple[list[str], list[list[dict] | None]]:
+        """Cache keys per query and cached results for them (None for misses)."""
+        if self.query_cache is None:
+            return [], [None] * len(queries)
+        keys = [self.query_cache.key(query, version, **params) for query in queries]
+        return keys, [self.query_cache.get(key) for key in keys]
+
+    def _cache_results(self, keys: list[str], position: int, results: list[dict]):
+        """Store the results of one query under its cache key."""
+        if self.query_cache is not None:
+            self.query_cache.put(keys[position], results)
+
+    def _save_store(self):
+        """Persist stores that keep their index in process (no-op for Redis)."""
+        if hasattr(self.vector_store, "save"):
+            self.vector_store.save()
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        fields: tuple[str, ...] | None = None,
+        snippet_width: int | None = None,
+    ) -> list[dict]:
         """
         Search for relevant chunks.
 
         Args:
             query: Search query
             top_k: Number of results
+            source_prefix: Only match chunks whose source starts with this
+            fields: Chunk fields to return (defaults to all; pass () for
+                    chunk IDs and scores only)
+            snippet_width: Add a "snippet" of this many characters around
+                           the best match of the query in each chunk
 
         Returns:
             List of matching chunks
         """
-        # Embed query
-        query_embedding = self.embedder.embed(query)
+        return self.search_many([query], top_k, source_prefix, fields, snippet_width)[0]
+
+    def search_many(
+        self,
+        queries: list[str],
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        fields: tuple[str, ...] | None = None,
+        snippet_width: int | None = None,
+    ) -> list[list[dict]]:
+        """
+        Search for several queries at once.
+
+        All queries are embedded in one batch and searched in a single
+        store round trip (one matrix multiply for the local store). Results
+        are cached per query until the index changes; only cache misses are
+        embedded and searched.
+
+        Args:
+            queries: Search queries
+            top_k: Number of results per query
+            source_prefix: Only match chunks whose source starts with this
+            fields: Chunk fields to return (defaults to all; pass () for
+                    chunk IDs and scores only)
+            snippet_width: Add a "snippet" of this many characters around
+                           the best match of the query in each chunk
+
+        Returns:
+            One list of matching chunks per query, in input order
+        """
+        if not queries:
+            return []
+
+        queries = list(queries)
+        version = self.vector_store.index_version() if self.query_cache is not None else 0
+        keys, found = self._cached_results(
+            queries,
+            version,
+            mode="vector",
+            top_k=top_k,
+            source_prefix=source_prefix,
+            fields=fields,
+            snippet_width=snippet_width,
+        )
+        misses = [position for position, results in enumerate(found) if results is None]
+        if not misses:
+            return found
+
+        missed = [queries[position] for position in misses]
+        query_embeddings = (
+            [self.embedder.embed(missed[0])] if len(missed) == 1
+            else self.embedder.embed_batch(missed)
+        )
+        batches = self.vector_store.search_many(
+            query_embeddings, top_k, source_prefix, _store_fields(fields, snippet_width)
+        )
+        for position, query, results in zip(misses, missed, batches):
+            found[position] = _add_snippets(query, results, fields, snippet_width)
+            self._cache_results(keys, position, found[position])
+        return found
+
+    def search_hybrid(
+        self,
+        query: str,
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        text_weight: float = 1.0,
+        vector_weight: float = 1.0,
+        fields: tuple[str, ...] | None = None,
+        snippet_width: int | None = None,
+    ) -> list[dict]:
+        """
+        Search by keywords and meaning, fusing both with reciprocal rank fusion.
+
+        Finds exact identifiers (e.g. function names) that pure vector
+        search misses.
+
+        Args:
+            query: Search query
+            top_k: Number of results
+            source_prefix: Only match chunks whose source starts with this
+            text_weight: Weight of the keyword ranking
+            vector_weight: Weight of the vector ranking
+            fields: Chunk fields to return (defaults to all)
+            snippet_width: Add a "snippet" of this many characters around
+                           the best match of the query in each chunk
 
-        # Search
-        results = self.vector_store.search(query_embedding, top_k)
+        Returns:
+            List of matching chunks, best first
+        """
+        version = self.vector_store.index_version() if self.query_cache is not None else 0
+        keys, found = self._cached_results(
+            [query],
+            version,
+            mode="hybrid",
+            top_k=top_k,
+            source_prefix=source_prefix,
+            weights=[text_weight, vector_weight],
+            fields=fields,
+            snippet_width=snippet_width,
+        )
+        if found[0] is not None:
+            return found[0]
 
+        query_embedding = self.embedder.embed(query)
+        results = self.vector_store.search_hybrid(
+            query,
+            query_embedding,
+            top_k,
+            source_prefix=source_prefix,
+            text_weight=text_weight,
+            vector_weight=vector_weight,
+            fields=_store_fields(fields, snippet_width),
+        )
+        results = _add_snippets(query, results, fields, snippet_width)
+        self._cache_results(keys, 0, results)
         return results
 
     def get_stats(self) -> dict:
-        """Get indexer statistics."""
+        """
+        Get index statistics.
+
+        Reads the statistics persisted by the last index or garbage
+        collection run (one GET, or one small file for the local store), so
+        every process sees the same numbers without querying FT.INFO.
+        """
+        return self._stats(self.vector_store.load_stats())
+
+    def _stats(self, stats: dict) -> dict:
+        """Assemble get_stats from persisted index statistics."""
+        last_index = stats.get("last_index", {})
         return {
-            "total_chunks": self._total_chunks,
-            "total_docs": self._total_docs,
+            "total_chunks": stats.get("chunks", 0),
+            "total_docs": stats.get("docs", 0),
+            "total_bytes": stats.get("bytes", 0),
+            "vectors": stats.get("vectors", 0),
+            "chunks_per_sec": last_index.get("chunks_per_sec", 0.0),
+            "texts_per_sec": last_index.get("texts_per_sec", 0.0),
+            "stage_timings": last_index.get("stage_timings", {}),
+            "files": last_index.get(
+                "files", {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+            ),
+            "last_index_seconds": last_index.get("seconds", 0.0),
+            "indexed_at": last_index.get("finished_at"),
+            "memory": stats.get("memory", {}),
+            "query_cache": self.query_cache.get_stats() if self.query_cache is not None else {},
+        }
+
+
+class AsyncDocumentIndexer(DocumentIndexer):
+    """
+    DocumentIndexer for asyncio code (e.g. FastAPI handlers).
+
+    Public methods are coroutines taking the same arguments as
+    DocumentIndexer. Redis traffic goes through pooled redis.asyncio
+    clients, embeddings are cached with AsyncEmbeddingCache, and embedders
+    without aembed_batch run in a worker thread. Only the dragonfly store
+    is supported. The index is created on first use; use `async with` or
+    aclose() to release connections.
+    """
+
+    def __init__(self, *args, max_connections: int = 16, **kwargs):
+        """
+        Initialize indexer.
+
+        Args:
+            *args: As for DocumentIndexer
+            max_connections: Connection pool size of each Redis client
+            **kwargs: As for DocumentIndexer
+        """
+        self.max_connections = max_connections
+        self._index_ready = False
+        super().__init__(*args, **kwargs)
+
+    def _create_backends(
+        self,
+        embedder_backend: str,
+        store_backend: str,
+        index_name: str,
+        batch_size: int,
+        index_config: VectorIndexConfig | None,
+    ):
+        """Create the embedder, async embedding cache and async vector store."""
+        if store_backend != "dragonfly":
+            raise ValueError(
+                f"AsyncDocumentIndexer only supports the dragonfly store, got {store_backend!r}"
+            )
+        self.embedder = get_embedder(embedder_backend, use_cache=False)
+        self.cache = AsyncEmbeddingCache(max_connections=self.max_connections)
+        self.vector_store = AsyncDragonflyVectorStore(
+            index_name=index_name,
+            batch_size=batch_size,
+            index_config=index_config,
+            max_connections=self.max_connections,
+        )
+
+    def _create_index(self, dimension: int):
+        """Remember the dimension; the index is created on first use."""
+        self._dimension = dimension
+
+    async def _ensure_index(self):
+        """Create the vector index once."""
+        if not self._index_ready:
+            await self.vector_store.create_index(self._dimension)
+            self._index_ready = True
+
+    async def __aenter__(self) -> "AsyncDocumentIndexer":
+        await self._ensure_index()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the Redis connection pools and the embedder's HTTP client."""
+        await self.vector_store.aclose()
+        await self.cache.aclose()
+        if hasattr(self.embedder, "aclose"):
+            await self.embedder.aclose()
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts through the cache; only misses reach the embedder."""
+        unique = list(dict.fromkeys(texts))
+        vectors = {
+            text: vector
+            for text, vector in zip(unique, await self.cache.get_many(unique))
+            if vector is not None
         }
+
+        missing = [text for text in unique if text not in vectors]
+        if missing:
+            if hasattr(self.embedder, "aembed_batch"):
+                embedded = await self.embedder.aembed_batch(missing)
+            else:
+                embedded = await asyncio.to_thread(self.embedder.embed_batch, missing)
+            vectors.update(zip(missing, embedded))
+            await self.cache.set_many(missing, embedded)
+
+        return [vectors[text] for text in texts]
+
+    async def index_directory(
+        self,
+        directory: Path,
+        pattern: str = "**/*.md",
+        force: bool = False,
+    ) -> int:
+        """
+        Index markdown files in directory that changed since the last run.
+
+        Args:
+            directory: Directory to index
+            pattern: Glob pattern for files
+            force: Re-index every file regardless of the manifest
+
+        Returns:
+            Number of chunks indexed
+        """
+        await self._ensure_index()
+        diff, discover = await asyncio.to_thread(self._plan, directory, pattern, force)
+        result = await self._run_pipeline([str(path) for path in diff.to_index], discover)
+
+        stale_ids = self._record_run(diff, result)
+        if stale_ids:
+            await self.vector_store.delete_chunks(stale_ids)
+        await asyncio.to_thread(self.manifest.save)
+        await self.vector_store.save_stats(
+            self._index_stats(await self.vector_store.memory_footprint(), self._last_index)
+        )
+        return result.chunks
+
+    async def _run_pipeline(
+        self, paths: list[str], discover: StageTiming | None = None
+    ) -> PipelineResult:
+        """
+        Read+chunk files in a process pool, then embed and store their chunks.
+
+        read_workers * 2 file tasks run at once; at most embed_workers
+        embedding calls and store_workers store writes are in flight.
+        discover is reported as the "discover" stage timing.
+        """
+        config = self.pipeline_config
+        result = PipelineResult(stages=_stages(discover))
+        started = time.perf_counter()
+
+        loop = asyncio.get_running_loop()
+        embed_slots = asyncio.Semaphore(config.embed_workers)
+        store_slots = asyncio.Semaphore(config.store_workers)
+        pending = iter(paths)
+
+        def record(stage: StageTiming, since: float, items: int):
+            stage.seconds += time.perf_counter() - since
+            stage.items += items
+
+        async def index_files(pool: ProcessPoolExecutor | None):
+            for path in pending:
+                path, chunks, indexed, seconds = await loop.run_in_executor(
+                    pool, _read_and_chunk, self.chunker, path
+                )
+                result.stages["read"].seconds += seconds
+                result.stages["read"].items += 1
+                result.docs += 1
+                result.files[path] = indexed
+
+                for start in range(0, len(chunks), config.embed_batch_size):
+                    batch = chunks[start:start + config.embed_batch_size]
+                    async with embed_slots:
+                        since = time.perf_counter()
+                        embeddings = await self._embed_batch([chunk.content for chunk in batch])
+                        record(result.stages["embed"], since, len(batch))
+                    async with store_slots:
+                        since = time.perf_counter()
+                        written = await self.vector_store.add_chunks(batch, embeddings)
+                        record(result.stages["store"], since, written)
+                    result.chunks += written
+
+        pool = read_pool(config.read_workers) if config.read_workers > 1 else None
+        try:
+            async with asyncio.TaskGroup() as group:
+                for _ in range(max(config.read_workers, 1) * 2):
+                    group.create_task(index_files(pool))
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0] from None
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        result.wall_seconds = time.perf_counter() - started
+        return result
+
+    async def collect_garbage(self) -> int:
+        """
+        Drop stored chunks that no manifest entry references.
+
+        Returns:
+            Number of keys removed
+        """
+        if not self.manifest.entries:
+            return 0
+        removed = await self.vector_store.collect_garbage(self._live_ids())
+        if removed:
+            last_index = (await self.vector_store.load_stats()).get("last_index", {})
+            await self.vector_store.save_stats(
+                self._index_stats(await self.vector_store.memory_footprint(), last_index)
+            )
+        return removed
+
+    async def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        fields: tuple[str, ...] | None = None,
+        snippet_width: int | None = None,
+    ) -> list[dict]:
+        """Search for relevant chunks (see DocumentIndexer.search)."""
+        return (await self.search_many([query], top_k, source_prefix, fields, snippet_width))[0]
+
+    async def search_many(
+        self,
+        queries: list[str],
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        fields: tuple[str, ...] | None = None,
+        snippet_width: int | None = None,
+    ) -> list[list[dict]]:
+        """Search for several queries in one embedding batch and one round trip."""
+        if not queries:
+            return []
+
+        queries = list(queries)
+        version = await self.vector_store.index_version() if self.query_cache is not None else 0
+        keys, found = self._cached_results(
+            queries,
+            version,
+            mode="vector",
+            top_k=top_k,
+            source_prefix=source_prefix,
+            fields=fields,
+            snippet_width=snippet_width,
+        )
+        misses = [position for position, results in enumerate(found) if results is None]
+        if not misses:
+            return found
+
+        missed = [queries[position] for position in misses]
+        query_embeddings = await self._embed_batch(missed)
+        batches = await self.vector_store.search_many(
+            query_embeddings, top_k, source_prefix, _store_fields(fields, snippet_width)
+        )
+        for position, query, results in zip(misses, missed, batches):
+            found[position] = _add_snippets(query, results, fields, snippet_width)
+            self._cache_results(keys, position, found[position])
+        return found
+
+    async def search_hybrid(
+        self,
+        query: str,
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        text_weight: float = 1.0,
+        vector_weight: float = 1.0,
+        fields: tuple[str, ...] | None = None,
+        snippet_width: int | None = None,
+    ) -> list[dict]:
+        """Search by keywords and meaning (see DocumentIndexer.search_hybrid)."""
+        version = await self.vector_store.index_version() if self.query_cache is not None else 0
+        keys, found = self._cached_results(
+            [query],
+            version,
+            mode="hybrid",
+            top_k=top_k,
+            source_prefix=source_prefix,
+            weights=[text_weight, vector_weight],
+            fields=fields,
+            snippet_width=snippet_width,
+        )
+        if found[0] is not None:
+            return found[0]
+
+        query_embedding = (await self._embed_batch([query]))[0]
+        results = await self.vector_store.search_hybrid(
+            query,
+            query_embedding,
+            top_k,
+            source_prefix=source_prefix,
+            text_weight=text_weight,
+            vector_weight=vector_weight,
+            fields=_store_fields(fields, snippet_width),
+        )
+        results = _add_snippets(query, results, fields, snippet_width)
+        self._cache_results(keys, 0, results)
+        return results
+
+    async def get_stats(self) -> dict:
+        """Get index statistics (see DocumentIndexer.get_stats)."""
+        return self._stats(await self.vector_store.load_stats())
@@ -0,0 +1,732 @@
+"""In-process vector storage backed by a memory-mapped NumPy matrix."""
+
+import json
+import mmap
+import os
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+from doc_index.chunker import DocumentChunk
+from doc_index.hnsw import HNSWGraph
+from doc_index.hybrid import BM25Index
+from doc_index.vector_store import RESULT_FIELDS, VectorIndexConfig, fuse_rankings
+
+LOCAL_STORE_VERSION = 2
+# Versions that can still be loaded; version 1 kept chunk content in meta.json
+READABLE_VERSIONS = (1, LOCAL_STORE_VERSION)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    Scale rows to unit length so dot products are cosine similarities.
+
+    All-zero rows are left as zeros.
+
+    Args:
+        matrix: 2-D float array
+
+    Returns:
+        New float32 matrix with unit-length rows
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class LocalVectorStore:
+    """
+    Store and search document embeddings without a Redis server.
+
+    Vectors live in one float32 matrix, normalized on insert. A FLAT index
+    answers a query with a single matrix-vector product followed by an
+    argpartition top-k; an HNSW index walks a graph over the same matrix.
+    save() persists the matrix as .npy, chunk content as one UTF-8 file
+    and the remaining row fields in a JSON metadata sidecar; loading
+    memory-maps the matrix copy-on-write and the content read-only, so
+    startup reads neither and processes searching the same index share
+    page cache. save() writes nothing if the index hasn't changed.
+    """
+
+    def __init__(
+        self,
+        index_name: str = "docs",
+        path: Path | None = None,
+        batch_size: int = 500,
+        index_config: VectorIndexConfig | None = None,
+    ):
+        """
+        Initialize vector store, loading a saved index if present.
+
+        Args:
+            index_name: Name for the vector index
+            path: Directory holding the index files.
+                  Defaults to .doc-index/<index_name>
+            batch_size: Kept for interface parity with DragonflyVectorStore
+            index_config: Vector index type and HNSW parameters
+        """
+        self.index_name = index_name
+        self.path = Path(path or Path(".doc-index") / index_name)
+        self.batch_size = batch_size
+        self.index_config = index_config or VectorIndexConfig()
+        if self.index_config.vector_type != "FLOAT32":
+            raise ValueError("LocalVectorStore only stores FLOAT32 vectors")
+        self._dimension: int | None = None
+
+        self._lock = threading.Lock()
+        self._vectors: np.ndarray | None = None  # rows [:_count] are in use
+        self._count = 0
+        # None marks a deleted row (HNSW keeps row positions stable). Rows
+        # added since the last save hold "content"; saved rows hold a
+        # "content_span" of (offset, length) into the mapped content file
+        self._rows: list[dict | None] = []
+        self._positions: dict[str, int] = {}
+        self._files: dict[str, str] = {}
+        self._content_map: mmap.mmap | bytes = b""
+        self._dirty = False  # Changed since the last load or save
+        self._graph = self._new_graph()
+        self._keywords: BM25Index | None = None  # Built on first hybrid search
+        self._version = 0  # Bumped on every change to the stored chunks
+
+        # Write throughput counters
+        self._chunks_written = 0
+        self._batches_written = 0
+        self._write_seconds = 0.0
+
+        self.load()
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.path / "meta.json"
+
+    @property
+    def _stats_path(self) -> Path:
+        return self.path / "stats.json"
+
+    def _new_graph(self) -> HNSWGraph | None:
+        """Create an empty graph for HNSW indexes."""
+        if self.index_config.index_type != "HNSW":
+            return None
+        return HNSWGraph(
+            lambda: self._vectors,
+            m=self.index_config.m,
+            ef_construction=self.index_config.ef_construction,
+            ef_runtime=self.index_config.ef_runtime,
+        )
+
+    def load(self):
+        """Load the saved index, memory-mapping its vectors."""
+        try:
+            meta = json.loads(self._meta_path.read_text())
+        except (OSError, ValueError):
+            return
+        if meta.get("version") not in READABLE_VERSIONS:
+            return
+
+        vectors = np.load(self.path / meta["vectors"], mmap_mode="c")
+        content_map = self._map_content(meta.get("content"))
+        with self._lock:
+            self._dimension = meta["dimension"]
+            self._vectors = vectors
+            self._count = len(meta["rows"])
+            self._rows = meta["rows"]
+            self._positions = {row["chunk_id"]: i for i, row in enumerate(self._rows) if row}
+            self._files = {"vectors": meta["vectors"]}
+            if meta.get("content"):
+                self._files["content"] = meta["content"]
+            self._close_content()
+            self._content_map = content_map
+            self._keywords = None
+            self._version += 1
+            self._dirty = False
+
+            if self._graph is None:
+                if len(self._positions) < self._count:
+                    self._compact()
+                    self._dirty = True
+            elif meta.get("graph"):
+                self._files["graph"] = meta["graph"]
+                with np.load(self.path / meta["graph"]) as arrays:
+                    self._graph.load_arrays(arrays)
+            else:
+                self._rebuild_graph()  # Saved by a FLAT index
+                self._dirty = True
+
+    def _map_content(self, name: str | None) -> mmap.mmap | bytes:
+        """Memory-map a saved content file (empty files can't be mapped)."""
+        if not name or os.path.getsize(self.path / name) == 0:
+            return b""
+        with open(self.path / name, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _close_content(self):
+        """Unmap the current content file."""
+        if isinstance(self._content_map, mmap.mmap):
+            self._content_map.close()
+        self._content_map = b""
+
+    def _content(self, row: dict) -> str:
+        """A row's content, held in memory or read from the content file."""
+        if "content" in row:
+            return row["content"]
+        offset, length = row["content_span"]
+        return self._content_map[offset:offset + length].decode()
+
+    def save(self):
+        """
+        Persist the index atomically.
+
+        Vectors (HNSW links, content) are written to fresh files and the
+        metadata sidecar, which names them, is swapped in last; processes
+        still mapping the previous files keep a consistent view. Does
+        nothing if the index hasn't changed since it was loaded or saved.
+        """
+        with self._lock:
+            if self._dimension is None or not self._dirty:
+                return
+            # Reclaim deleted HNSW rows once they make up half the matrix
+            if (self._count - len(self._positions)) * 2 > self._count:
+                self._compact()
+
+            self.path.mkdir(parents=True, exist_ok=True)
+            token = uuid.uuid4().hex[:12]
+            files = {"vectors": f"vectors-{token}.npy"}
+            with open(self.path / files["vectors"], "wb") as f:
+                np.save(f, self._live_vectors())
+            if self._graph is not None:
+                files["graph"] = f"graph-{token}.npz"
+                with open(self.path / files["graph"], "wb") as f:
+                    np.savez(f, **self._graph.to_arrays())
+
+            files["content"] = f"content-{token}.bin"
+            spans = []
+            with open(self.path / files["content"], "wb") as f:
+                offset = 0
+                for row in self._rows:
+                    if row is None:
+                        spans.append(None)
+                        continue
+                    data = self._content(row).encode()
+                    f.write(data)
+                    spans.append([offset, len(data)])
+                    offset += len(data)
+            saved_rows = [
+                None if row is None else {
+                    **{key: value for key, value in row.items() if key != "content"},
+                    "content_span": span,
+                }
+                for row, span in zip(self._rows, spans)
+            ]
+
+            meta = {
+                "version": LOCAL_STORE_VERSION,
+                "index_name": self.index_name,
+                "dimension": self._dimension,
+                "index_config": asdict(self.index_config),
+                "vectors": files["vectors"],
+                "graph": files.get("graph"),
+                "content": files["content"],
+                "rows": saved_rows,
+            }
+            tmp_path = self._meta_path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(meta))
+            os.replace(tmp_path, self._meta_path)
+
+            # Serve content from the new file; in-memory copies can go
+            self._close_content()
+            self._content_map = self._map_content(files["content"])
+            self._rows = saved_rows
+            self._dirty = False
+
+            previous, self._files = self._files, files
+            for name in previous.values():
+                (self.path / name).unlink(missing_ok=True)
+
+    def _compact(self):
+        """Drop deleted rows, renumbering positions (rebuilds any graph)."""
+        keep = [i for i, row in enumerate(self._rows) if row is not None]
+        self._vectors = np.ascontiguousarray(self._live_vectors()[keep])
+        self._rows = [self._rows[i] for i in keep]
+        self._count = len(keep)
+        self._positions = {row["chunk_id"]: i for i, row in enumerate(self._rows)}
+        self._keywords = None
+        if self._graph is not None:
+            self._rebuild_graph()
+
+    def _rebuild_graph(self):
+        """Re-insert every row into a fresh graph."""
+        self._graph = self._new_graph()
+        for position, row in enumerate(self._rows):
+            self._graph.add(position)
+            if row is None:
+                self._graph.mark_deleted(position)
+
+    def create_index(self, dimension: int):
+        """
+        Set the embedding dimension of a new index.
+
+        Args:
+            dimension: Embedding dimension
+        """
+        if self._dimension is not None and self._dimension != dimension:
+            raise ValueError(
+                f"Index {self.index_name!r} has dimension {self._dimension}, not {dimension}"
+            )
+        if self._dimension is None:
+            self._dirty = True
+        self._dimension = dimension
+
+    def index_exists(self) -> bool:
+        """Check if index exists."""
+        return self._dimension is not None
+
+    def _live_vectors(self) -> np.ndarray:
+        """View of the occupied rows of the matrix."""
+        if self._vectors is None:
+            return np.empty((0, self._dimension or 0), dtype=np.float32)
+        return self._vectors[:self._count]
+
+    def _reserve(self, extra: int):
+        """Grow the matrix (geometrically) to fit extra rows."""
+        needed = self._count + extra
+        capacity = 0 if self._vectors is None else len(self._vectors)
+        if needed <= capacity:
+            return
+
+        grown = np.empty((max(needed, capacity * 2, 1024), self._dimension), dtype=np.float32)
+        grown[:self._count] = self._live_vectors()
+        self._vectors = grown
+
+    def add_chunk(self, chunk: DocumentChunk, embedding: list[float]):
+        """
+        Add chunk with embedding to store.
+
+        Args:
+            chunk: Document chunk
+            embedding: Embedding vector
+        """
+        self.add_chunks([chunk], [embedding])
+
+    def add_chunks(
+        self,
+        chunks: list[DocumentChunk],
+        embeddings: list[list[float]],
+        batch_size: int | None = None,
+    ) -> int:
+        """
+        Add many chunks with embeddings.
+
+        Chunks whose ID is already stored replace the existing entry.
+
+        Args:
+            chunks: Document chunks
+            embeddings: Embedding vectors, one per chunk
+            batch_size: Unused; accepted for interface parity
+
+        Returns:
+            Number of chunks written
+        """
+        if len(chunks) != len(embeddings):
+            raise ValueError(
+                f"Got {len(chunks)} chunks but {len(embeddings)} embeddings"
+            )
+        if not chunks:
+            return 0
+
+        started = time.perf_counter()
+        matrix = normalize_rows(embeddings)
+        if self._dimension is None:
+            self._dimension = matrix.shape[1]
+        if matrix.shape[1] != self._dimension:
+            raise ValueError(
+                f"Got {matrix.shape[1]}-dimensional embeddings, index has {self._dimension}"
+            )
+
+        with self._lock:
+            self._keywords = None
+            self._version += 1
+            self._dirty = True
+            self._reserve(len(chunks))
+            for chunk, row in zip(chunks, matrix):
+                position = self._positions.get(chunk.chunk_id)
+                if position is not None and self._graph is not None:
+                    # Graph links depend on the old vector: retire the node
+                    self._tombstone(position)
+                    position = None
+                if position is None:
+                    position = self._count
+                    self._positions[chunk.chunk_id] = position
+                    self._rows.append({})
+                    self._count += 1
+                self._vectors[position] = row
+                self._rows[position] = {
+                    "chunk_id": chunk.chunk_id,
+                    "source": chunk.source,
+                    "content": chunk.content,
+                    "start_pos": chunk.start_pos,
+                    "end_pos": chunk.end_pos,
+                    "heading_path": " > ".join(chunk.metadata.get("heading_path", [])),
+                }
+                if self._graph is not None and position == len(self._graph):
+                    self._graph.add(position)
+
+        self._write_seconds += time.perf_counter() - started
+        self._batches_written += 1
+        self._chunks_written += len(chunks)
+        return len(chunks)
+
+    def delete_chunks(self, chunk_ids: list[str], batch_size: int | None = None) -> int:
+        """
+        Delete chunks by ID.
+
+        FLAT indexes move the last row into each freed slot, keeping the
+        matrix dense; HNSW indexes mark the row deleted until save() compacts.
+
+        Args:
+            chunk_ids: IDs of chunks to remove
+            batch_size: Unused; accepted for interface parity
+
+        Returns:
+            Number of chunks actually deleted
+        """
+        deleted = 0
+        with self._lock:
+            self._keywords = None
+            self._version += 1
+            for chunk_id in chunk_ids:
+                position = self._positions.pop(chunk_id, None)
+                if position is None:
+                    continue
+                deleted += 1
+                if self._graph is not None:
+                    self._tombstone(position)
+                    continue
+                last = self._count - 1
+                if position != last:
+                    self._vectors[position] = self._vectors[last]
+                    self._rows[position] = self._rows[last]
+                    self._positions[self._rows[position]["chunk_id"]] = position
+                self._rows.pop()
+                self._count -= 1
+            self._dirty = self._dirty or deleted > 0
+        return deleted
+
+    def _tombstone(self, position: int):
+        """Mark a row deleted without moving other rows."""
+        self._rows[position] = None
+        self._graph.mark_deleted(position)
+
+    def collect_garbage(self, live_ids: set[str], scan_count: int = 1000) -> int:
+        """
+        Remove chunks that are not in the live set.
+
+        Args:
+            live_ids: Chunk IDs that must be kept
+            scan_count: Unused; accepted for interface parity
+
+        Returns:
+            Number of chunks removed
+        """
+        dead_ids = [chunk_id for chunk_id in self._positions if chunk_id not in live_ids]
+        return self.delete_chunks(dead_ids)
+
+    def index_version(self) -> int:
+        """Counter bumped by every add, delete and load (for result caching)."""
+        return self._version
+
+    def save_stats(self, stats: dict):
+        """Atomically persist index statistics next to the index files."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._stats_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(stats))
+        os.replace(tmp_path, self._stats_path)
+
+    def load_stats(self) -> dict:
+        """Load statistics saved by save_stats ({} if none)."""
+        try:
+            return json.loads(self._stats_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def get_write_stats(self) -> dict:
+        """Get write throughput counters for this store."""
+        seconds = self._write_seconds
+        return {
+            "chunks_written": self._chunks_written,
+            "batches_written": self._batches_written,
+            "write_seconds": seconds,
+            "chunks_per_sec": self._chunks_written / seconds if seconds else 0.0,
+        }
+
+    def memory_footprint(self) -> dict:
+        """
+        Report the memory taken by stored vectors.
+
+        Returns:
+            Dict with document count, vector type, bytes per vector and
+            total vector bytes (including deleted HNSW rows until compacted)
+        """
+        dimension = self._dimension or 0
+        return {
+            "num_docs": len(self._positions),
+            "vector_type": "FLOAT32",
+            "bytes_per_vector": dimension * 4,
+            "vector_bytes": self._count * dimension * 4,
+            "float32_bytes": len(self._positions) * dimension * 4,
+            "index_reported_mb": None,
+        }
+
+    def _source_mask(self, source_prefix: str | None) -> np.ndarray | None:
+        """Rows that are live (not HNSW-deleted) and under source_prefix, or None."""
+        if not source_prefix:
+            return None
+        return np.fromiter(
+            (row is not None and row["source"].startswith(source_prefix) for row in self._rows),
+            dtype=bool,
+            count=self._count,
+        )
+
+    def _top_k(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        Find the most similar rows for a batch of queries.
+
+        Args:
+            queries: (q, dimension) query matrix
+            top_k: Rows to return per query
+            mask: Only consider rows where this is True. Filtered HNSW
+                  queries are answered exactly over the matching rows.
+
+        Returns:
+            Per query, a tuple of (row positions, cosine similarities)
+            sorted best first
+        """
+        queries = normalize_rows(queries)
+        if self._graph is not None and mask is None:
+            ef = self.index_config.ef_runtime
+            return [self._graph.search(query, top_k, ef) for query in queries]
+
+        vectors = self._live_vectors()
+        k = min(top_k, len(vectors) if mask is None else int(mask.sum()))
+        if k <= 0:
+            return [(np.empty(0, dtype=np.intp), np.empty(0))] * len(queries)
+
+        similarities = queries @ vectors.T
+        if mask is not None:
+            similarities[:, ~mask] = -np.inf
+        if k < len(vectors):
+            positions = np.argpartition(similarities, -k, axis=1)[:, -k:]
+        else:
+            positions = np.broadcast_to(np.arange(len(vectors)), (len(queries), k))
+        scores = np.take_along_axis(similarities, positions, axis=1)
+        order = np.argsort(-scores, axis=1)
+        return list(zip(
+            np.take_along_axis(positions, order, axis=1),
+            np.take_along_axis(scores, order, axis=1),
+        ))
+
+    def _project(
+        self, row: dict, fields: tuple[str, ...], contents: dict[str, str] | None = None
+    ) -> dict:
+        """
+        Copy fields of a stored row, chunk_id first.
+
+        contents memoizes content read from the content file by chunk ID,
+        so results for the same chunk share one string.
+        """
+        projected = {"chunk_id": row["chunk_id"]}
+        for field in fields:
+            if field != "content":
+                projected[field] = row.get(field)
+            elif contents is None:
+                projected[field] = self._content(row)
+            else:
+                content = contents.get(row["chunk_id"])
+                if content is None:
+                    content = contents[row["chunk_id"]] = self._content(row)
+                projected[field] = content
+        return projected
+
+    def _result(
+        self,
+        position: int,
+        score: float,
+        fields: tuple[str, ...],
+        contents: dict[str, str] | None = None,
+    ) -> dict:
+        """Build the result dict for a row, projected to fields."""
+        return {**self._project(self._rows[position], fields, contents), "score": score}
+
+    def fetch(
+        self,
+        chunk_ids: list[str],
+        fields: tuple[str, ...] = RESULT_FIELDS,
+    ) -> list[dict | None]:
+        """
+        Load stored fields for chunks.
+
+        Args:
+            chunk_ids: Chunks to load
+            fields: Fields to read (e.g. ("content",)); chunk_id is always included
+
+        Returns:
+            Field dicts in input order, None for chunks that don't exist
+        """
+        with self._lock:
+            positions = [self._positions.get(chunk_id) for chunk_id in chunk_ids]
+            return [
+                None if position is None else self._project(self._rows[position], fields)
+                for position in positions
+            ]
+
+    def search(
+        self,
+        query_vector: list[float],
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[dict]:
+        """
+        Search for similar chunks.
+
+        Args:
+            query_vector: Query embedding
+            top_k: Number of results to return
+            source_prefix: Only match chunks whose source starts with this
+            fields: Chunk fields to return (defaults to RESULT_FIELDS; pass
+                    () for chunk IDs and scores only)
+
+        Returns:
+            List of chunks with scores (cosine distance, lower is closer,
+            matching the Redis backend)
+        """
+        return self.search_many([query_vector], top_k, source_prefix, fields)[0]
+
+    def search_many(
+        self,
+        query_vectors: list[list[float]],
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[list[dict]]:
+        """
+        Search for several query vectors with one matrix multiply.
+
+        Args:
+            query_vectors: Query embeddings
+            top_k: Number of results per query
+            source_prefix: Only match chunks whose source starts with this
+            fields: Chunk fields to return (defaults to RESULT_FIELDS; pass
+                    () for chunk IDs and scores only)
+
+        Returns:
+            One result list per query, in input order. Rows for the same
+            chunk share its stored content string.
+        """
+        if self._dimension is None or not len(query_vectors):
+            return [[] for _ in query_vectors]
+
+        fields = RESULT_FIELDS if fields is None else fields
+        contents: dict[str, str] = {}
+        with self._lock:
+            mask = self._source_mask(source_prefix)
+            return [
+                [
+                    self._result(position, float(1.0 - similarity), fields, contents)
+                    for position, similarity in zip(positions, similarities)
+                ]
+                for positions, similarities in self._top_k(
+                    np.atleast_2d(query_vectors), top_k, mask
+                )
+            ]
+
+    def search_hybrid(
+        self,
+        query: str,
+        query_vector: list[float],
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        text_weight: float = 1.0,
+        vector_weight: float = 1.0,
+        rrf_k: int = 60,
+        candidates: int | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[dict]:
+        """
+        Search by keywords (BM25) and by vector, fusing both rankings with RRF.
+
+        The keyword index is built on the first hybrid search after a write.
+        The source filter is applied before either leg ranks rows.
+
+        Args:
+            query: Query text for the keyword leg
+            query_vector: Query embedding for the vector leg
+            top_k: Number of results to return
+            source_prefix: Only match chunks whose source starts with this
+            text_weight: RRF weight of the keyword ranking
+            vector_weight: RRF weight of the vector ranking
+            rrf_k: RRF damping constant
+            candidates: Results taken from each leg (defaults to 4 * top_k, min 20)
+            fields: Chunk fields to return (defaults to RESULT_FIELDS)
+
+        Returns:
+            List of chunks with fused scores (higher is better) and the rank
+            each leg gave them (None if absent from that leg)
+        """
+        if self._dimension is None:
+            return []
+
+        candidates = candidates or max(top_k * 4, 20)
+        fields = RESULT_FIELDS if fields is None else fields
+        contents: dict[str, str] = {}
+        with self._lock:
+            mask = self._source_mask(source_prefix)
+            positions, similarities = self._top_k(
+                np.atleast_2d(query_vector), candidates, mask
+            )[0]
+            vector_leg = [
+                self._result(position, float(1.0 - similarity), fields, contents)
+                for position, similarity in zip(positions, similarities)
+            ]
+
+            if self._keywords is None:
+                self._keywords = BM25Index(
+                    [self._content(row) if row else None for row in self._rows]
+                )
+            scores = self._keywords.scores(query)
+            if mask is not None:
+                scores[~mask] = 0.0
+            matched = np.flatnonzero(scores)
+            best = matched[np.argsort(-scores[matched], kind="stable")[:candidates]]
+            text_leg = [
+                self._result(position, float(scores[position]), fields, contents)
+                for position in best
+            ]
+
+        return fuse_rankings(text_leg, vector_leg, top_k, text_weight, vector_weight, rrf_k)
+
+    def delete_index(self):
+        """Delete the index and its files."""
+        with self._lock:
+            self._vectors = None
+            self._count = 0
+            self._rows = []
+            self._positions = {}
+            self._files = {}
+            self._graph = self._new_graph()
+            self._keywords = None
+            self._version += 1
+            self._dimension = None
+            self._close_content()
+            self._dirty = False
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,198 @@
+"""Persistent manifest of indexed files for incremental re-indexing."""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+MANIFEST_VERSION = 2
+# Versions whose entries can still be loaded (and are re-indexed in full)
+READABLE_VERSIONS = (1, MANIFEST_VERSION)
+
+
+@dataclass
+class ManifestEntry:
+    """Indexed state of one file."""
+    mtime_ns: int
+    size: int
+    sha256: str
+    chunk_ids: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ManifestDiff:
+    """Files grouped by what a re-index needs to do with them."""
+    added: list[Path] = field(default_factory=list)
+    updated: list[Path] = field(default_factory=list)
+    unchanged: list[Path] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    @property
+    def to_index(self) -> list[Path]:
+        """Files whose chunks must be (re)built."""
+        return self.added + self.updated
+
+
+def file_digest(path: Path) -> str:
+    """
+    Compute SHA256 of a file's bytes.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _absolute(path: Path | str) -> Path:
+    """Absolute, normalized form of path; ./docs and /abs/docs share one key."""
+    return Path(os.path.abspath(path))
+
+
+class IndexManifest:
+    """
+    Map file path to (mtime, size, sha256, chunk ids) on disk.
+
+    A file whose mtime and size match its entry is skipped without being
+    read; one whose stat changed is hashed, and only re-indexed if its
+    content hash differs.
+
+    The manifest also records a fingerprint of the settings that shape
+    chunks and vectors (chunker, tokenizer, embedder). Entries saved under
+    a different fingerprint mark the manifest stale: every file must be
+    re-indexed, even though its entry still lists the chunks to replace.
+
+    Entries are keyed by absolute path, so the same tree indexed through
+    different relative paths maps to one set of entries.
+    """
+
+    def __init__(self, path: Path, fingerprint: dict | None = None):
+        """
+        Initialize manifest.
+
+        Args:
+            path: JSON file to load from and save to
+            fingerprint: JSON-serializable settings the entries are valid for
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint or {}
+        self.entries: dict[str, ManifestEntry] = {}
+        self.stale = False
+        self.load()
+
+    def load(self):
+        """Load entries from disk, starting empty if missing or unreadable."""
+        self.entries = {}
+        self.stale = False
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") not in READABLE_VERSIONS:
+            return
+
+        self.entries = {
+            source: ManifestEntry(**entry) for source, entry in data.get("files", {}).items()
+        }
+        self.stale = data.get("fingerprint") != self.fingerprint
+
+    def save(self):
+        """Atomically write entries to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "fingerprint": self.fingerprint,
+            "files": {source: asdict(entry) for source, entry in self.entries.items()},
+        }
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, self.path)
+        self.stale = False
+
+    def diff(self, files: list[Path], root: Path) -> ManifestDiff:
+        """
+        Compare files on disk against the manifest.
+
+        Args:
+            files: Files currently present under root
+            root: Directory being indexed; entries under it that are not in
+                  files are reported as removed
+
+        Returns:
+            ManifestDiff grouping the files by absolute path
+        """
+        result = ManifestDiff()
+        seen = set()
+
+        for path in files:
+            path = _absolute(path)
+            source = str(path)
+            seen.add(source)
+            entry = self.entries.get(source)
+
+            if entry is None:
+                result.added.append(path)
+                continue
+
+            stat = path.stat()
+            if stat.st_mtime_ns == entry.mtime_ns and stat.st_size == entry.size:
+                result.unchanged.append(path)
+                continue
+
+            # Touched but possibly identical: compare content before re-indexing
+            if file_digest(path) == entry.sha256:
+                entry.mtime_ns = stat.st_mtime_ns
+                entry.size = stat.st_size
+                result.unchanged.append(path)
+            else:
+                result.updated.append(path)
+
+        # Entries saved under a relative key (older manifests) resolve
+        # against the working directory and are replaced by absolute ones
+        root = _absolute(root)
+        for source in self.entries:
+            if source not in seen and _absolute(source).is_relative_to(root):
+                result.removed.append(source)
+
+        return result
+
+    def record(
+        self, path: Path, sha256: str, chunk_ids: list[str], mtime_ns: int, size: int
+    ):
+        """
+        Record a freshly indexed file.
+
+        Args:
+            path: Indexed file
+            sha256: Content hash of the indexed bytes
+            chunk_ids: IDs of the chunks stored for the file
+            mtime_ns: File mtime taken before the bytes were read
+            size: File size taken before the bytes were read
+        """
+        self.entries[str(_absolute(path))] = ManifestEntry(
+            mtime_ns=mtime_ns,
+            size=size,
+            sha256=sha256,
+            chunk_ids=list(chunk_ids),
+        )
+
+    def remove(self, source: str) -> list[str]:
+        """
+        Drop a file from the manifest.
+
+        Args:
+            source: File path as recorded
+
+        Returns:
+            Chunk IDs that belonged to the file
+        """
+        entry = self.entries.pop(source, None)
+        return entry.chunk_ids if entry else []
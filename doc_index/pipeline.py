@@ -0,0 +1,404 @@
+"""Staged producer/consumer pipeline for document ingestion."""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from doc_index.chunker import DocumentChunk, MarkdownChunker
+
+# Marks the end of a stage's input
+_SENTINEL = object()
+
+
+@dataclass
+class PipelineConfig:
+    """Worker counts and buffer sizes for each ingestion stage."""
+    read_workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+    embed_workers: int = 1
+    store_workers: int = 1
+    embed_batch_size: int = 64
+    queue_size: int = 8
+    # Files larger than this many bytes are streamed through the chunker
+    stream_threshold: int = 16 * 1024 * 1024
+
+
+@dataclass
+class StageTiming:
+    """Accumulated busy time for one pipeline stage."""
+    seconds: float = 0.0
+    items: int = 0
+
+
+@dataclass
+class IndexedFile:
+    """Content hash, stat and chunk IDs produced for one file."""
+    sha256: str
+    chunk_ids: list[str]
+    # Stat taken before the bytes were read, so it never describes a newer
+    # version of the file than sha256 does
+    mtime_ns: int
+    size: int
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipeline run."""
+    docs: int = 0
+    chunks: int = 0
+    wall_seconds: float = 0.0
+    stages: dict[str, StageTiming] = field(default_factory=dict)
+    files: dict[str, IndexedFile] = field(default_factory=dict)
+
+    def timings(self) -> dict[str, dict]:
+        """Per-stage timings as plain dicts."""
+        return {
+            name: {"seconds": stage.seconds, "items": stage.items}
+            for name, stage in self.stages.items()
+        }
+
+
+def read_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Create the read+chunk process pool.
+
+    The pool runs next to the embed and store threads (or an event loop),
+    and forking a process that has running threads can copy locks held by
+    them into the child and deadlock it. Workers therefore start from the
+    forkserver where the platform has one (spawn elsewhere by default).
+
+    Args:
+        workers: Worker processes
+
+    Returns:
+        ProcessPoolExecutor
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver") if "forkserver" in methods else None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def _read_and_chunk(
+    chunker: MarkdownChunker, path: str
+) -> tuple[str, list[DocumentChunk], IndexedFile, float]:
+    """
+    Read, hash and chunk one file (runs in a worker process).
+
+    Args:
+        chunker: Chunker to apply
+        path: File to read
+
+    Returns:
+        Tuple of (path, chunks, IndexedFile for the manifest, seconds spent)
+    """
+    started = time.perf_counter()
+    with open(path, "rb") as file:
+        stat = os.fstat(file.fileno())
+        data = file.read()
+    # Same newline translation as Path.read_text
+    content = data.decode().replace("\r\n", "\n").replace("\r", "\n")
+    chunks = chunker.chunk(content, path)
+    indexed = IndexedFile(
+        hashlib.sha256(data).hexdigest(),
+        [chunk.chunk_id for chunk in chunks],
+        stat.st_mtime_ns,
+        stat.st_size,
+    )
+    return path, chunks, indexed, time.perf_counter() - started
+
+
+class _HashingReader(io.RawIOBase):
+    """Raw binary reader that hashes bytes as they pass through."""
+
+    def __init__(self, file):
+        self._file = file
+        self.digest = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._file.readinto(buffer)
+        if count:
+            self.digest.update(memoryview(buffer)[:count])
+        return count
+
+
+def _stages(discover: StageTiming | None) -> dict[str, StageTiming]:
+    """Empty stage timings, led by the caller's discovery timing if given."""
+    stages = {"discover": discover} if discover is not None else {}
+    stages.update((name, StageTiming()) for name in ("read", "embed", "store"))
+    return stages
+
+
+class IndexingPipeline:
+    """
+    Index files through read+chunk, embed and store stages.
+
+    Read+chunk runs in a process pool; embedding and storing run in
+    threads connected by bounded queues, so a slow downstream stage
+    blocks upstream producers instead of buffering the whole corpus.
+    Files above stream_threshold are streamed through the chunker in the
+    producer instead, so neither the file nor its chunk list is ever
+    held whole.
+    """
+
+    def __init__(self, chunker, embedder, vector_store, config: PipelineConfig | None = None):
+        """
+        Initialize pipeline.
+
+        Args:
+            chunker: Chunker used by read workers (must be picklable)
+            embedder: Embedder with an embed_batch method
+            vector_store: Store with an add_chunks method
+            config: Stage worker counts and buffer sizes
+        """
+        self.chunker = chunker
+        self.embedder = embedder
+        self.vector_store = vector_store
+        self.config = config or PipelineConfig()
+
+        self._lock = threading.Lock()
+        self._errors: list[BaseException] = []
+
+    def run(self, files: Iterable[Path], discover: StageTiming | None = None) -> PipelineResult:
+        """
+        Run all stages over the given files.
+
+        Args:
+            files: Files to index
+            discover: Time the caller spent finding and planning the files,
+                      reported as the "discover" stage (omitted if None)
+
+        Returns:
+            PipelineResult with counts and per-stage timings
+        """
+        config = self.config
+        self._errors = []
+        result = PipelineResult(stages=_stages(discover))
+        started = time.perf_counter()
+        paths = [str(path) for path in files]
+
+        chunk_queue: queue.Queue = queue.Queue(maxsize=config.queue_size)
+        store_queue: queue.Queue = queue.Queue(maxsize=config.queue_size)
+
+        embed_threads = [
+            threading.Thread(target=self._embed_worker, args=(chunk_queue, store_queue, result))
+            for _ in range(config.embed_workers)
+        ]
+        store_threads = [
+            threading.Thread(target=self._store_worker, args=(store_queue, result))
+            for _ in range(config.store_workers)
+        ]
+        for thread in embed_threads + store_threads:
+            thread.start()
+
+        try:
+            self._produce(paths, chunk_queue, result)
+        finally:
+            for _ in embed_threads:
+                chunk_queue.put(_SENTINEL)
+            for thread in embed_threads:
+                thread.join()
+            for _ in store_threads:
+                store_queue.put(_SENTINEL)
+            for thread in store_threads:
+                thread.join()
+
+        result.wall_seconds = time.perf_counter() - started
+
+        if self._errors:
+            raise self._errors[0]
+        return result
+
+    def _produce(self, paths: list[str], chunk_queue: queue.Queue, result: PipelineResult):
+        """Read and chunk files, feeding per-file chunk lists downstream."""
+        if self.config.read_workers <= 1:
+            for path in paths:
+                if self._errors:
+                    return
+                if self._should_stream(path):
+                    self._stream(path, chunk_queue, result)
+                else:
+                    self._emit(*_read_and_chunk(self.chunker, path), chunk_queue, result)
+            return
+
+        # Cap in-flight files so finished chunk lists can't pile up in memory
+        max_in_flight = self.config.read_workers * 2
+        with read_pool(self.config.read_workers) as pool:
+            in_flight: deque[Future] = deque()
+            for path in paths:
+                if self._errors:
+                    break
+                if self._should_stream(path):
+                    self._stream(path, chunk_queue, result)
+                    continue
+                in_flight.append(pool.submit(_read_and_chunk, self.chunker, path))
+                if len(in_flight) >= max_in_flight:
+                    self._emit(*in_flight.popleft().result(), chunk_queue, result)
+
+            while in_flight:
+                future = in_flight.popleft()
+                if self._errors:
+                    future.cancel()
+                    continue
+                self._emit(*future.result(), chunk_queue, result)
+
+    def _should_stream(self, path: str) -> bool:
+        """Whether a file is large enough to stream (and the chunker can)."""
+        return self.chunker.streams and os.path.getsize(path) > self.config.stream_threshold
+
+    def _stream(self, path: str, chunk_queue: queue.Queue, result: PipelineResult):
+        """
+        Read, hash and chunk one large file incrementally.
+
+        Chunks go downstream in embed-batch-sized lists as they are cut, so
+        memory holds one chunk window plus the queued batches. Time spent
+        blocked on the queue is not counted as read time.
+        """
+        started = time.perf_counter()
+        blocked = 0.0
+        chunk_ids: list[str] = []
+        batch: list[DocumentChunk] = []
+
+        def put(chunks: list[DocumentChunk]):
+            nonlocal blocked
+            put_started = time.perf_counter()
+            chunk_queue.put(chunks)
+            blocked += time.perf_counter() - put_started
+
+        with open(path, "rb", buffering=0) as file:
+            stat = os.fstat(file.fileno())
+            raw = _HashingReader(file)
+            # newline=None gives the same newline translation as _read_and_chunk
+            reader = io.TextIOWrapper(io.BufferedReader(raw), encoding="utf-8", newline=None)
+            for chunk in self.chunker.chunk_stream(reader, path):
+                if self._errors:
+                    return
+                chunk_ids.append(chunk.chunk_id)
+                batch.append(chunk)
+                if len(batch) >= self.config.embed_batch_size:
+                    put(batch)
+                    batch = []
+            # Hash any bytes the chunker didn't need to read
+            while raw.read(1024 * 1024):
+                pass
+
+        if batch:
+            put(batch)
+
+        read = result.stages["read"]
+        read.seconds += time.perf_counter() - started - blocked
+        read.items += 1
+        result.docs += 1
+        result.files[path] = IndexedFile(
+            raw.digest.hexdigest(), chunk_ids, stat.st_mtime_ns, stat.st_size
+        )
+
+    def _emit(
+        self,
+        path: str,
+        chunks: list[DocumentChunk],
+        indexed: IndexedFile,
+        seconds: float,
+        chunk_queue: queue.Queue,
+        result: PipelineResult,
+    ):
+        """Record a read+chunk result and hand it to the embed stage."""
+        read = result.stages["read"]
+        read.seconds += seconds
+        read.items += 1
+        result.docs += 1
+        result.files[path] = indexed
+        if chunks:
+            chunk_queue.put(chunks)
+
+    def _embed_worker(
+        self,
+        chunk_queue: queue.Queue,
+        store_queue: queue.Queue,
+        result: PipelineResult,
+    ):
+        """Batch chunks from many files into embed_batch calls."""
+        batch: list[DocumentChunk] = []
+
+        while True:
+            item = chunk_queue.get()
+            if item is _SENTINEL:
+                break
+            if self._errors:
+                continue  # Keep draining so producers never block
+
+            batch.extend(item)
+            while len(batch) >= self.config.embed_batch_size:
+                head = batch[:self.config.embed_batch_size]
+                batch = batch[self.config.embed_batch_size:]
+                self._embed(head, store_queue, result)
+
+        if batch and not self._errors:
+            self._embed(batch, store_queue, result)
+
+    def _embed(self, chunks: list[DocumentChunk], store_queue: queue.Queue, result: PipelineResult):
+        """Embed one batch and pass it to the store stage."""
+        started = time.perf_counter()
+        try:
+            embeddings = self.embedder.embed_batch([chunk.content for chunk in chunks])
+        except Exception as e:
+            self._fail(e)
+            return
+        self._record(result.stages["embed"], started, len(chunks))
+        store_queue.put((chunks, embeddings))
+
+    def _store_worker(self, store_queue: queue.Queue, result: PipelineResult):
+        """Write embedded batches to the vector store in full-size pipelines."""
+        batch_size = getattr(self.vector_store, "batch_size", 1)
+        chunks: list[DocumentChunk] = []
+        embeddings: list[list[float]] = []
+
+        while True:
+            item = store_queue.get()
+            if item is _SENTINEL:
+                break
+            if self._errors:
+                continue
+
+            chunks.extend(item[0])
+            embeddings.extend(item[1])
+            if len(chunks) >= batch_size:
+                self._store(chunks, embeddings, result)
+                chunks, embeddings = [], []
+
+        if chunks and not self._errors:
+            self._store(chunks, embeddings, result)
+
+    def _store(self, chunks: list[DocumentChunk], embeddings: list, result: PipelineResult):
+        """Write one batch to the vector store."""
+        started = time.perf_counter()
+        try:
+            written = self.vector_store.add_chunks(chunks, embeddings)
+        except Exception as e:
+            self._fail(e)
+            return
+        self._record(result.stages["store"], started, written)
+        with self._lock:
+            result.chunks += written
+
+    def _record(self, stage: StageTiming, started: float, items: int):
+        """Add elapsed time and item count to a stage."""
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stage.seconds += elapsed
+            stage.items += items
+
+    def _fail(self, error: BaseException):
+        """Record a stage failure; remaining work is drained and skipped."""
+        with self._lock:
+            self._errors.append(error)
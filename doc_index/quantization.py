@@ -0,0 +1,72 @@
+"""Reduced-precision encodings for stored embedding vectors."""
+
+import numpy as np
+
+VECTOR_TYPES = ("FLOAT32", "FLOAT16", "INT8")
+
+_DTYPES = {"FLOAT32": "<f4", "FLOAT16": "<f2", "INT8": "i1"}
+
+
+def quantize(matrix, vector_type: str = "FLOAT32") -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Encode embedding rows in a storage type.
+
+    INT8 uses symmetric scalar quantization with one scale per vector, so
+    value = code * scale and the largest component maps to +/-127.
+
+    Args:
+        matrix: (n, dimension) embeddings
+        vector_type: "FLOAT32", "FLOAT16" or "INT8"
+
+    Returns:
+        Tuple of (encoded matrix, per-row float32 scales for INT8 else None)
+    """
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    if vector_type != "INT8":
+        return matrix.astype(_DTYPES[vector_type]), None
+
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize(encoded: np.ndarray, scales: np.ndarray | None = None) -> np.ndarray:
+    """
+    Decode quantized rows back to float32.
+
+    Args:
+        encoded: Matrix returned by quantize
+        scales: Per-row scales for INT8 codes
+
+    Returns:
+        (n, dimension) float32 approximation of the original rows
+    """
+    matrix = encoded.astype(np.float32)
+    if scales is not None:
+        matrix *= np.asarray(scales, dtype=np.float32)[:, None]
+    return matrix
+
+
+def decode_bytes(data: bytes, vector_type: str, scale: float | None = None) -> np.ndarray:
+    """
+    Decode one stored vector blob.
+
+    Args:
+        data: Bytes written by the vector store
+        vector_type: Type the blob was encoded with
+        scale: INT8 scale
+
+    Returns:
+        float32 vector
+    """
+    vector = np.frombuffer(data, dtype=_DTYPES[vector_type]).astype(np.float32)
+    if scale is not None:
+        vector *= scale
+    return vector
+
+
+def bytes_per_vector(dimension: int, vector_type: str) -> int:
+    """Stored size of one vector, including its INT8 scale."""
+    size = dimension * np.dtype(_DTYPES[vector_type]).itemsize
+    return size + 4 if vector_type == "INT8" else size
@@ -0,0 +1,86 @@
+"""Offline tokenizers for token-budgeted chunking."""
+
+import re
+import warnings
+from pathlib import Path
+from typing import Protocol
+
+
+class Tokenizer(Protocol):
+    """Protocol for tokenizers used to size chunks."""
+
+    def token_offsets(self, text: str) -> list[int]:
+        """Return the start offset of every token in text, in order."""
+        ...
+
+
+class EstimatingTokenizer:
+    """
+    Cheap approximation of subword tokenization.
+
+    Splits words into pieces of up to four word characters and counts each
+    punctuation mark as its own token, which tracks BPE/WordPiece counts
+    for English prose and code closely enough for chunk budgeting.
+    """
+
+    PATTERN = re.compile(r"\w{1,4}|[^\w\s]")
+
+    def token_offsets(self, text: str) -> list[int]:
+        """Return the start offset of every estimated token."""
+        return [match.start() for match in self.PATTERN.finditer(text)]
+
+
+class HuggingFaceTokenizer:
+    """Tokenizer backed by a local tokenizer.json (requires `tokenizers`)."""
+
+    def __init__(self, path: str | Path):
+        """
+        Load a tokenizer from disk.
+
+        Args:
+            path: Path to a Hugging Face tokenizer.json file
+        """
+        try:
+            from tokenizers import Tokenizer as HFTokenizer
+        except ImportError as e:
+            raise RuntimeError(
+                "HuggingFaceTokenizer requires tokenizers (pip install tokenizers)"
+            ) from e
+
+        self.path = str(path)
+        self._tokenizer = HFTokenizer.from_file(self.path)
+        self._tokenizer.no_truncation()
+        self._tokenizer.no_padding()
+
+    def token_offsets(self, text: str) -> list[int]:
+        """Return the start offset of every token."""
+        encoding = self._tokenizer.encode(text, add_special_tokens=False)
+        return [start for start, _end in encoding.offsets]
+
+    def __getstate__(self) -> dict:
+        """Pickle by path so chunkers can be sent to worker processes."""
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict):
+        """Reload the tokenizer from its path."""
+        self.__init__(state["path"])
+
+
+def load_tokenizer(path: str | Path | None = None) -> Tokenizer:
+    """
+    Get a tokenizer, falling back to the estimator.
+
+    Args:
+        path: tokenizer.json to load, or None for the estimator
+
+    Returns:
+        Tokenizer instance
+    """
+    if path is None:
+        return EstimatingTokenizer()
+
+    try:
+        return HuggingFaceTokenizer(path)
+    except RuntimeError as e:
+        warnings.warn(f"{e}; falling back to token estimates", stacklevel=2)
+        return EstimatingTokenizer()
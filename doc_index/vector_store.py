@@ -1,14 +1,172 @@
 """Vector storage using Dragonfly/Redis."""
 
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass
+
+import numpy as np
 import redis
+import redis.asyncio
 
 from doc_index.chunker import DocumentChunk
+from doc_index.hybrid import reciprocal_rank_fusion, tokenize
+from doc_index.quantization import VECTOR_TYPES, bytes_per_vector, decode_bytes, quantize
+
+VECTOR_STORE_BACKENDS = ("dragonfly", "local")
+INDEX_TYPES = ("FLAT", "HNSW")
+
+# Chunk fields returned by search unless a projection is given
+RESULT_FIELDS = ("chunk_id", "source", "content", "heading_path")
+
+
+@dataclass
+class VectorIndexConfig:
+    """Vector index algorithm, HNSW tuning and vector storage precision."""
+    index_type: str = "FLAT"
+    m: int = 16
+    ef_construction: int = 200
+    ef_runtime: int = 10
+    vector_type: str = "FLOAT32"
+    # Re-score top_k * rerank_factor candidates at float32 (0 disables)
+    rerank_factor: int = 0
+
+    def __post_init__(self):
+        self.index_type = self.index_type.upper()
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(
+                f"Unknown index type {self.index_type!r}, expected one of {INDEX_TYPES}"
+            )
+        self.vector_type = self.vector_type.upper()
+        if self.vector_type not in VECTOR_TYPES:
+            raise ValueError(
+                f"Unknown vector type {self.vector_type!r}, expected one of {VECTOR_TYPES}"
+            )
+
+    @property
+    def reranks(self) -> bool:
+        """Whether quantized results are re-scored with float32 vectors."""
+        return self.rerank_factor > 0 and self.vector_type != "FLOAT32"
+
+
+def escape_tag(value: str) -> str:
+    """Escape punctuation and spaces for a RediSearch TAG query."""
+    return re.sub(r"(\W)", r"\\\1", value)
+
+
+def schema_attributes(info: list) -> set[str]:
+    """
+    Names of the fields in an FT.INFO reply.
+
+    Reads the "attributes" section (RediSearch 2.x, Dragonfly), where each
+    entry is a flat identifier/attribute/type list, and the older "fields"
+    section, where each entry starts with the field name.
+    """
+    sections = dict(zip(info[::2], info[1::2]))
+    names = set()
+    for attribute in sections.get("attributes") or []:
+        pairs = dict(zip(attribute[::2], attribute[1::2]))
+        names.add(pairs.get("attribute", pairs.get("identifier")))
+    for field in sections.get("fields") or []:
+        names.add(field[0])
+    return names
+
+
+def get_vector_store(backend: str = "dragonfly", **kwargs):
+    """
+    Create a vector store by backend name.
+
+    Args:
+        backend: "dragonfly" (RediSearch server) or "local" (in-process NumPy)
+        **kwargs: Passed to the store constructor
+
+    Returns:
+        Vector store instance
+    """
+    if backend == "dragonfly":
+        return DragonflyVectorStore(**kwargs)
+    if backend == "local":
+        from doc_index.local_store import LocalVectorStore
+
+        return LocalVectorStore(**kwargs)
+    raise ValueError(
+        f"Unknown vector store backend {backend!r}, expected one of {VECTOR_STORE_BACKENDS}"
+    )
+
+
+def _with_chunk_id(fields) -> tuple[str, ...]:
+    """Field projection with chunk_id first (results are always keyed by it)."""
+    return ("chunk_id", *(field for field in fields if field != "chunk_id"))
+
+
+def _unique_ids(results: list[list[dict]]) -> list[str]:
+    """Chunk IDs across result lists, each once, in first-seen order."""
+    return list(dict.fromkeys(doc["chunk_id"] for docs in results for doc in docs))
+
+
+def _merge_fields(results: list[list[dict]], loaded: dict[str, dict | None]) -> list[list[dict]]:
+    """Merge fetched fields into results, dropping chunks that no longer exist."""
+    return [
+        [{**loaded[doc["chunk_id"]], **doc} for doc in docs if loaded[doc["chunk_id"]] is not None]
+        for docs in results
+    ]
+
+
+def fuse_rankings(
+    text_leg: list[dict],
+    vector_leg: list[dict],
+    top_k: int,
+    text_weight: float = 1.0,
+    vector_weight: float = 1.0,
+    rrf_k: int = 60,
+) -> list[dict]:
+    """
+    Merge full-text and vector result lists with reciprocal rank fusion.
+
+    Args:
+        text_leg: Full-text results, best first
+        vector_leg: Vector results, best first
+        top_k: Number of results to return
+        text_weight: RRF weight of the full-text ranking
+        vector_weight: RRF weight of the vector ranking
+        rrf_k: RRF damping constant
+
+    Returns:
+        Result dicts with "score" set to the fused score and "text_rank" /
+        "vector_rank" set to each leg's 1-based rank (or None)
+    """
+    docs = {}
+    ranks: dict[str, dict] = {}
+    for name, leg in (("text_rank", text_leg), ("vector_rank", vector_leg)):
+        for rank, doc in enumerate(leg, 1):
+            docs.setdefault(doc["chunk_id"], doc)
+            ranks.setdefault(doc["chunk_id"], {"text_rank": None, "vector_rank": None})
+            ranks[doc["chunk_id"]][name] = rank
+
+    fused = reciprocal_rank_fusion(
+        [[doc["chunk_id"] for doc in text_leg], [doc["chunk_id"] for doc in vector_leg]],
+        [text_weight, vector_weight],
+        rrf_k,
+    )
+    return [
+        {**docs[chunk_id], "score": score, **ranks[chunk_id]}
+        for chunk_id, score in fused[:top_k]
+    ]
 
 
 class DragonflyVectorStore:
     """Store and search document embeddings in Dragonfly."""
 
-    def __init__(self, host: str = "localhost", port: int = 6379, index_name: str = "docs"):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        index_name: str = "docs",
+        batch_size: int = 500,
+        client: redis.Redis | None = None,
+        index_config: VectorIndexConfig | None = None,
+    ):
         """
         Initialize vector store.
 
@@ -16,44 +174,96 @@ class DragonflyVectorStore:
             host: Redis host
             port: Redis port
             index_name: Name for the vector index
+            batch_size: Chunks per pipeline round trip in add_chunks
+            client: Pre-built Redis client (overrides host/port)
+            index_config: Vector index type and HNSW parameters
         """
-        self.client = redis.Redis(host=host, port=port, decode_responses=True)
+        self.client = client or redis.Redis(host=host, port=port, decode_responses=True)
         self.index_name = index_name
+        self.batch_size = batch_size
+        self.index_config = index_config or VectorIndexConfig()
         self._dimension = None
 
+        # Write throughput counters
+        self._chunks_written = 0
+        self._batches_written = 0
+        self._write_seconds = 0.0
+
     def create_index(self, dimension: int):
         """
         Create vector index if it doesn't exist.
 
+        An existing index built before the source_tag field (which source
+        filters query) gets the field added with FT.ALTER.
+
         Args:
             dimension: Embedding dimension
+
+        Raises:
+            ValueError: If an existing index lacks source_tag and the server
+                        cannot add it; the index must then be rebuilt
         """
         self._dimension = dimension
 
-        # Check if index exists
-        if self.index_exists():
+        try:
+            info = self.client.execute_command("FT.INFO", self.index_name)
+        except redis.exceptions.ResponseError:
+            info = None  # Index doesn't exist
+        if info is not None:
+            if "source_tag" not in schema_attributes(info):
+                try:
+                    self.client.execute_command(*self._add_source_tag_command())
+                except redis.exceptions.ResponseError as e:
+                    raise self._rebuild_required(e) from e
             return
 
-        # Create index using RediSearch
-        # FT.CREATE idx_name ON HASH PREFIX 1 doc: SCHEMA ...
         try:
-            self.client.execute_command(
-                "FT.CREATE", self.index_name,
-                "ON", "HASH",
-                "PREFIX", "1", f"doc:{self.index_name}:",
-                "SCHEMA",
-                "chunk_id", "TEXT",
-                "source", "TEXT",
-                "content", "TEXT",
-                "embedding", "VECTOR", "FLAT", "6",
-                "TYPE", "FLOAT32",
-                "DIM", str(dimension),
-                "DISTANCE_METRIC", "COSINE"
-            )
+            self.client.execute_command(*self._create_index_command(dimension))
         except redis.exceptions.ResponseError as e:
             if "Index already exists" not in str(e):
                 raise
 
+    def _add_source_tag_command(self) -> list:
+        """Build the FT.ALTER command adding source_tag to an older index."""
+        # Without SKIPINITIALSCAN, documents already stored are tagged too
+        return ["FT.ALTER", self.index_name, "SCHEMA", "ADD", "source", "AS", "source_tag", "TAG"]
+
+    def _rebuild_required(self, error: Exception) -> ValueError:
+        """Error for an index whose schema can't be upgraded in place."""
+        return ValueError(
+            f"Index {self.index_name!r} predates the source_tag field and the server "
+            f"could not add it ({error}); rebuild it: delete_index(), then re-index"
+        )
+
+    def _create_index_command(self, dimension: int) -> list:
+        """Build the FT.CREATE command for the configured index."""
+        config = self.index_config
+        vector_args = [
+            "TYPE", config.vector_type,
+            "DIM", str(dimension),
+            "DISTANCE_METRIC", "COSINE",
+        ]
+        if config.index_type == "HNSW":
+            vector_args += [
+                "M", str(config.m),
+                "EF_CONSTRUCTION", str(config.ef_construction),
+                "EF_RUNTIME", str(config.ef_runtime),
+            ]
+
+        # FT.CREATE idx_name ON HASH PREFIX 1 doc: SCHEMA ...
+        return [
+            "FT.CREATE", self.index_name,
+            "ON", "HASH",
+            "PREFIX", "1", f"doc:{self.index_name}:",
+            "SCHEMA",
+            "chunk_id", "TEXT",
+            "source", "TEXT",
+            "source", "AS", "source_tag", "TAG",
+            "content", "TEXT",
+            "embedding", "VECTOR", config.index_type, str(len(vector_args)),
+            *vector_args,
+        ]
+
     def index_exists(self) -> bool:
         """Check if index exists."""
         try:
@@ -62,6 +272,65 @@ class DragonflyVectorStore:
         except redis.exceptions.ResponseError:
             return False
 
+    def _key(self, chunk_id: str) -> str:
+        """Generate hash key for a chunk."""
+        return f"doc:{self.index_name}:{chunk_id}"
+
+    @property
+    def version_key(self) -> str:
+        """Key of the index version counter (outside the indexed prefix)."""
+        return f"doc-version:{self.index_name}"
+
+    def index_version(self) -> int:
+        """Counter bumped by every add and delete (for result caching)."""
+        return int(self.client.get(self.version_key) or 0)
+
+    @property
+    def stats_key(self) -> str:
+        """Key of the persisted index statistics (outside the indexed prefix)."""
+        return f"doc-stats:{self.index_name}"
+
+    def save_stats(self, stats: dict):
+        """Persist index statistics as one JSON value."""
+        self.client.set(self.stats_key, json.dumps(stats))
+
+    def load_stats(self) -> dict:
+        """Load statistics saved by save_stats ({} if none) in one GET."""
+        value = self.client.get(self.stats_key)
+        return json.loads(value) if value else {}
+
+    def _vector_fields(self, embeddings) -> list[dict]:
+        """
+        Encode embeddings into the vector hash fields of each chunk.
+
+        The indexed field holds the vector in the configured precision;
+        INT8 vectors carry their scale, and a float32 copy outside the
+        index is kept only when re-ranking is enabled.
+        """
+        matrix = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        encoded, scales = quantize(matrix, self.index_config.vector_type)
+        rows = []
+        for i, codes in enumerate(encoded):
+            fields = {"embedding": codes.tobytes()}
+            if scales is not None:
+                fields["embedding_scale"] = float(scales[i])
+            if self.index_config.reranks:
+                fields["embedding_full"] = matrix[i].tobytes()
+            rows.append(fields)
+        return rows
+
+    def _chunk_mapping(self, chunk: DocumentChunk, vector_fields: dict) -> dict:
+        """Build the hash fields stored for a chunk."""
+        return {
+            "chunk_id": chunk.chunk_id,
+            "source": chunk.source,
+            "content": chunk.content,
+            "start_pos": chunk.start_pos,
+            "end_pos": chunk.end_pos,
+            "heading_path": " > ".join(chunk.metadata.get("heading_path", [])),
+            **vector_fields,
+        }
+
     def add_chunk(self, chunk: DocumentChunk, embedding: list[float]):
         """
         Add chunk with embedding to store.
@@ -70,70 +339,482 @@ class DragonflyVectorStore:
             chunk: Document chunk
             embedding: Embedding vector
         """
-        key = f"doc:{self.index_name}:{chunk.chunk_id}"
+        # Store as hash
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_writes(pipe, [chunk], self._vector_fields([embedding]))
+        pipe.execute()
 
-        # Convert embedding to bytes
-        import struct
-        embedding_bytes = struct.pack(f'{len(embedding)}f', *embedding)
+    def add_chunks(
+        self,
+        chunks: list[DocumentChunk],
+        embeddings: list[list[float]],
+        batch_size: int | None = None,
+    ) -> int:
+        """
+        Add many chunks with embeddings using pipelined batches.
 
-        # Store as hash
-        self.client.hset(key, mapping={
-            "chunk_id": chunk.chunk_id,
-            "source": chunk.source,
-            "content": chunk.content,
-            "start_pos": chunk.start_pos,
-            "end_pos": chunk.end_pos,
-            "embedding": embedding_bytes,
-        })
+        Embeddings are encoded as one matrix up front and each
+        batch is sent as one non-transactional pipeline, so the cost is one
+        round trip per batch instead of one per chunk.
+
+        Args:
+            chunks: Document chunks
+            embeddings: Embedding vectors, one per chunk
+            batch_size: Chunks per pipeline (defaults to self.batch_size)
 
-    def search(self, query_vector: list[float], top_k: int = 5) -> list[dict]:
+        Returns:
+            Number of chunks written
+        """
+        if len(chunks) != len(embeddings):
+            raise ValueError(
+                f"Got {len(chunks)} chunks but {len(embeddings)} embeddings"
+            )
+        if not chunks:
+            return 0
+
+        batch_size = batch_size or self.batch_size
+        vector_fields = self._vector_fields(embeddings)
+
+        started = time.perf_counter()
+        for start in range(0, len(chunks), batch_size):
+            end = start + batch_size
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_writes(pipe, chunks[start:end], vector_fields[start:end])
+            pipe.execute()
+            self._batches_written += 1
+
+        self._write_seconds += time.perf_counter() - started
+        self._chunks_written += len(chunks)
+        return len(chunks)
+
+    def _queue_writes(self, pipe, chunks: list[DocumentChunk], vector_fields: list[dict]):
+        """Queue one HSET per chunk and an index version bump on a pipeline."""
+        for chunk, fields in zip(chunks, vector_fields):
+            pipe.hset(self._key(chunk.chunk_id), mapping=self._chunk_mapping(chunk, fields))
+        pipe.incr(self.version_key)
+
+    def delete_chunks(self, chunk_ids: list[str], batch_size: int | None = None) -> int:
+        """
+        Delete chunks by ID using pipelined batches.
+
+        Args:
+            chunk_ids: IDs of chunks to remove
+            batch_size: Keys per pipeline (defaults to self.batch_size)
+
+        Returns:
+            Number of keys actually deleted
+        """
+        batch_size = batch_size or self.batch_size
+        deleted = 0
+
+        for start in range(0, len(chunk_ids), batch_size):
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_deletes(
+                pipe, [self._key(chunk_id) for chunk_id in chunk_ids[start:start + batch_size]]
+            )
+            deleted += sum(pipe.execute()[:-1])
+
+        return deleted
+
+    def _queue_deletes(self, pipe, keys: list[str]):
+        """Queue one UNLINK per key and an index version bump (the last reply)."""
+        for key in keys:
+            pipe.unlink(key)
+        pipe.incr(self.version_key)
+
+    def collect_garbage(self, live_ids: set[str], scan_count: int = 1000) -> int:
+        """
+        Remove chunk keys that are not in the live set.
+
+        Walks the index keyspace with SCAN and unlinks dead keys in
+        pipelined batches, so the server is never blocked by a full
+        KEYS listing.
+
+        Args:
+            live_ids: Chunk IDs that must be kept
+            scan_count: COUNT hint per SCAN call
+
+        Returns:
+            Number of keys removed
+        """
+        prefix = self._key("")
+        dead_keys = []
+        removed = 0
+
+        for key in self.client.scan_iter(match=f"{prefix}*", count=scan_count):
+            if key[len(prefix):] not in live_ids:
+                dead_keys.append(key)
+            if len(dead_keys) >= self.batch_size:
+                removed += self._unlink(dead_keys)
+                dead_keys = []
+
+        if dead_keys:
+            removed += self._unlink(dead_keys)
+        return removed
+
+    def _unlink(self, keys: list[str]) -> int:
+        """Unlink keys in one pipelined round trip."""
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_deletes(pipe, keys)
+        return sum(pipe.execute()[:-1])
+
+    def get_write_stats(self) -> dict:
+        """Get write throughput counters for this store."""
+        seconds = self._write_seconds
+        return {
+            "chunks_written": self._chunks_written,
+            "batches_written": self._batches_written,
+            "write_seconds": seconds,
+            "chunks_per_sec": self._chunks_written / seconds if seconds else 0.0,
+        }
+
+    def _source_filter(self, source_prefix: str | None) -> str:
+        """Query clause limiting matches to sources under a prefix ("*" for all)."""
+        if not source_prefix:
+            return "*"
+        return f"@source_tag:{{{escape_tag(source_prefix)}*}}"
+
+    def _search_args(
+        self,
+        query_vector: list[float],
+        top_k: int,
+        source_prefix: str | None = None,
+        fields: tuple[str, ...] = RESULT_FIELDS,
+    ) -> list:
+        """Build the FT.SEARCH command for one KNN query returning fields and score."""
+        config = self.index_config
+        candidates = top_k * config.rerank_factor if config.reranks else top_k
+        query_bytes = quantize([query_vector], config.vector_type)[0][0].tobytes()
+        knn = f"KNN {candidates} @embedding $vec"
+        if config.index_type == "HNSW":
+            knn += f" EF_RUNTIME {config.ef_runtime}"
+        prefilter = f"({self._source_filter(source_prefix)})" if source_prefix else "*"
+        returned = _with_chunk_id(fields) + ("score",)
+
+        # FT.SEARCH idx "*=>[KNN k @embedding $vec]" PARAMS 2 vec <blob> DIALECT 2
+        return [
+            "FT.SEARCH", self.index_name,
+            f"{prefilter}=>[{knn} AS score]",
+            "PARAMS", "2", "vec", query_bytes,
+            "SORTBY", "score",
+            "DIALECT", "2",
+            "RETURN", str(len(returned)), *returned,
+        ]
+
+    def _parse_search(self, result: list, contents: dict[str, str]) -> list[dict]:
+        """
+        Parse an FT.SEARCH reply into result dicts.
+
+        Args:
+            result: Reply in the form [count, key1, fields1, key2, fields2, ...]
+            contents: chunk_id -> content already decoded; rows for the same
+                      chunk reuse that string instead of holding a copy
+
+        Returns:
+            List of chunks with scores
+        """
+        results = []
+
+        for i in range(1, len(result), 2):
+            fields = result[i + 1]
+
+            # fields is list: [field1, value1, field2, value2, ...]
+            doc = {}
+            for j in range(0, len(fields), 2):
+                doc[fields[j]] = fields[j + 1]
+
+            if "content" in doc:
+                doc["content"] = contents.setdefault(doc["chunk_id"], doc["content"])
+            results.append(doc)
+
+        return results
+
+    def _text_search_args(
+        self,
+        query: str,
+        limit: int,
+        source_prefix: str | None,
+        fields: tuple[str, ...] = RESULT_FIELDS,
+    ) -> list:
+        """Build the FT.SEARCH command for a BM25 full-text query (any term matches)."""
+        returned = _with_chunk_id(fields)
+        text_query = f"@content:({'|'.join(tokenize(query))})"
+        if source_prefix:
+            text_query = f"{self._source_filter(source_prefix)} {text_query}"
+        return [
+            "FT.SEARCH", self.index_name,
+            text_query,
+            "SCORER", "BM25",
+            "LIMIT", "0", str(limit),
+            "DIALECT", "2",
+            "RETURN", str(len(returned)), *returned,
+        ]
+
+    def _execute_searches(self, commands: list[list]) -> list[list[dict]]:
+        """Run FT.SEARCH commands in one pipeline and parse every reply."""
+        pipe = self.client.pipeline(transaction=False)
+        for command in commands:
+            pipe.execute_command(*command)
+        return self._parse_replies(pipe.execute(raise_on_error=False))
+
+    def _parse_replies(self, replies: list) -> list[list[dict]]:
+        """Parse pipelined FT.SEARCH replies; a missing index yields no results."""
+        contents: dict[str, str] = {}
+        results = []
+        for reply in replies:
+            if isinstance(reply, redis.exceptions.ResponseError):
+                # Index might not exist yet
+                if "no such index" in str(reply).lower():
+                    results.append([])
+                    continue
+                raise reply
+            results.append(self._parse_search(reply, contents))
+        return results
+
+    def search(
+        self,
+        query_vector: list[float],
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[dict]:
         """
         Search for similar chunks.
 
         Args:
             query_vector: Query embedding
             top_k: Number of results to return
+            source_prefix: Only match chunks whose source starts with this
+            fields: Chunk fields to return (defaults to RESULT_FIELDS; pass
+                    () for chunk IDs and scores only)
 
         Returns:
             List of chunks with scores
         """
-        import struct
-        query_bytes = struct.pack(f'{len(query_vector)}f', *query_vector)
+        return self.search_many([query_vector], top_k, source_prefix, fields)[0]
 
-        # FT.SEARCH idx "*=>[KNN k @embedding $vec]" PARAMS 2 vec <blob> DIALECT 2
-        try:
-            result = self.client.execute_command(
-                "FT.SEARCH", self.index_name,
-                f"*=>[KNN {top_k} @embedding $vec AS score]",
-                "PARAMS", "2", "vec", query_bytes,
-                "SORTBY", "score",
-                "DIALECT", "2",
-                "RETURN", "4", "chunk_id", "source", "content", "score"
-            )
+    def search_many(
+        self,
+        query_vectors: list[list[float]],
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[list[dict]]:
+        """
+        Search for several query vectors in one pipelined round trip.
+
+        When re-ranking, candidates are fetched as IDs only and the fields
+        are loaded afterwards for the top_k survivors.
+
+        Args:
+            query_vectors: Query embeddings
+            top_k: Number of results per query
+            source_prefix: Only match chunks whose source starts with this
+            fields: Chunk fields to return (defaults to RESULT_FIELDS; pass
+                    () for chunk IDs and scores only)
+
+        Returns:
+            One result list per query, in input order. A chunk found by
+            several queries has the same content string object in each row.
+        """
+        if not query_vectors:
+            return []
 
-            # Parse results
-            # Format: [count, key1, fields1, key2, fields2, ...]
-            _count = result[0]  # noqa: F841
-            results = []
+        fields = RESULT_FIELDS if fields is None else fields
+        reranks = self.index_config.reranks
+        results = self._execute_searches([
+            self._search_args(query_vector, top_k, source_prefix, () if reranks else fields)
+            for query_vector in query_vectors
+        ])
+        if reranks:
+            results = self._attach(self._rerank(query_vectors, results, top_k), fields)
+        return results
 
-            for i in range(1, len(result), 2):
-                _key = result[i]  # noqa: F841
-                fields = result[i + 1]
+    def search_hybrid(
+        self,
+        query: str,
+        query_vector: list[float],
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        text_weight: float = 1.0,
+        vector_weight: float = 1.0,
+        rrf_k: int = 60,
+        candidates: int | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[dict]:
+        """
+        Search by keywords and by vector, fusing both rankings with RRF.
+
+        The BM25 full-text leg and the KNN leg are sent together in one
+        pipeline; the source filter is part of both queries, so the server
+        never returns chunks outside the prefix. Both legs return IDs only;
+        fields are fetched for the fused top_k.
+
+        Args:
+            query: Query text for the full-text leg
+            query_vector: Query embedding for the KNN leg
+            top_k: Number of results to return
+            source_prefix: Only match chunks whose source starts with this
+            text_weight: RRF weight of the full-text ranking
+            vector_weight: RRF weight of the KNN ranking
+            rrf_k: RRF damping constant
+            candidates: Results fetched per leg (defaults to 4 * top_k, min 20)
+            fields: Chunk fields to return (defaults to RESULT_FIELDS)
+
+        Returns:
+            List of chunks with fused scores (higher is better) and the rank
+            each leg gave them (None if absent from that leg)
+        """
+        candidates = candidates or max(top_k * 4, 20)
+        commands = [self._search_args(query_vector, candidates, source_prefix, ())]
+        if tokenize(query):
+            commands.append(self._text_search_args(query, candidates, source_prefix, ()))
 
-                # fields is list: [field1, value1, field2, value2, ...]
-                doc = {}
-                for j in range(0, len(fields), 2):
-                    doc[fields[j]] = fields[j + 1]
+        legs = self._execute_searches(commands)
+        if self.index_config.reranks:
+            legs[0] = self._rerank([query_vector], legs[:1], candidates)[0]
+        vector_leg = legs[0]
+        text_leg = legs[1] if len(legs) > 1 else []
 
-                results.append(doc)
+        fused = fuse_rankings(text_leg, vector_leg, top_k, text_weight, vector_weight, rrf_k)
+        return self._attach([fused], RESULT_FIELDS if fields is None else fields)[0]
 
+    def fetch(
+        self,
+        chunk_ids: list[str],
+        fields: tuple[str, ...] = RESULT_FIELDS,
+    ) -> list[dict | None]:
+        """
+        Load stored text fields for chunks with one pipelined HMGET each.
+
+        Args:
+            chunk_ids: Chunks to load
+            fields: Hash fields to read (e.g. ("content",)); chunk_id is
+                    always included
+
+        Returns:
+            Field dicts in input order, None for chunks that don't exist
+        """
+        fields = _with_chunk_id(fields)
+        pipe = self.client.pipeline(transaction=False)
+        for chunk_id in chunk_ids:
+            pipe.hmget(self._key(chunk_id), fields)
+        return [
+            None if values[0] is None else dict(zip(fields, values))
+            for values in pipe.execute()
+        ]
+
+    def _attach(self, results: list[list[dict]], fields: tuple[str, ...]) -> list[list[dict]]:
+        """
+        Fill fields into ID-only results, fetching each chunk once.
+
+        Chunks deleted since the search are dropped.
+        """
+        missing = tuple(field for field in fields if field != "chunk_id")
+        chunk_ids = _unique_ids(results)
+        if not missing or not chunk_ids:
             return results
+        return _merge_fields(results, dict(zip(chunk_ids, self.fetch(chunk_ids, missing))))
 
-        except redis.exceptions.ResponseError as e:
-            # Index might not exist yet
-            if "no such index" in str(e).lower():
-                return []
-            raise
+    def _rerank(
+        self,
+        query_vectors: list[list[float]],
+        results: list[list[dict]],
+        top_k: int,
+    ) -> list[list[dict]]:
+        """
+        Re-score candidates by exact cosine distance against float32 vectors.
+
+        Vectors of all candidates are fetched in one pipeline, once per
+        chunk. Chunks written without a float32 copy fall back to their
+        decoded quantized vector.
+        """
+        chunk_ids = _unique_ids(results)
+        if not chunk_ids:
+            return results
+
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_vector_reads(pipe, chunk_ids)
+        return self._apply_rerank(query_vectors, results, top_k, chunk_ids, pipe.execute())
+
+    def _queue_vector_reads(self, pipe, chunk_ids: list[str]):
+        """Queue one binary HMGET of the stored vector fields per chunk."""
+        for chunk_id in chunk_ids:
+            pipe.execute_command(
+                "HMGET", self._key(chunk_id),
+                "embedding_full", "embedding", "embedding_scale",
+                NEVER_DECODE=True,
+            )
+
+    def _apply_rerank(
+        self,
+        query_vectors: list[list[float]],
+        results: list[list[dict]],
+        top_k: int,
+        chunk_ids: list[str],
+        replies: list,
+    ) -> list[list[dict]]:
+        """Re-order candidates using the vector fields read by _queue_vector_reads."""
+        vector_type = self.index_config.vector_type
+        vectors = {}
+        for chunk_id, (full, encoded, scale) in zip(chunk_ids, replies):
+            if full is not None:
+                vectors[chunk_id] = np.frombuffer(full, dtype=np.float32)
+            else:
+                scale = float(scale) if scale else None
+                vectors[chunk_id] = decode_bytes(encoded, vector_type, scale)
+
+        reranked = []
+        for query_vector, docs in zip(query_vectors, results):
+            if not docs:
+                reranked.append(docs)
+                continue
+            matrix = np.vstack([vectors[doc["chunk_id"]] for doc in docs])
+            query = np.asarray(query_vector, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+            norms[norms == 0] = 1.0
+            distances = 1.0 - (matrix @ query) / norms
+
+            order = np.argsort(distances)[:top_k]
+            for i in order:
+                docs[i]["score"] = f"{distances[i]:.6g}"
+            reranked.append([docs[i] for i in order])
+        return reranked
+
+    def memory_footprint(self) -> dict:
+        """
+        Report the memory taken by stored vectors.
+
+        Returns:
+            Dict with document count, vector type, bytes per vector, total
+            vector bytes (indexed plus any float32 re-rank copies) and the
+            index size reported by FT.INFO when the server provides it
+        """
+        try:
+            info = self.client.execute_command("FT.INFO", self.index_name)
+        except redis.exceptions.ResponseError:
+            info = []  # Index doesn't exist
+        return self._footprint(info)
+
+    def _footprint(self, info: list) -> dict:
+        """Build memory_footprint's report from an FT.INFO reply."""
+        fields = dict(zip(info[::2], info[1::2]))
+        num_docs = int(fields.get("num_docs", 0))
+        reported_mb = None
+        if "vector_index_sz_mb" in fields:
+            reported_mb = float(fields["vector_index_sz_mb"])
+
+        dimension = self._dimension or 0
+        per_vector = bytes_per_vector(dimension, self.index_config.vector_type)
+        full_copy = dimension * 4 if self.index_config.reranks else 0
+        return {
+            "num_docs": num_docs,
+            "vector_type": self.index_config.vector_type,
+            "bytes_per_vector": per_vector,
+            "vector_bytes": num_docs * (per_vector + full_copy),
+            "float32_bytes": num_docs * dimension * 4,
+            "index_reported_mb": reported_mb,
+        }
 
     def delete_index(self):
         """Delete the index."""
@@ -141,3 +822,351 @@ class DragonflyVectorStore:
             self.client.execute_command("FT.DROPINDEX", self.index_name, "DD")
         except redis.exceptions.ResponseError:
             pass  # Index doesn't exist
+        self.client.delete(self.stats_key)
+        self.client.incr(self.version_key)
+
+
+class AsyncDragonflyVectorStore(DragonflyVectorStore):
+    """
+    DragonflyVectorStore for asyncio code, built on redis.asyncio.
+
+    Every method that talks to the server is a coroutine with the same
+    signature as its sync counterpart. Connections come from a blocking
+    pool, so concurrent callers share at most max_connections sockets
+    and wait for a free one instead of opening more.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        index_name: str = "docs",
+        batch_size: int = 500,
+        client: redis.asyncio.Redis | None = None,
+        index_config: VectorIndexConfig | None = None,
+        max_connections: int = 16,
+        concurrency: int = 4,
+    ):
+        """
+        Initialize vector store.
+
+        Args:
+            host: Redis host
+            port: Redis port
+            index_name: Name for the vector index
+            batch_size: Chunks per pipeline round trip in add_chunks
+            client: Pre-built async Redis client (overrides host/port)
+            index_config: Vector index type and HNSW parameters
+            max_connections: Size of the connection pool
+            concurrency: Pipelines in flight at once for bulk writes and deletes
+        """
+        client = client or redis.asyncio.Redis.from_pool(
+            redis.asyncio.BlockingConnectionPool(
+                host=host,
+                port=port,
+                max_connections=max_connections,
+                decode_responses=True,
+            )
+        )
+        super().__init__(host, port, index_name, batch_size, client, index_config)
+        self.concurrency = concurrency
+
+    async def _gather_batches(self, batches: list, run) -> list:
+        """Run a coroutine per batch, at most `concurrency` at a time."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(batch):
+            async with semaphore:
+                return await run(batch)
+
+        return await asyncio.gather(*(bounded(batch) for batch in batches))
+
+    async def create_index(self, dimension: int):
+        """
+        Create vector index if it doesn't exist, adding source_tag to an older one.
+
+        Args:
+            dimension: Embedding dimension
+
+        Raises:
+            ValueError: If an existing index lacks source_tag and the server
+                        cannot add it; the index must then be rebuilt
+        """
+        self._dimension = dimension
+
+        try:
+            info = await self.client.execute_command("FT.INFO", self.index_name)
+        except redis.exceptions.ResponseError:
+            info = None  # Index doesn't exist
+        if info is not None:
+            if "source_tag" not in schema_attributes(info):
+                try:
+                    await self.client.execute_command(*self._add_source_tag_command())
+                except redis.exceptions.ResponseError as e:
+                    raise self._rebuild_required(e) from e
+            return
+
+        try:
+            await self.client.execute_command(*self._create_index_command(dimension))
+        except redis.exceptions.ResponseError as e:
+            if "Index already exists" not in str(e):
+                raise
+
+    async def index_version(self) -> int:
+        """Counter bumped by every add and delete (for result caching)."""
+        return int(await self.client.get(self.version_key) or 0)
+
+    async def save_stats(self, stats: dict):
+        """Persist index statistics as one JSON value."""
+        await self.client.set(self.stats_key, json.dumps(stats))
+
+    async def load_stats(self) -> dict:
+        """Load statistics saved by save_stats ({} if none) in one GET."""
+        value = await self.client.get(self.stats_key)
+        return json.loads(value) if value else {}
+
+    async def index_exists(self) -> bool:
+        """Check if index exists."""
+        try:
+            await self.client.execute_command("FT.INFO", self.index_name)
+            return True
+        except redis.exceptions.ResponseError:
+            return False
+
+    async def add_chunk(self, chunk: DocumentChunk, embedding: list[float]):
+        """
+        Add chunk with embedding to store.
+
+        Args:
+            chunk: Document chunk
+            embedding: Embedding vector
+        """
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_writes(pipe, [chunk], self._vector_fields([embedding]))
+        await pipe.execute()
+
+    async def add_chunks(
+        self,
+        chunks: list[DocumentChunk],
+        embeddings: list[list[float]],
+        batch_size: int | None = None,
+    ) -> int:
+        """
+        Add many chunks with embeddings using concurrent pipelined batches.
+
+        Args:
+            chunks: Document chunks
+            embeddings: Embedding vectors, one per chunk
+            batch_size: Chunks per pipeline (defaults to self.batch_size)
+
+        Returns:
+            Number of chunks written
+        """
+        if len(chunks) != len(embeddings):
+            raise ValueError(
+                f"Got {len(chunks)} chunks but {len(embeddings)} embeddings"
+            )
+        if not chunks:
+            return 0
+
+        batch_size = batch_size or self.batch_size
+        vector_fields = self._vector_fields(embeddings)
+
+        async def write(start: int):
+            end = start + batch_size
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_writes(pipe, chunks[start:end], vector_fields[start:end])
+            await pipe.execute()
+
+        started = time.perf_counter()
+        starts = list(range(0, len(chunks), batch_size))
+        await self._gather_batches(starts, write)
+
+        self._batches_written += len(starts)
+        self._write_seconds += time.perf_counter() - started
+        self._chunks_written += len(chunks)
+        return len(chunks)
+
+    async def delete_chunks(self, chunk_ids: list[str], batch_size: int | None = None) -> int:
+        """
+        Delete chunks by ID using concurrent pipelined batches.
+
+        Args:
+            chunk_ids: IDs of chunks to remove
+            batch_size: Keys per pipeline (defaults to self.batch_size)
+
+        Returns:
+            Number of keys actually deleted
+        """
+        batch_size = batch_size or self.batch_size
+
+        async def delete(start: int) -> int:
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_deletes(
+                pipe, [self._key(chunk_id) for chunk_id in chunk_ids[start:start + batch_size]]
+            )
+            return sum((await pipe.execute())[:-1])
+
+        return sum(await self._gather_batches(list(range(0, len(chunk_ids), batch_size)), delete))
+
+    async def collect_garbage(self, live_ids: set[str], scan_count: int = 1000) -> int:
+        """
+        Remove chunk keys that are not in the live set.
+
+        Args:
+            live_ids: Chunk IDs that must be kept
+            scan_count: COUNT hint per SCAN call
+
+        Returns:
+            Number of keys removed
+        """
+        prefix = self._key("")
+        dead_keys = []
+        removed = 0
+
+        async for key in self.client.scan_iter(match=f"{prefix}*", count=scan_count):
+            if key[len(prefix):] not in live_ids:
+                dead_keys.append(key)
+            if len(dead_keys) >= self.batch_size:
+                removed += await self._unlink(dead_keys)
+                dead_keys = []
+
+        if dead_keys:
+            removed += await self._unlink(dead_keys)
+        return removed
+
+    async def _unlink(self, keys: list[str]) -> int:
+        """Unlink keys in one pipelined round trip."""
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_deletes(pipe, keys)
+        return sum((await pipe.execute())[:-1])
+
+    async def _execute_searches(self, commands: list[list]) -> list[list[dict]]:
+        """Run FT.SEARCH commands in one pipeline and parse every reply."""
+        pipe = self.client.pipeline(transaction=False)
+        for command in commands:
+            pipe.execute_command(*command)
+        return self._parse_replies(await pipe.execute(raise_on_error=False))
+
+    async def search(
+        self,
+        query_vector: list[float],
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[dict]:
+        """Search for similar chunks (see DragonflyVectorStore.search)."""
+        return (await self.search_many([query_vector], top_k, source_prefix, fields))[0]
+
+    async def search_many(
+        self,
+        query_vectors: list[list[float]],
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[list[dict]]:
+        """Search for several query vectors in one pipelined round trip."""
+        if not query_vectors:
+            return []
+
+        fields = RESULT_FIELDS if fields is None else fields
+        reranks = self.index_config.reranks
+        results = await self._execute_searches([
+            self._search_args(query_vector, top_k, source_prefix, () if reranks else fields)
+            for query_vector in query_vectors
+        ])
+        if reranks:
+            results = await self._attach(
+                await self._rerank(query_vectors, results, top_k), fields
+            )
+        return results
+
+    async def search_hybrid(
+        self,
+        query: str,
+        query_vector: list[float],
+        top_k: int = 5,
+        source_prefix: str | None = None,
+        text_weight: float = 1.0,
+        vector_weight: float = 1.0,
+        rrf_k: int = 60,
+        candidates: int | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[dict]:
+        """Search by keywords and by vector, fusing both rankings with RRF."""
+        candidates = candidates or max(top_k * 4, 20)
+        commands = [self._search_args(query_vector, candidates, source_prefix, ())]
+        if tokenize(query):
+            commands.append(self._text_search_args(query, candidates, source_prefix, ()))
+
+        legs = await self._execute_searches(commands)
+        if self.index_config.reranks:
+            legs[0] = (await self._rerank([query_vector], legs[:1], candidates))[0]
+        vector_leg = legs[0]
+        text_leg = legs[1] if len(legs) > 1 else []
+
+        fused = fuse_rankings(text_leg, vector_leg, top_k, text_weight, vector_weight, rrf_k)
+        return (await self._attach([fused], RESULT_FIELDS if fields is None else fields))[0]
+
+    async def fetch(
+        self,
+        chunk_ids: list[str],
+        fields: tuple[str, ...] = RESULT_FIELDS,
+    ) -> list[dict | None]:
+        """Load stored text fields for chunks with one pipelined HMGET each."""
+        fields = _with_chunk_id(fields)
+        pipe = self.client.pipeline(transaction=False)
+        for chunk_id in chunk_ids:
+            pipe.hmget(self._key(chunk_id), fields)
+        return [
+            None if values[0] is None else dict(zip(fields, values))
+            for values in await pipe.execute()
+        ]
+
+    async def _attach(
+        self,
+        results: list[list[dict]],
+        fields: tuple[str, ...],
+    ) -> list[list[dict]]:
+        """Fill fields into ID-only results, fetching each chunk once."""
+        missing = tuple(field for field in fields if field != "chunk_id")
+        chunk_ids = _unique_ids(results)
+        if not missing or not chunk_ids:
+            return results
+        return _merge_fields(results, dict(zip(chunk_ids, await self.fetch(chunk_ids, missing))))
+
+    async def _rerank(
+        self,
+        query_vectors: list[list[float]],
+        results: list[list[dict]],
+        top_k: int,
+    ) -> list[list[dict]]:
+        """Re-score candidates by exact cosine distance against float32 vectors."""
+        chunk_ids = _unique_ids(results)
+        if not chunk_ids:
+            return results
+
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_vector_reads(pipe, chunk_ids)
+        return self._apply_rerank(query_vectors, results, top_k, chunk_ids, await pipe.execute())
+
+    async def memory_footprint(self) -> dict:
+        """Report the memory taken by stored vectors."""
+        try:
+            info = await self.client.execute_command("FT.INFO", self.index_name)
+        except redis.exceptions.ResponseError:
+            info = []  # Index doesn't exist
+        return self._footprint(info)
+
+    async def delete_index(self):
+        """Delete the index."""
+        try:
+            await self.client.execute_command("FT.DROPINDEX", self.index_name, "DD")
+        except redis.exceptions.ResponseError:
+            pass  # Index doesn't exist
+        await self.client.delete(self.stats_key)
+        await self.client.incr(self.version_key)
+
+    async def aclose(self):
+        """Close the client and disconnect its pool."""
+        await self.client.aclose()
@@ -0,0 +1,129 @@
+# ---
+# entity_id: module-benchmark
+# entity_name: Entity Store Benchmarks
+# entity_type_id: module
+# entity_path: entity_store/benchmark.py
+# entity_language: python
+# entity_state: active
+# entity_created: 2026-10-17T09:00:00Z
+# entity_exports: [synthetic_entities, scan_filter, benchmark_filter]
+# entity_dependencies: [models, registry, neon_client]
+# ---
+
+"""
+Benchmarks for registry queries on synthetic monorepo-sized entity sets.
+"""
+
+import fnmatch
+import time
+from uuid import UUID
+
+from entity_store.models import Entity, EntityState, EntityType
+from entity_store.neon_client import NeonClient
+from entity_store.registry import EntityRegistry
+
+VERBS = ["get", "set", "load", "save", "parse", "build", "render", "validate", "handle", "make"]
+NOUNS = [
+    "user", "order", "config", "session", "token", "entity", "index", "query", "cache", "report",
+    "schema", "event", "payload", "request", "response", "widget", "layout", "route", "job", "file",
+]
+
+# (description, filter kwargs)
+FILTER_QUERIES = [
+    ("type", {"type_id": EntityType.CLASS}),
+    ("exact name", {"name_pattern": "parse_query_7"}),
+    ("name glob", {"name_pattern": "parse_*_1?"}),
+    ("name substring", {"name_pattern": "*session*"}),
+    ("exact path", {"path_pattern": "pkg0/mod3/file_12.py"}),
+    ("path prefix", {"path_pattern": "pkg0/mod3/*"}),
+    ("type + path", {"type_id": EntityType.METHOD, "path_pattern": "pkg0/mod1*"}),
+    ("archived", {"state": EntityState.ARCHIVED}),
+]
+
+
+def synthetic_entities(count: int) -> list[Entity]:
+    """
+    Generate entities shaped like a large monorepo.
+
+    About 25 entities per file under pkgN/modM/ directories, names drawn
+    from a few thousand verb_noun_N combinations, 1% archived.
+
+    Args:
+        count: Number of entities
+
+    Returns:
+        Entities (built without validation for speed)
+    """
+    types = [EntityType.CLASS, EntityType.METHOD, EntityType.METHOD, EntityType.FUNCTION]
+    return [
+        Entity.model_construct(
+            entity_id=UUID(int=i + 1),
+            entity_name=f"{VERBS[i % 10]}_{NOUNS[i // 10 % 20]}_{i // 200 % 20}",
+            entity_type_id=types[i % 4],
+            entity_state=EntityState.ARCHIVED if i % 100 == 99 else EntityState.ACTIVE,
+            entity_path=f"pkg{i // 250_000}/mod{i // 10_000 % 25}/file_{i // 25 % 400}.py",
+            entity_line_start=i % 25 + 1,
+        )
+        for i in range(count)
+    ]
+
+
+def scan_filter(
+    entities: list[Entity],
+    type_id: EntityType | None = None,
+    name_pattern: str | None = None,
+    path_pattern: str | None = None,
+    state: EntityState = EntityState.ACTIVE,
+) -> list[Entity]:
+    """Reference filter: a linear scan with fnmatch, as before indexing."""
+    return [
+        entity
+        for entity in entities
+        if entity.entity_state == state
+        and (type_id is None or entity.entity_type_id == type_id)
+        and (not name_pattern or fnmatch.fnmatch(entity.entity_name, name_pattern))
+        and (not path_pattern or fnmatch.fnmatch(entity.entity_path, path_pattern))
+    ]
+
+
+def benchmark_filter(count: int = 100_000, repeat: int = 5) -> dict:
+    """
+    Compare indexed EntityRegistry.filter with a linear scan.
+
+    Args:
+        count: Number of synthetic entities
+        repeat: Timed runs per query (the best is reported)
+
+    Returns:
+        Dict with entity count, index build seconds and, per query, the
+        result count and best scan and indexed milliseconds
+    """
+    entities = synthetic_entities(count)
+    registry = EntityRegistry(NeonClient())
+
+    started = time.perf_counter()
+    for entity in entities:
+        registry.register(entity)
+    build_seconds = time.perf_counter() - started
+
+    queries = {}
+    for name, kwargs in FILTER_QUERIES:
+        scan_ms, indexed_ms = [], []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            expected = scan_filter(entities, **kwargs)
+            scan_ms.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            found = registry.filter(**kwargs)
+            indexed_ms.append((time.perf_counter() - started) * 1000)
+
+        if [e.entity_id for e in found] != [e.entity_id for e in expected]:
+            raise RuntimeError(f"Indexed filter disagrees with scan for {name!r}")
+        queries[name] = {
+            "results": len(found),
+            "scan_ms": min(scan_ms),
+            "indexed_ms": min(indexed_ms),
+        }
+
+    return {"entities": count, "build_seconds": build_seconds, "queries": queries}
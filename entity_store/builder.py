@@ -0,0 +1,337 @@
+# ---
+# entity_id: module-builder
+# entity_name: Entity Index Builder
+# entity_type_id: module
+# entity_path: entity_store/builder.py
+# entity_language: python
+# entity_state: active
+# entity_created: 2026-10-17T10:00:00Z
+# entity_exports: [build_index, discover_files, default_jobs, BuildResult, LanguageStats, GitIgnore]
+# entity_dependencies: [models, registry, parsers, cache]
+# ---
+
+"""
+Whole-repository entity index builds.
+
+Walks a repository (honoring .gitignore), parses files in a process pool
+and bulk-registers the entities as each batch of files comes back. Parse
+results are kept in the EntityCache L2 tier, so unchanged files are not
+parsed again on the next build.
+"""
+
+import fnmatch
+import functools
+import os
+import subprocess
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from entity_store.cache import EntityCache
+from entity_store.models import Entity
+from entity_store.parsers import get_parser
+from entity_store.registry import EntityRegistry
+
+# File suffix -> language for the parsers build_index runs
+PARSED_SUFFIXES = {".py": "python", ".md": "markdown", ".markdown": "markdown"}
+
+
+@dataclass
+class LanguageStats:
+    """Parse counters for one language."""
+
+    files: int = 0
+    entities: int = 0
+    cached: int = 0  # Served from the parse cache
+    errors: int = 0
+    skipped: int = 0  # Parser not implemented yet
+    bytes: int = 0
+    seconds: float = 0.0  # Parse time summed over workers
+
+    @property
+    def files_per_sec(self) -> float:
+        """Files parsed per second of worker time."""
+        return self.files / self.seconds if self.seconds else 0.0
+
+    def merge(self, other: "LanguageStats") -> None:
+        """Add another batch's counters."""
+        self.files += other.files
+        self.entities += other.entities
+        self.cached += other.cached
+        self.errors += other.errors
+        self.skipped += other.skipped
+        self.bytes += other.bytes
+        self.seconds += other.seconds
+
+
+@dataclass
+class BuildResult:
+    """Outcome of a build_index run."""
+
+    files: int = 0
+    entities: int = 0
+    jobs: int = 1
+    wall_seconds: float = 0.0
+    languages: dict[str, LanguageStats] = field(default_factory=dict)
+
+    @property
+    def files_per_sec(self) -> float:
+        """Files indexed per wall-clock second."""
+        return self.files / self.wall_seconds if self.wall_seconds else 0.0
+
+
+class GitIgnore:
+    """
+    Matcher for .gitignore files found while walking a tree.
+
+    Supports the common syntax: comments, negation (!), directory-only
+    patterns (trailing /), anchored patterns (leading or inner /) and
+    basename globs. Used when git itself is not available.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without rules."""
+        # (directory the rule applies under, pattern, negated, directory only)
+        self.rules: list[tuple[str, str, bool, bool]] = []
+
+    def add_file(self, path: Path, base: str) -> None:
+        """
+        Load the rules of one .gitignore.
+
+        Args:
+            path: .gitignore file
+            base: Its directory relative to the walk root ("" for the root)
+        """
+        try:
+            lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            return
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            pattern = line[1:] if negated else line
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            if pattern:
+                self.rules.append((base, pattern, negated, dir_only))
+
+    def ignored(self, relpath: str, is_dir: bool) -> bool:
+        """
+        Check a path against the loaded rules (the last match wins).
+
+        Args:
+            relpath: "/"-separated path relative to the walk root
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if the path is ignored
+        """
+        ignored = False
+        for base, pattern, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not relpath.startswith(base + "/"):
+                    continue
+                path = relpath[len(base) + 1:]
+            else:
+                path = relpath
+            if "/" in pattern:
+                matched = fnmatch.fnmatchcase(path, pattern.lstrip("/").replace("**/", "*"))
+            else:
+                matched = fnmatch.fnmatchcase(path.rsplit("/", 1)[-1], pattern)
+            if matched:
+                ignored = not negated
+        return ignored
+
+
+def default_jobs() -> int:
+    """CPUs available to this process (respects affinity masks and cgroup pinning)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def discover_files(root: Path) -> list[Path]:
+    """
+    List files under root that build_index can parse, honoring .gitignore.
+
+    Uses `git ls-files` (tracked plus untracked, not ignored files) inside
+    a git work tree and walks the tree with GitIgnore otherwise.
+
+    Args:
+        root: Repository root
+
+    Returns:
+        Sorted file paths (root joined with the relative path)
+    """
+    root = Path(root)
+    relpaths = _git_files(root)
+    if relpaths is None:
+        relpaths = _walk_files(root)
+    return sorted(
+        root / relpath
+        for relpath in relpaths
+        if Path(relpath).suffix.lower() in PARSED_SUFFIXES and (root / relpath).is_file()
+    )
+
+
+def _git_files(root: Path) -> list[str] | None:
+    """Relative paths git considers part of the work tree, or None outside git."""
+    try:
+        output = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=root,
+            capture_output=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return [name for name in output.decode("utf-8", "surrogateescape").split("\0") if name]
+
+
+def _walk_files(root: Path) -> list[str]:
+    """Relative paths under root not excluded by any .gitignore on the way."""
+    ignore = GitIgnore()
+    relpaths = []
+    for directory, dirnames, filenames in os.walk(root):
+        base = Path(directory).relative_to(root).as_posix()
+        base = "" if base == "." else base
+        if ".gitignore" in filenames:
+            ignore.add_file(Path(directory) / ".gitignore", base)
+
+        prefix = f"{base}/" if base else ""
+        dirnames[:] = [
+            name for name in dirnames
+            if name != ".git" and not ignore.ignored(prefix + name, is_dir=True)
+        ]
+        relpaths.extend(
+            prefix + name for name in filenames if not ignore.ignored(prefix + name, is_dir=False)
+        )
+    return relpaths
+
+
+def _parse_batch(
+    relpaths: list[str],
+    root: Path,
+    cache_dir: Path | None = None,
+    refresh: bool = False,
+) -> tuple[list[Entity], dict[str, LanguageStats]]:
+    """
+    Parse a batch of files (runs in a worker process).
+
+    Entities get the repo-relative POSIX path as entity_path, however
+    root was spelled. Files that fail to read or parse are counted as
+    errors, files whose parser is still a stub as skipped; neither
+    contributes entities.
+
+    Args:
+        relpaths: "/"-separated paths of the files relative to root
+        root: Repository root
+        cache_dir: EntityCache directory for parse results (None disables it)
+        refresh: Parse every file, only writing the cache
+
+    Returns:
+        Tuple of (entities, per-language counters)
+    """
+    cache = EntityCache(cache_dir) if cache_dir is not None else None
+    entities: list[Entity] = []
+    languages: dict[str, LanguageStats] = {}
+    for relpath in relpaths:
+        path = root / relpath
+        stats = languages.setdefault(PARSED_SUFFIXES[path.suffix.lower()], LanguageStats())
+        started = time.perf_counter()
+        parsed = cache.get_parse_result(path) if cache is not None and not refresh else None
+        if parsed is not None:
+            stats.cached += 1
+        else:
+            parsed = []
+            try:
+                mtime = path.stat().st_mtime
+                content = path.read_bytes()
+                parsed = get_parser(path).parse(PurePosixPath(relpath), content.decode("utf-8"))
+                if cache is not None:
+                    cache.set_parse_result(path, parsed, mtime, content)
+            except NotImplementedError:
+                stats.skipped += 1
+            except (SyntaxError, ValueError, OSError):
+                stats.errors += 1
+        stats.seconds += time.perf_counter() - started
+        stats.files += 1
+        stats.entities += len(parsed)
+        try:
+            stats.bytes += path.stat().st_size
+        except OSError:
+            pass
+        entities.extend(parsed)
+    return entities, languages
+
+
+def build_index(
+    registry: EntityRegistry,
+    root: Path,
+    jobs: int | None = None,
+    batch_size: int = 64,
+    progress: Callable[[int, int], None] | None = None,
+    cache_dir: Path | None = None,
+    refresh: bool = False,
+) -> BuildResult:
+    """
+    Parse every supported file under root into the registry.
+
+    Files are parsed in batches by a process pool; batches are registered
+    in file order as they complete, so the registry grows while workers
+    keep parsing. jobs=1 parses serially in this process. Entity paths
+    are stored relative to root.
+
+    Args:
+        registry: Registry to register entities in
+        root: Repository root
+        jobs: Worker processes (defaults to the CPUs this process may use)
+        batch_size: Files per worker task
+        progress: Called with (files done, total files) after each batch
+        cache_dir: EntityCache directory for parse results (None disables it)
+        refresh: Re-parse every file even if its cached result is valid
+
+    Returns:
+        BuildResult with totals and per-language counters
+    """
+    started = time.perf_counter()
+    root = Path(root).resolve()
+    files = [path.relative_to(root).as_posix() for path in discover_files(root)]
+    jobs = jobs or default_jobs()
+    result = BuildResult(jobs=jobs)
+    batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+
+    pool = ProcessPoolExecutor(jobs) if jobs > 1 and len(batches) > 1 else None
+    try:
+        parse = functools.partial(_parse_batch, root=root, cache_dir=cache_dir, refresh=refresh)
+        parsed = pool.map(parse, batches) if pool else map(parse, batches)
+        _register_batches(registry, parsed, len(files), result, progress)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    result.wall_seconds = time.perf_counter() - started
+    return result
+
+
+def _register_batches(
+    registry: EntityRegistry,
+    parsed,
+    total: int,
+    result: BuildResult,
+    progress: Callable[[int, int], None] | None,
+) -> None:
+    """Register parsed batches as they arrive and accumulate counters."""
+    for entities, languages in parsed:
+        result.entities += registry.register_many(entities)
+        for language, stats in languages.items():
+            result.languages.setdefault(language, LanguageStats()).merge(stats)
+            result.files += stats.files
+        if progress is not None:
+            progress(result.files, total)
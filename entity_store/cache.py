@@ -7,7 +7,7 @@
 # entity_state: active
 # entity_created: 2026-01-22T16:00:00Z
 # entity_exports: [EntityCache, CacheEntry]
-# entity_dependencies: [models]
+# entity_dependencies: [models, indexes]
 # ---
 
 """
@@ -16,16 +16,99 @@ Local caching layer for entity store.
 Provides multi-tier caching for token reduction:
 - L1: In-memory (session lifetime)
 - L2: File-based (.entity-cache/, 1-24h TTL)
-- L3: Persistent index (.entity-index.json)
+- L3: Persistent index (.entity-cache/entities.idx, see index_file)
 """
 
+import fnmatch
+import hashlib
+import heapq
+import json
+import marshal
+import os
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
-from entity_store.models import Entity
+from entity_store.indexes import GLOB_MAGIC, PathTrie
+from entity_store.models import Entity, EntityState, EntityType
+
+if TYPE_CHECKING:
+    from entity_store.index_file import EntityIndexFile
+
+# L1 keys are namespaced like "entity:<uuid>"; the key trie splits on this
+KEY_SEPARATOR = ":"
+# Expired L1 entries reaped per set
+REAP_BATCH = 8
+
+# L2 parse cache file: header, the source path (UTF-8), then a marshal'd
+# tuple of entity rows (see _entity_row)
+PARSE_MAGIC = b"ECPR"
+PARSE_FORMAT_VERSION = 2  # 2: entity paths are relative to the build root
+# magic, format version, mtime_ns, size, sha256 of the content, path length
+PARSE_HEADER = struct.Struct("<4sHqQ32sI")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _timestamp_us(value: datetime) -> int:
+    """Microseconds since the epoch (naive datetimes are taken as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _entity_row(entity: Entity) -> tuple:
+    """Flatten an entity into a tuple of marshal-able builtins."""
+    return (
+        entity.entity_id.bytes,
+        entity.entity_name,
+        entity.entity_type_id.value,
+        entity.entity_frontmatter_signature,
+        _timestamp_us(entity.entity_last_updated),
+        entity.entity_state.value,
+        _timestamp_us(entity.entity_created),
+        entity.entity_path,
+        entity.entity_line_start,
+        entity.entity_line_end,
+        entity.entity_parent_id.bytes if entity.entity_parent_id else None,
+        entity.entity_language,
+        entity.entity_signature,
+        entity.entity_docstring,
+        json.dumps(entity.entity_metadata) if entity.entity_metadata else None,
+    )
+
+
+def _entity_from_row(row: tuple) -> Entity:
+    """Rebuild an entity flattened by _entity_row (without re-validating it)."""
+    (
+        entity_id, name, type_id, frontmatter_signature, last_updated, state, created,
+        path, line_start, line_end, parent_id, language, signature, docstring, metadata,
+    ) = row
+    return Entity.model_construct(
+        entity_id=UUID(bytes=entity_id),
+        entity_name=name,
+        entity_type_id=EntityType(type_id),
+        entity_frontmatter_signature=frontmatter_signature,
+        entity_last_updated=_EPOCH + last_updated * _MICROSECOND,
+        entity_state=EntityState(state),
+        entity_created=_EPOCH + created * _MICROSECOND,
+        entity_path=path,
+        entity_line_start=line_start,
+        entity_line_end=line_end,
+        entity_parent_id=UUID(bytes=parent_id) if parent_id else None,
+        entity_language=language,
+        entity_signature=signature,
+        entity_docstring=docstring,
+        entity_metadata=json.loads(metadata) if metadata else {},
+    )
 
 
 @dataclass
@@ -36,11 +119,41 @@ class CacheEntry:
     created_at: datetime
     expires_at: datetime
     hit_count: int = 0
+    size: int = 0  # Approximate bytes, for the L1 memory bound
 
     @property
     def is_expired(self) -> bool:
         """Check if entry has expired."""
-        return datetime.utcnow() > self.expires_at
+        return datetime.now(UTC) > self.expires_at
+
+
+def _approx_size(value: Any, depth: int = 3) -> int:
+    """
+    Approximate the memory held by a value.
+
+    Follows containers, pydantic models and plain objects a few levels
+    deep; shared objects are counted once per reference, so this errs on
+    the high side.
+
+    Args:
+        value: Value to measure
+        depth: Levels of nesting to follow
+
+    Returns:
+        Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    if depth == 0 or isinstance(value, (str, bytes, int, float, bool, UUID, datetime)):
+        return size
+    if isinstance(value, dict):
+        items = [*value.keys(), *value.values()]
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value
+    elif hasattr(value, "__dict__"):
+        items = list(vars(value).values())
+    else:
+        return size
+    return size + sum(_approx_size(item, depth - 1) for item in items)
 
 
 class EntityCache:
@@ -51,18 +164,51 @@ class EntityCache:
     - AST parse results (L2, 24h TTL)
     - Query results (L1, session TTL)
     - Entity signatures (L3, persistent)
+
+    The L1 tier is an in-memory LRU bounded by entry count and approximate
+    bytes. Expired entries are dropped when looked up and reaped a few at a
+    time (earliest expiry first) on every set, so no call sweeps the whole
+    cache. Keys are also kept in a trie split on ":", so invalidate_pattern
+    only visits keys under the pattern's literal prefix.
     """
 
-    def __init__(self, cache_dir: Path | None = None) -> None:
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
         """
         Initialize cache.
 
         Args:
             cache_dir: Directory for file-based cache.
                       Defaults to .entity-cache/
+            max_entries: Evict least recently used L1 entries beyond this count
+            max_bytes: Evict least recently used L1 entries beyond this
+                       approximate size
         """
         self.cache_dir = cache_dir or Path(".entity-cache")
-        self._memory_cache: dict[str, CacheEntry] = {}
+        self.index_path = self.cache_dir / "entities.idx"
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._memory_cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._keys = PathTrie(separator=KEY_SEPARATOR)
+        # (expires_at, sequence, key, entry); entries replaced or removed since
+        # are skipped when popped
+        self._expiry_heap: list[tuple[datetime, int, str, CacheEntry]] = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.parse_hits = 0
+        self.parse_misses = 0
+
+    def __len__(self) -> int:
+        return len(self._memory_cache)
 
     def get(self, key: str) -> Any | None:
         """
@@ -74,7 +220,19 @@ class EntityCache:
         Returns:
             Cached value if found and not expired, None otherwise
         """
-        raise NotImplementedError("get not yet implemented")
+        with self._lock:
+            entry = self._memory_cache.get(key)
+            if entry is not None and entry.is_expired:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._memory_cache.move_to_end(key)
+            entry.hit_count += 1
+            self.hits += 1
+            return entry.value
 
     def set(
         self,
@@ -90,7 +248,23 @@ class EntityCache:
             value: Value to cache
             ttl: Time-to-live for the entry
         """
-        raise NotImplementedError("set not yet implemented")
+        now = datetime.now(UTC)
+        entry = CacheEntry(value, now, now + ttl, size=_approx_size(value) + _approx_size(key))
+        with self._lock:
+            if key in self._memory_cache:
+                self._drop(key)
+            if entry.size > self.max_bytes:
+                return
+            self._memory_cache[key] = entry
+            self._keys.add(key)
+            self.current_bytes += entry.size
+            self._sequence += 1
+            heapq.heappush(self._expiry_heap, (entry.expires_at, self._sequence, key, entry))
+
+            self._reap(now)
+            while len(self._memory_cache) > self.max_entries or self.current_bytes > self.max_bytes:
+                self._drop(next(iter(self._memory_cache)))
+                self.evictions += 1
 
     def invalidate(self, key: str) -> None:
         """
@@ -99,7 +273,9 @@ class EntityCache:
         Args:
             key: Cache key to invalidate
         """
-        raise NotImplementedError("invalidate not yet implemented")
+        with self._lock:
+            if key in self._memory_cache:
+                self._drop(key)
 
     def invalidate_pattern(self, pattern: str) -> int:
         """
@@ -111,11 +287,25 @@ class EntityCache:
         Returns:
             Number of entries invalidated
         """
-        raise NotImplementedError("invalidate_pattern not yet implemented")
+        with self._lock:
+            magic = GLOB_MAGIC.search(pattern)
+            if magic is None:
+                keys = [pattern] if pattern in self._memory_cache else []
+            else:
+                prefix = pattern[:magic.start()]
+                candidates = self._keys.under(prefix) if prefix else self._memory_cache.keys()
+                keys = [key for key in candidates if fnmatch.fnmatchcase(key, pattern)]
+            for key in keys:
+                self._drop(key)
+            return len(keys)
 
     def clear(self) -> None:
-        """Clear all cache entries."""
-        raise NotImplementedError("clear not yet implemented")
+        """Clear all in-memory cache entries."""
+        with self._lock:
+            self._memory_cache.clear()
+            self._keys = PathTrie(separator=KEY_SEPARATOR)
+            self._expiry_heap.clear()
+            self.current_bytes = 0
 
     def get_entity(self, entity_id: UUID) -> Entity | None:
         """
@@ -127,7 +317,7 @@ class EntityCache:
         Returns:
             Cached entity if found, None otherwise
         """
-        raise NotImplementedError("get_entity not yet implemented")
+        return self.get(f"entity{KEY_SEPARATOR}{entity_id}")
 
     def set_entity(self, entity: Entity, ttl: timedelta = timedelta(hours=24)) -> None:
         """
@@ -137,25 +327,140 @@ class EntityCache:
             entity: Entity to cache
             ttl: Time-to-live for the entry
         """
-        raise NotImplementedError("set_entity not yet implemented")
+        self.set(f"entity{KEY_SEPARATOR}{entity.entity_id}", entity, ttl)
+
+    def get_stats(self) -> dict:
+        """
+        Get L1 and parse cache counters.
+
+        Returns:
+            Dict with entry count, approximate bytes, hits, misses, evictions,
+            expirations and parse cache hits and misses
+        """
+        with self._lock:
+            return {
+                "entries": len(self._memory_cache),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "parse_hits": self.parse_hits,
+                "parse_misses": self.parse_misses,
+            }
+
+    def _drop(self, key: str) -> None:
+        """Remove an L1 key (lock must be held); its heap item goes stale."""
+        entry = self._memory_cache.pop(key)
+        self._keys.remove(key)
+        self.current_bytes -= entry.size
+
+    def _reap(self, now: datetime) -> None:
+        """Drop up to REAP_BATCH expired entries (lock must be held)."""
+        heap = self._expiry_heap
+        for _ in range(REAP_BATCH):
+            if not heap or heap[0][0] >= now:
+                break
+            _expires_at, _sequence, key, entry = heapq.heappop(heap)
+            if self._memory_cache.get(key) is entry:
+                self._drop(key)
+                self.expirations += 1
+        # Stale items pile up when keys are overwritten or invalidated
+        if len(heap) > 2 * len(self._memory_cache) + REAP_BATCH:
+            live = self._memory_cache
+            self._expiry_heap = [item for item in heap if live.get(item[2]) is item[3]]
+            heapq.heapify(self._expiry_heap)
+
+    def write_index(self, entities: Iterable[Entity]) -> int:
+        """
+        Rebuild the L3 index file, atomically replacing the previous one.
+
+        Args:
+            entities: Every entity to persist
+
+        Returns:
+            Number of entities written
+        """
+        from entity_store.index_file import write_entity_index
+
+        return write_entity_index(self.index_path, entities)
+
+    def open_index(self) -> "EntityIndexFile | None":
+        """
+        Memory-map the L3 index file.
+
+        Returns:
+            The mapped index, or None if it has not been built
+
+        Raises:
+            ValueError: If the file is empty, truncated or from another
+                index format version
+        """
+        from entity_store.index_file import EntityIndexFile
+
+        try:
+            return EntityIndexFile(self.index_path)
+        except FileNotFoundError:
+            return None
+
+    def _parse_path(self, filepath: Path) -> Path:
+        """L2 file holding the parse result of a source path."""
+        digest = hashlib.sha1(str(filepath).encode("utf-8", "surrogateescape")).hexdigest()
+        return self.cache_dir / "parse" / digest[:2] / f"{digest}.bin"
 
     def get_parse_result(self, filepath: Path) -> list[Entity] | None:
         """
         Get cached parse results for a file.
 
+        The entry is valid if the file's mtime_ns and size match the ones
+        recorded; otherwise the file is hashed and the entry is still used
+        (and its stat refreshed) when the content is unchanged, e.g. after
+        a checkout that only touched mtimes. Unreadable or corrupt entries
+        count as misses.
+
         Args:
             filepath: Path to the file
 
         Returns:
             List of entities if cached, None otherwise
         """
-        raise NotImplementedError("get_parse_result not yet implemented")
+        try:
+            stat = os.stat(filepath)
+            data = self._parse_path(filepath).read_bytes()
+            magic, version, mtime_ns, size, digest, path_length = PARSE_HEADER.unpack_from(data)
+            body = PARSE_HEADER.size + path_length
+            if (
+                magic != PARSE_MAGIC
+                or version != PARSE_FORMAT_VERSION
+                or data[PARSE_HEADER.size:body].decode("utf-8", "surrogateescape")
+                != str(filepath)
+            ):
+                raise ValueError("Not a parse cache entry for this file")
+
+            if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+                content = Path(filepath).read_bytes()
+                if hashlib.sha256(content).digest() != digest:
+                    self.parse_misses += 1
+                    return None
+                data = PARSE_HEADER.pack(
+                    magic, version, stat.st_mtime_ns, len(content), digest, path_length
+                ) + data[PARSE_HEADER.size:]
+                self._write_atomic(self._parse_path(filepath), data)
+
+            entities = [_entity_from_row(row) for row in marshal.loads(data[body:])]
+        except (OSError, ValueError, EOFError, TypeError, struct.error):
+            self.parse_misses += 1
+            return None
+
+        self.parse_hits += 1
+        return entities
 
     def set_parse_result(
         self,
         filepath: Path,
         entities: list[Entity],
-        file_mtime: float,
+        file_mtime: float | None = None,
+        content: bytes | None = None,
     ) -> None:
         """
         Cache parse results for a file.
@@ -163,6 +468,39 @@ class EntityCache:
         Args:
             filepath: Path to the file
             entities: Parsed entities
-            file_mtime: File modification time for invalidation
+            file_mtime: File modification time when it was read (defaults to
+                        the current one)
+            content: The bytes that were parsed, for the content hash
+                     (read from the file if None)
         """
-        raise NotImplementedError("set_parse_result not yet implemented")
+        stat = os.stat(filepath)
+        if content is None:
+            content = Path(filepath).read_bytes()
+        # Record the exact mtime_ns unless the file changed since it was read; a
+        # rounded float mtime then just sends the next lookup to the hash check
+        if file_mtime is None or file_mtime == stat.st_mtime:
+            mtime_ns = stat.st_mtime_ns
+        else:
+            mtime_ns = int(file_mtime * 1e9)
+        path = str(filepath).encode("utf-8", "surrogateescape")
+        data = (
+            PARSE_HEADER.pack(
+                PARSE_MAGIC,
+                PARSE_FORMAT_VERSION,
+                mtime_ns,
+                len(content),
+                hashlib.sha256(content).digest(),
+                len(path),
+            )
+            + path
+            + marshal.dumps(tuple(_entity_row(entity) for entity in entities))
+        )
+        self._write_atomic(self._parse_path(filepath), data)
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        """Write a file via a temporary sibling and rename, so readers never see it torn."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
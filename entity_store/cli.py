@@ -6,8 +6,8 @@
 # entity_language: python
 # entity_state: active
 # entity_created: 2026-01-22T16:00:00Z
-# entity_exports: [cli, build_index, query, search]
-# entity_dependencies: [registry, neon_client, query]
+# entity_exports: [cli, build_index, query, search, bench_filter]
+# entity_dependencies: [registry, neon_client, query, models, cache, index_file]
 # ---
 
 """
@@ -20,14 +20,21 @@ Provides commands for:
 - Cache management
 """
 
+import json
+import struct
 from pathlib import Path
 
 import click
 from rich.console import Console
 from rich.table import Table
 
+from entity_store.models import EntityType
+
 console = Console()
 
+# Fields `query` shows unless --fields is given
+QUERY_FIELDS = ["entity_name", "entity_type_id", "entity_path", "entity_line_start"]
+
 
 @click.group()
 @click.version_option(version="0.1.0")
@@ -50,13 +57,74 @@ def cli() -> None:
     is_flag=True,
     help="Force reindex even if cache is fresh",
 )
-def build_index(path: Path, force: bool) -> None:
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=None,
+    help="Parser processes (default: available CPUs; 1 parses serially)",
+)
+def build_index(path: Path, force: bool, jobs: int | None) -> None:
     """Build or rebuild the entity index."""
-    raise NotImplementedError("build_index not yet implemented")
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TimeRemainingColumn
+
+    from entity_store import builder
+    from entity_store.cache import EntityCache
+    from entity_store.neon_client import NeonClient
+    from entity_store.registry import EntityRegistry
+
+    registry = EntityRegistry(NeonClient())
+    with Progress(
+        "[progress.description]{task.description}",
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeRemainingColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Parsing", total=None)
+        result = builder.build_index(
+            registry,
+            path,
+            jobs=jobs,
+            progress=lambda done, total: progress.update(task, completed=done, total=total),
+            cache_dir=path / ".entity-cache",
+            refresh=force,
+        )
+
+    console.print(
+        f"[green]✓[/green] Indexed {result.entities:,} entities from {result.files:,} files "
+        f"in {result.wall_seconds:.2f}s ({result.files_per_sec:.0f} files/sec, "
+        f"{result.jobs} jobs)"
+    )
+    entity_cache = EntityCache(path / ".entity-cache")
+    entity_cache.write_index(registry)
+    console.print(f"[green]✓[/green] Wrote {entity_cache.index_path}")
+    rows = [
+        {
+            "language": language,
+            "files": stats.files,
+            "entities": stats.entities,
+            "cached": stats.cached,
+            "errors": stats.errors,
+            "skipped": stats.skipped,
+            "MB": f"{stats.bytes / 2**20:.1f}",
+            "files/sec/job": f"{stats.files_per_sec:.0f}",
+        }
+        for language, stats in sorted(result.languages.items())
+    ]
+    _display_table(
+        rows,
+        ["language", "files", "entities", "cached", "errors", "skipped", "MB", "files/sec/job"],
+    )
 
 
 @cli.command()
-@click.option("--type-id", "-t", help="Filter by entity type")
+@click.option(
+    "--type-id",
+    "-t",
+    type=click.Choice([entity_type.value for entity_type in EntityType]),
+    help="Filter by entity type",
+)
 @click.option("--name", "-n", help="Filter by name pattern")
 @click.option("--path", "-p", help="Filter by path pattern")
 @click.option(
@@ -66,6 +134,13 @@ def build_index(path: Path, force: bool) -> None:
 )
 @click.option("--limit", "-l", type=int, default=100, help="Max results")
 @click.option("--json", "as_json", is_flag=True, help="Output as JSON")
+@click.option(
+    "--repo",
+    "-r",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=".",
+    help="Repository whose entity index to query",
+)
 def query(
     type_id: str | None,
     name: str | None,
@@ -73,9 +148,41 @@ def query(
     fields: str | None,
     limit: int,
     as_json: bool,
+    repo: Path,
 ) -> None:
     """Query entities with filters."""
-    raise NotImplementedError("query not yet implemented")
+    from entity_store.cache import EntityCache
+    from entity_store.index_file import ENTITY_INDEX_FIELDS
+
+    selected = [
+        field if field.startswith("entity_") else f"entity_{field}"
+        for field in (fields.split(",") if fields else QUERY_FIELDS)
+    ]
+    unknown = [field for field in selected if field not in ENTITY_INDEX_FIELDS]
+    if unknown:
+        raise click.BadParameter(f"Unknown fields: {', '.join(unknown)}", param_hint="--fields")
+
+    try:
+        index = EntityCache(repo / ".entity-cache").open_index()
+    except (ValueError, struct.error):
+        raise click.ClickException(
+            "Entity index is corrupt or outdated; run `entity-store build-index`"
+        ) from None
+    if index is None:
+        raise click.ClickException("No entity index found; run `entity-store build-index` first")
+    with index:
+        rows = index.filter(
+            type_id=EntityType(type_id) if type_id else None,
+            name_pattern=name,
+            path_pattern=path,
+            limit=limit,
+        )
+        records = [index.record(row, selected) for row in rows]
+
+    if as_json:
+        click.echo(json.dumps(records, indent=2))
+    else:
+        _display_table(records, selected)
 
 
 @cli.command()
@@ -118,6 +225,37 @@ def store_stats() -> None:
     raise NotImplementedError("store_stats not yet implemented")
 
 
+@cli.command("bench-filter")
+@click.option(
+    "--entities",
+    "-e",
+    default="100000,1000000",
+    help="Comma-separated registry sizes to benchmark",
+)
+@click.option("--repeat", "-r", type=int, default=5, help="Timed runs per query")
+def bench_filter(entities: str, repeat: int) -> None:
+    """Benchmark indexed registry filters against a linear scan."""
+    from entity_store.benchmark import benchmark_filter
+
+    for count in (int(value) for value in entities.split(",")):
+        result = benchmark_filter(count, repeat)
+        console.print(
+            f"[bold]{result['entities']:,} entities[/bold] "
+            f"(indexed in {result['build_seconds']:.2f}s)"
+        )
+        rows = [
+            {
+                "query": name,
+                "results": timing["results"],
+                "scan_ms": f"{timing['scan_ms']:.2f}",
+                "indexed_ms": f"{timing['indexed_ms']:.2f}",
+                "speedup": f"{timing['scan_ms'] / max(timing['indexed_ms'], 1e-6):.0f}x",
+            }
+            for name, timing in result["queries"].items()
+        ]
+        _display_table(rows, ["query", "results", "scan_ms", "indexed_ms", "speedup"])
+
+
 def _display_table(entities: list[dict], fields: list[str]) -> None:
     """Display entities as a Rich table."""
     table = Table(show_header=True, header_style="bold cyan")
@@ -0,0 +1,535 @@
+# ---
+# entity_id: module-index-file
+# entity_name: Entity Index File
+# entity_type_id: module
+# entity_path: entity_store/index_file.py
+# entity_language: python
+# entity_state: active
+# entity_created: 2026-10-17T12:00:00Z
+# entity_exports: [EntityIndexFile, write_entity_index, ENTITY_INDEX_FIELDS]
+# entity_dependencies: [models, indexes, cache]
+# ---
+
+"""
+Persistent L3 entity index: a memory-mapped columnar file.
+
+Layout (little-endian, every section 8-byte aligned):
+- header: magic, format version, row/string/name counts, string bytes
+- string offsets: one u64 per string (plus an end offset) into the blob
+- columns, one value per row: entity and parent IDs (16 bytes, the nil
+  UUID for no parent), u32 string IDs for state, type, path, name and
+  the other text fields (0xFFFFFFFF for None), u32 line numbers (0 for
+  None) and i64 microsecond timestamps
+- name index: row numbers sorted by name, and the distinct name IDs
+- string blob: the distinct strings, UTF-8, in sorted order
+
+Strings are sorted, so comparing string IDs compares the strings and a
+prefix maps to a contiguous ID range. Rows are sorted by (state, type,
+path, line, name): a state and type filter is a row range found by
+bisection, and within it a path prefix is a narrower range. Opening an
+index only maps the file; strings and rows are decoded when a query
+touches them.
+"""
+
+import bisect
+import fnmatch
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID
+
+from entity_store.cache import _EPOCH, _MICROSECOND, _timestamp_us
+from entity_store.indexes import GLOB_MAGIC
+from entity_store.models import Entity, EntityState, EntityType
+
+INDEX_MAGIC = b"EIDX"
+INDEX_FORMAT_VERSION = 1
+# magic, format version, reserved, rows, strings, distinct names, string bytes
+INDEX_HEADER = struct.Struct("<4sHHQQQQ")
+NO_STRING = 0xFFFFFFFF
+NIL_UUID = bytes(16)
+
+# Text fields stored as string IDs, in column order
+STRING_COLUMNS = [
+    "entity_state",
+    "entity_type_id",
+    "entity_path",
+    "entity_name",
+    "entity_language",
+    "entity_signature",
+    "entity_docstring",
+    "entity_frontmatter_signature",
+    "entity_metadata",
+]
+# Entity fields an index row can be decoded into
+ENTITY_INDEX_FIELDS = [
+    "entity_id",
+    "entity_name",
+    "entity_type_id",
+    "entity_frontmatter_signature",
+    "entity_last_updated",
+    "entity_state",
+    "entity_created",
+    "entity_path",
+    "entity_line_start",
+    "entity_line_end",
+    "entity_parent_id",
+    "entity_language",
+    "entity_signature",
+    "entity_docstring",
+    "entity_metadata",
+]
+
+
+def _sections(rows: int, strings: int, names: int) -> tuple[dict[str, tuple[int, int]], int]:
+    """
+    Compute where each section starts.
+
+    Args:
+        rows: Number of rows
+        strings: Number of distinct strings
+        names: Number of distinct names
+
+    Returns:
+        Tuple of ({section: (offset, bytes)}, offset of the string blob)
+    """
+    sizes = {"string_offsets": 8 * (strings + 1), "entity_id": 16 * rows, "parent_id": 16 * rows}
+    sizes.update({column: 4 * rows for column in STRING_COLUMNS})
+    sizes.update({"line_start": 4 * rows, "line_end": 4 * rows})
+    sizes.update({"created": 8 * rows, "last_updated": 8 * rows})
+    sizes.update({"by_name": 4 * rows, "names": 4 * names})
+
+    sections = {}
+    offset = INDEX_HEADER.size
+    for section, size in sizes.items():
+        offset += -offset % 8
+        sections[section] = (offset, size)
+        offset += size
+    return sections, offset + -offset % 8
+
+
+def _packed(typecode: str, values: Iterable[int]) -> bytes:
+    """Pack integers as a little-endian array."""
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def write_entity_index(path: Path, entities: Iterable[Entity]) -> int:
+    """
+    Write entities to an index file, atomically replacing any existing one.
+
+    The file is written next to the target and renamed over it, so readers
+    (which keep their mapping of the old file) never see a partial index.
+
+    Args:
+        path: Index file to write
+        entities: Entities to store (every state)
+
+    Returns:
+        Number of entities written
+    """
+    entities = sorted(
+        entities,
+        key=lambda e: (
+            e.entity_state.value,
+            e.entity_type_id.value,
+            e.entity_path,
+            e.entity_line_start,
+            e.entity_name,
+        ),
+    )
+    text = {
+        column: [getattr(entity, column) for entity in entities]
+        for column in STRING_COLUMNS[2:-1]
+    }
+    text["entity_state"] = [entity.entity_state.value for entity in entities]
+    text["entity_type_id"] = [entity.entity_type_id.value for entity in entities]
+    text["entity_metadata"] = [
+        json.dumps(entity.entity_metadata, sort_keys=True) if entity.entity_metadata else None
+        for entity in entities
+    ]
+    strings = sorted({value for values in text.values() for value in values if value is not None})
+    string_ids = {value: i for i, value in enumerate(strings)}
+    encoded = [value.encode("utf-8", "surrogatepass") for value in strings]
+
+    name_ids = [string_ids[name] for name in text["entity_name"]]
+    names = sorted(set(name_ids))
+    sections, blob_offset = _sections(len(entities), len(strings), len(names))
+
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    data = {
+        "string_offsets": _packed("Q", offsets),
+        "entity_id": b"".join(entity.entity_id.bytes for entity in entities),
+        "parent_id": b"".join(
+            entity.entity_parent_id.bytes if entity.entity_parent_id else NIL_UUID
+            for entity in entities
+        ),
+        "line_start": _packed("I", (entity.entity_line_start for entity in entities)),
+        "line_end": _packed("I", (entity.entity_line_end or 0 for entity in entities)),
+        "created": _packed("q", (_timestamp_us(entity.entity_created) for entity in entities)),
+        "last_updated": _packed(
+            "q", (_timestamp_us(entity.entity_last_updated) for entity in entities)
+        ),
+        "by_name": _packed("I", sorted(range(len(entities)), key=name_ids.__getitem__)),
+        "names": _packed("I", names),
+    }
+    for column, values in text.items():
+        data[column] = _packed(
+            "I", (NO_STRING if value is None else string_ids[value] for value in values)
+        )
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(
+                INDEX_HEADER.pack(
+                    INDEX_MAGIC,
+                    INDEX_FORMAT_VERSION,
+                    0,
+                    len(entities),
+                    len(strings),
+                    len(names),
+                    offsets[-1],
+                )
+            )
+            for section, (offset, _size) in sections.items():
+                f.write(bytes(offset - f.tell()))
+                f.write(data[section])
+            f.write(bytes(blob_offset - f.tell()))
+            f.writelines(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return len(entities)
+
+
+class _Strings:
+    """Sequence view of the sorted string table, for bisection."""
+
+    def __init__(self, index: "EntityIndexFile") -> None:
+        self.index = index
+
+    def __len__(self) -> int:
+        return self.index.string_count
+
+    def __getitem__(self, string_id: int) -> str:
+        return self.index.string(string_id)
+
+
+class EntityIndexFile:
+    """
+    Read-only, memory-mapped view of an index written by write_entity_index.
+
+    Usable as a context manager; close() unmaps the file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Map an index file.
+
+        Args:
+            path: Index file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is not an entity index of this version
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._casts: list[memoryview] = []
+        try:
+            magic, version, _reserved, rows, strings, names, blob_size = (
+                INDEX_HEADER.unpack_from(self._mmap)
+            )
+            if magic != INDEX_MAGIC or version != INDEX_FORMAT_VERSION:
+                raise ValueError(
+                    f"{self.path} is not a version {INDEX_FORMAT_VERSION} entity index"
+                )
+            sections, self._blob = _sections(rows, strings, names)
+            if len(self._mmap) < self._blob + blob_size:
+                raise ValueError(f"{self.path} is truncated")
+        except (ValueError, struct.error):
+            self.close()
+            raise
+
+        self.row_count = rows
+        self.string_count = strings
+        self._sections = sections
+        self._string_offsets = self._column("string_offsets", "Q")
+        self._state = self._column("entity_state", "I")
+        self._type = self._column("entity_type_id", "I")
+        self._path = self._column("entity_path", "I")
+        self._name = self._column("entity_name", "I")
+        self._by_name = self._column("by_name", "I")
+        self._names = self._column("names", "I")
+        self._decoded: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def __enter__(self) -> "EntityIndexFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the column views and unmap the file."""
+        for view in self._casts:
+            view.release()
+        self._casts.clear()
+        self._view.release()
+        self._mmap.close()
+
+    def _column(self, section: str, typecode: str) -> memoryview | array:
+        """Typed view of a section (a copy on big-endian hosts)."""
+        offset, size = self._sections[section]
+        raw = self._view[offset:offset + size]
+        if sys.byteorder == "big":
+            column = array(typecode, raw)
+            column.byteswap()
+            return column
+        column = raw.cast(typecode)
+        self._casts.extend((raw, column))
+        return column
+
+    def string(self, string_id: int) -> str | None:
+        """Decode a string by ID (None for NO_STRING)."""
+        if string_id == NO_STRING:
+            return None
+        value = self._decoded.get(string_id)
+        if value is None:
+            start = self._blob + self._string_offsets[string_id]
+            end = self._blob + self._string_offsets[string_id + 1]
+            value = str(self._view[start:end], "utf-8", "surrogatepass")
+            self._decoded[string_id] = value
+        return value
+
+    def find_string(self, value: str) -> int | None:
+        """ID of a string, or None if the index does not contain it."""
+        string_id = bisect.bisect_left(_Strings(self), value)
+        if string_id < self.string_count and self.string(string_id) == value:
+            return string_id
+        return None
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """Half-open range of the IDs of strings starting with prefix."""
+        strings = _Strings(self)
+        start = bisect.bisect_left(strings, prefix)
+        end = bisect.bisect_left(strings, prefix + "\U0010ffff", lo=start)
+        # Strings can continue past U+10FFFF in UTF-8 order only with more U+10FFFF
+        while end < self.string_count and self.string(end).startswith(prefix):
+            end += 1
+        return start, end
+
+    def filter(
+        self,
+        type_id: EntityType | None = None,
+        name_pattern: str | None = None,
+        path_pattern: str | None = None,
+        state: EntityState = EntityState.ACTIVE,
+        limit: int | None = None,
+    ) -> list[int]:
+        """
+        Find the rows matching every criterion (EntityRegistry.filter semantics).
+
+        Args:
+            type_id: Filter by entity type
+            name_pattern: Filter by name pattern (glob)
+            path_pattern: Filter by path pattern (glob)
+            state: Filter by state (default: active)
+            limit: Stop after this many rows
+
+        Returns:
+            Matching row numbers in (type, path, line) order
+        """
+        blocks = self._blocks(state, type_id)
+        if path_pattern and path_pattern.strip("*"):
+            path_matches = self._matcher(path_pattern)
+            blocks = [self._narrow(block, path_pattern) for block in blocks]
+        else:
+            path_matches = None
+
+        # Walk the blocks, unless the rows with matching names are fewer
+        rows = None
+        name_ids = None
+        if name_pattern and name_pattern.strip("*"):
+            name_ids = set(self._name_ids(name_pattern))
+            name_ranges = [self._name_rows(name_id) for name_id in name_ids]
+            if sum(end - start for start, end in name_ranges) < sum(e - s for s, e in blocks):
+                rows = self._rows_by_name(name_ranges, blocks)
+        if rows is None:
+            rows = (row for start, end in blocks for row in range(start, end))
+
+        found = []
+        for row in rows:
+            if name_ids is not None and self._name[row] not in name_ids:
+                continue
+            if path_matches is not None and not path_matches(self._path[row]):
+                continue
+            found.append(row)
+            if len(found) == limit:
+                break
+        return found
+
+    def _blocks(self, state: EntityState, type_id: EntityType | None) -> list[tuple[int, int]]:
+        """Row ranges with the given state, one per entity type."""
+        state_id = self.find_string(state.value)
+        if state_id is None:
+            return []
+        rows = range(self.row_count)
+        start = bisect.bisect_left(rows, state_id, key=self._state.__getitem__)
+        end = bisect.bisect_right(rows, state_id, lo=start, key=self._state.__getitem__)
+        if type_id is not None:
+            type_string_id = self.find_string(type_id.value)
+            if type_string_id is None:
+                return []
+            key = self._type.__getitem__
+            start = bisect.bisect_left(rows, type_string_id, lo=start, hi=end, key=key)
+            end = bisect.bisect_right(rows, type_string_id, lo=start, hi=end, key=key)
+            return [(start, end)] if start < end else []
+
+        blocks = []
+        while start < end:
+            block_end = bisect.bisect_right(
+                rows, self._type[start], lo=start, hi=end, key=self._type.__getitem__
+            )
+            blocks.append((start, block_end))
+            start = block_end
+        return blocks
+
+    def _narrow(self, block: tuple[int, int], pattern: str) -> tuple[int, int]:
+        """Shrink a (state, type) block to the rows whose path has the pattern's literal prefix."""
+        magic = GLOB_MAGIC.search(pattern)
+        prefix = pattern if magic is None else pattern[:magic.start()]
+        if not prefix:
+            return block
+        first, last = self.prefix_range(prefix)
+        rows = range(self.row_count)
+        start = bisect.bisect_left(rows, first, *block, key=self._path.__getitem__)
+        end = bisect.bisect_left(rows, last, start, block[1], key=self._path.__getitem__)
+        return start, end
+
+    def _matcher(self, pattern: str):
+        """Predicate on string IDs for a glob, memoized per ID."""
+        matches: dict[int, bool] = {}
+
+        def match(string_id: int) -> bool:
+            matched = matches.get(string_id)
+            if matched is None:
+                matched = matches[string_id] = fnmatch.fnmatch(self.string(string_id), pattern)
+            return matched
+
+        return match
+
+    def _name_ids(self, pattern: str) -> list[int]:
+        """Distinct name IDs matching a glob, narrowed by its literal prefix."""
+        magic = GLOB_MAGIC.search(pattern)
+        if magic is None:
+            name_id = self.find_string(pattern)
+            return [name_id] if name_id is not None else []
+
+        names = self._names
+        first, last = self.prefix_range(pattern[:magic.start()])
+        start = bisect.bisect_left(names, first)
+        end = bisect.bisect_left(names, last, lo=start)
+        return [
+            name_id
+            for name_id in names[start:end]
+            if fnmatch.fnmatch(self.string(name_id), pattern)
+        ]
+
+    def _name_rows(self, name_id: int) -> tuple[int, int]:
+        """Range of the name index holding the rows with a name."""
+        positions = range(self.row_count)
+
+        def key(position: int) -> int:
+            return self._name[self._by_name[position]]
+
+        start = bisect.bisect_left(positions, name_id, key=key)
+        return start, bisect.bisect_right(positions, name_id, lo=start, key=key)
+
+    def _rows_by_name(
+        self, name_ranges: list[tuple[int, int]], blocks: list[tuple[int, int]]
+    ) -> list[int]:
+        """Rows with the given names that fall in one of the blocks, in row order."""
+        rows = sorted(
+            self._by_name[position]
+            for start, end in name_ranges
+            for position in range(start, end)
+        )
+        return [row for row in rows if any(start <= row < end for start, end in blocks)]
+
+    def record(self, row: int, fields: Iterable[str] = ENTITY_INDEX_FIELDS) -> dict:
+        """
+        Decode selected fields of a row into JSON-compatible values.
+
+        Args:
+            row: Row number
+            fields: Entity fields to decode
+
+        Returns:
+            Dict of field -> value (UUIDs and timestamps as strings)
+        """
+        record = {}
+        for field in fields:
+            value = self._value(row, field)
+            if isinstance(value, UUID):
+                value = str(value)
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, (EntityState, EntityType)):
+                value = value.value
+            record[field] = value
+        return record
+
+    def entity(self, row: int) -> Entity:
+        """Decode a row into an Entity (without re-validating it)."""
+        return Entity.model_construct(
+            **{field: self._value(row, field) for field in ENTITY_INDEX_FIELDS}
+        )
+
+    def entities(self, rows: Iterable[int]) -> Iterator[Entity]:
+        """Decode rows into entities."""
+        return (self.entity(row) for row in rows)
+
+    def _value(self, row: int, field: str):
+        """Decode one field of a row."""
+        if field in ("entity_id", "entity_parent_id"):
+            offset, _size = self._sections["entity_id" if field == "entity_id" else "parent_id"]
+            raw = bytes(self._view[offset + 16 * row:offset + 16 * (row + 1)])
+            return None if raw == NIL_UUID else UUID(bytes=raw)
+        if field in ("entity_line_start", "entity_line_end"):
+            offset, _size = self._sections[field.removeprefix("entity_")]
+            return struct.unpack_from("<I", self._view, offset + 4 * row)[0] or None
+        if field in ("entity_created", "entity_last_updated"):
+            offset, _size = self._sections[field.removeprefix("entity_")]
+            return _EPOCH + struct.unpack_from("<q", self._view, offset + 8 * row)[0] * _MICROSECOND
+        if field not in STRING_COLUMNS:
+            raise ValueError(f"Unknown entity field: {field}")
+
+        offset, _size = self._sections[field]
+        value = self.string(struct.unpack_from("<I", self._view, offset + 4 * row)[0])
+        if field == "entity_state":
+            return EntityState(value)
+        if field == "entity_type_id":
+            return EntityType(value)
+        if field == "entity_metadata":
+            return json.loads(value) if value else {}
+        return value
@@ -0,0 +1,267 @@
+# ---
+# entity_id: module-indexes
+# entity_name: Entity Secondary Indexes
+# entity_type_id: module
+# entity_path: entity_store/indexes.py
+# entity_language: python
+# entity_state: active
+# entity_created: 2026-10-17T09:00:00Z
+# entity_exports: [EntityIndexes, PathTrie]
+# entity_dependencies: [models]
+# ---
+
+"""
+Secondary indexes over registry entities.
+
+EntityRegistry keeps these in step with its entity dict so filter() can
+intersect small candidate sets instead of scanning every entity:
+- type and state: entity IDs per value
+- path: entity IDs per file, plus a directory trie for glob prefixes
+- name: entity IDs per exact name, plus a trigram index over distinct
+  names for glob and substring patterns
+
+Glob semantics are those of fnmatch: every candidate found through an
+index is still checked with fnmatch, so indexes only narrow the search.
+"""
+
+import fnmatch
+import re
+from collections import defaultdict
+from collections.abc import Iterator
+
+from entity_store.models import Entity, EntityState, EntityType
+
+GLOB_MAGIC = re.compile(r"[*?\[]")
+# Bracket expressions such as [abc], [!a-z] or []] (fnmatch syntax)
+GLOB_SPECIAL = re.compile(r"\*|\?|\[!?\]?[^\]]*\]")
+
+
+def trigrams(text: str) -> set[str]:
+    """All three-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _TrieNode:
+    """One directory: the files directly in it and its subdirectories."""
+
+    __slots__ = ("children", "paths")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.paths: set[str] = set()
+
+
+class PathTrie:
+    """Directory prefix trie over file paths ("/"-separated by default)."""
+
+    def __init__(self, separator: str = "/") -> None:
+        """
+        Initialize an empty trie.
+
+        Args:
+            separator: Character splitting paths into directories
+        """
+        self.separator = separator
+        self.root = _TrieNode()
+
+    def add(self, path: str) -> None:
+        """Insert a file path."""
+        node = self.root
+        for part in path.split(self.separator)[:-1]:
+            node = node.children.setdefault(part, _TrieNode())
+        node.paths.add(path)
+
+    def remove(self, path: str) -> None:
+        """Remove a file path, pruning directories left empty."""
+        nodes = [self.root]
+        parts = path.split(self.separator)[:-1]
+        for part in parts:
+            child = nodes[-1].children.get(part)
+            if child is None:
+                return
+            nodes.append(child)
+
+        nodes[-1].paths.discard(path)
+        for parent, part, node in zip(reversed(nodes[:-1]), reversed(parts), reversed(nodes[1:])):
+            if node.paths or node.children:
+                break
+            del parent.children[part]
+
+    def under(self, prefix: str) -> Iterator[str]:
+        """
+        Yield every path starting with prefix.
+
+        Args:
+            prefix: Path prefix; may end inside a directory or file name
+
+        Yields:
+            Matching paths
+        """
+        *directories, partial = prefix.split(self.separator)
+        node = self.root
+        for part in directories:
+            node = node.children.get(part)
+            if node is None:
+                return
+
+        yield from (path for path in node.paths if path.startswith(prefix))
+        stack = [child for name, child in node.children.items() if name.startswith(partial)]
+        while stack:
+            node = stack.pop()
+            yield from node.paths
+            stack.extend(node.children.values())
+
+
+class EntityIndexes:
+    """
+    Secondary indexes from entity attributes to entity IDs.
+
+    Also records insertion order, so candidates come back in the order the
+    registry's entity dict would yield them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty indexes."""
+        self.by_type: dict[EntityType, set[str]] = defaultdict(set)
+        self.by_state: dict[EntityState, set[str]] = defaultdict(set)
+        self.by_path: dict[str, set[str]] = {}
+        self.by_name: dict[str, set[str]] = {}
+        self.name_trigrams: dict[str, set[str]] = defaultdict(set)
+        self.paths = PathTrie()
+        # entity_id -> (type, state, path, name) as indexed, for removal
+        self._keys: dict[str, tuple[EntityType, EntityState, str, str]] = {}
+        self._order: dict[str, int] = {}
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, entity_id: str, entity: Entity) -> None:
+        """
+        Index an entity, replacing any earlier version with the same ID.
+
+        Args:
+            entity_id: String ID the registry stores the entity under
+            entity: Entity to index
+        """
+        keys = (entity.entity_type_id, entity.entity_state, entity.entity_path, entity.entity_name)
+        if self._keys.get(entity_id) == keys:
+            return
+        if entity_id in self._keys:
+            self._unindex(entity_id)
+        else:
+            self._order[entity_id] = self._next
+            self._next += 1
+
+        type_id, state, path, name = keys
+        self._keys[entity_id] = keys
+        self.by_type[type_id].add(entity_id)
+        self.by_state[state].add(entity_id)
+        if path not in self.by_path:
+            self.by_path[path] = set()
+            self.paths.add(path)
+        self.by_path[path].add(entity_id)
+        if name not in self.by_name:
+            self.by_name[name] = set()
+            for gram in trigrams(name):
+                self.name_trigrams[gram].add(name)
+        self.by_name[name].add(entity_id)
+
+    def remove(self, entity_id: str) -> None:
+        """Drop an entity from every index (no-op if not indexed)."""
+        if entity_id in self._keys:
+            self._unindex(entity_id)
+            del self._order[entity_id]
+
+    def _unindex(self, entity_id: str) -> None:
+        """Remove an entity's keys, keeping its insertion order."""
+        type_id, state, path, name = self._keys.pop(entity_id)
+        _discard(self.by_type, type_id, entity_id)
+        _discard(self.by_state, state, entity_id)
+        if _discard(self.by_path, path, entity_id):
+            self.paths.remove(path)
+        if _discard(self.by_name, name, entity_id):
+            for gram in trigrams(name):
+                _discard(self.name_trigrams, gram, name)
+
+    def candidates(
+        self,
+        type_id: EntityType | None,
+        name_pattern: str | None,
+        path_pattern: str | None,
+        state: EntityState,
+    ) -> set[str]:
+        """
+        Find the IDs of entities matching every given criterion.
+
+        Each criterion resolves to a set of IDs through its index; the sets
+        are intersected smallest first.
+
+        Args:
+            type_id: Entity type, or None for any
+            name_pattern: fnmatch pattern for names, or None for any
+            path_pattern: fnmatch pattern for paths, or None for any
+            state: Entity state
+
+        Returns:
+            Matching entity IDs
+        """
+        sets = [self.by_state.get(state, set())]
+        if type_id is not None:
+            sets.append(self.by_type.get(type_id, set()))
+        if name_pattern and not _matches_all(name_pattern):
+            sets.append(_union(self.by_name, self._match_names(name_pattern)))
+        if path_pattern and not _matches_all(path_pattern):
+            sets.append(_union(self.by_path, self._match_paths(path_pattern)))
+
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def in_order(self, entity_ids: set[str]) -> list[str]:
+        """Sort indexed entity IDs by insertion order."""
+        return sorted(entity_ids, key=self._order.__getitem__)
+
+    def _match_names(self, pattern: str) -> list[str]:
+        """Distinct names matching a glob, narrowed by trigrams of its literal runs."""
+        if not GLOB_MAGIC.search(pattern):
+            return [pattern] if pattern in self.by_name else []
+
+        grams = set().union(*(trigrams(run) for run in GLOB_SPECIAL.split(pattern)))
+        if grams:
+            postings = sorted((self.name_trigrams.get(gram, set()) for gram in grams), key=len)
+            names = postings[0].intersection(*postings[1:])
+        else:
+            names = self.by_name.keys()
+        return [name for name in names if fnmatch.fnmatch(name, pattern)]
+
+    def _match_paths(self, pattern: str) -> list[str]:
+        """Distinct paths matching a glob, narrowed by the trie to its literal prefix."""
+        magic = GLOB_MAGIC.search(pattern)
+        if magic is None:
+            return [pattern] if pattern in self.by_path else []
+
+        prefix = pattern[:magic.start()]
+        paths = self.paths.under(prefix) if prefix else self.by_path.keys()
+        return [path for path in paths if fnmatch.fnmatch(path, pattern)]
+
+
+def _discard(index: dict, key, value) -> bool:
+    """Remove value from index[key], dropping the key once empty; True if dropped."""
+    members = index.get(key)
+    if members is None:
+        return False
+    members.discard(value)
+    if members:
+        return False
+    del index[key]
+    return True
+
+
+def _union(index: dict[str, set[str]], keys: list[str]) -> set[str]:
+    """Union of the ID sets stored under keys."""
+    return set().union(*(index[key] for key in keys))
+
+
+def _matches_all(pattern: str) -> bool:
+    """Whether a glob matches every string (only "*" characters)."""
+    return not pattern.strip("*")
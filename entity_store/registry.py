@@ -7,7 +7,7 @@
 # entity_state: active
 # entity_created: 2026-01-22T16:00:00Z
 # entity_exports: [EntityRegistry]
-# entity_dependencies: [models, neon_client, parsers, frontmatter]
+# entity_dependencies: [models, neon_client, parsers, frontmatter, indexes]
 # ---
 
 """
@@ -21,6 +21,7 @@ Provides the main interface for:
 - Locking/unlocking entities for multi-agent collaboration
 """
 
+from collections.abc import Iterator
 from datetime import UTC, datetime
 from pathlib import Path
 from uuid import UUID
@@ -31,6 +32,7 @@ from entity_store.frontmatter import (
     generate_frontmatter,
     parse_frontmatter,
 )
+from entity_store.indexes import EntityIndexes
 from entity_store.models import Entity, EntityState, EntityType
 from entity_store.neon_client import NeonClient
 
@@ -41,6 +43,8 @@ class EntityRegistry:
 
     Coordinates between AST parsers and Neon PostgreSQL storage.
     Provides in-memory entity storage with frontmatter-based persistence.
+    Secondary indexes (type, state, path, name) are updated on every
+    write, so filter() never scans the whole registry.
     """
 
     def __init__(self, client: NeonClient) -> None:
@@ -48,8 +52,16 @@ class EntityRegistry:
         self.client = client
         self._parser_cache: dict[str, object] = {}
         self._entities: dict[str, Entity] = {}
+        self._indexes = EntityIndexes()
         self._locks: dict[str, dict[str, str | datetime]] = {}
 
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __iter__(self) -> Iterator[Entity]:
+        """Iterate over all entities (any state) in registration order."""
+        return iter(self._entities.values())
+
     def parse_file(self, filepath: Path) -> list[Entity]:
         """
         Parse a file and extract entities.
@@ -84,8 +96,25 @@ class EntityRegistry:
         """
         entity_id = str(entity.entity_id)
         self._entities[entity_id] = entity
+        self._indexes.add(entity_id, entity)
         return entity.entity_id
 
+    def register_many(self, entities: list[Entity]) -> int:
+        """
+        Register a batch of entities (e.g. one build_index batch).
+
+        Args:
+            entities: Entities to register
+
+        Returns:
+            Number of entities registered
+        """
+        for entity in entities:
+            entity_id = str(entity.entity_id)
+            self._entities[entity_id] = entity
+            self._indexes.add(entity_id, entity)
+        return len(entities)
+
     def get(self, entity_id: UUID) -> Entity | None:
         """
         Get an entity by ID.
@@ -109,6 +138,10 @@ class EntityRegistry:
         """
         Filter entities by criteria.
 
+        Each criterion is answered from its secondary index (globs are
+        narrowed by the path trie or name trigrams, then checked with
+        fnmatch) and the resulting ID sets are intersected smallest first.
+
         Args:
             type_id: Filter by entity type
             name_pattern: Filter by name pattern (glob)
@@ -118,29 +151,13 @@ class EntityRegistry:
         Returns:
             List of matching entities
         """
-        import fnmatch
-
-        results = []
-        for entity in self._entities.values():
-            # Filter by state
-            if entity.entity_state != state:
-                continue
-
-            # Filter by type
-            if type_id is not None and entity.entity_type_id != type_id:
-                continue
-
-            # Filter by name pattern
-            if name_pattern and not fnmatch.fnmatch(entity.entity_name, name_pattern):
-                continue
-
-            # Filter by path pattern
-            if path_pattern and not fnmatch.fnmatch(entity.entity_path, path_pattern):
-                continue
-
-            results.append(entity)
-
-        return results
+        entity_ids = self._indexes.candidates(type_id, name_pattern, path_pattern, state)
+        # One ordered pass beats sorting once results are a sizeable share
+        if len(entity_ids) * 8 > len(self._entities):
+            return [
+                entity for entity_id, entity in self._entities.items() if entity_id in entity_ids
+            ]
+        return [self._entities[entity_id] for entity_id in self._indexes.in_order(entity_ids)]
 
     def update(self, entity_id: UUID, **fields) -> Entity:
         """
@@ -171,6 +188,7 @@ class EntityRegistry:
         # Create updated entity
         updated_entity = Entity(**entity_data)
         self._entities[entity_id_str] = updated_entity
+        self._indexes.add(entity_id_str, updated_entity)
 
         return updated_entity
 
@@ -193,6 +211,7 @@ class EntityRegistry:
         entity_id_str = str(entity_id)
         if entity_id_str in self._entities:
             del self._entities[entity_id_str]
+            self._indexes.remove(entity_id_str)
         if entity_id_str in self._locks:
             del self._locks[entity_id_str]
 
@@ -293,6 +312,7 @@ class EntityRegistry:
         """
         entity_id = str(entity.entity_id)
         self._entities[entity_id] = entity
+        self._indexes.add(entity_id, entity)
 
         # Write frontmatter to file if entity has a path
         if entity.entity_path:
@@ -372,6 +392,7 @@ class EntityRegistry:
         # Create updated entity
         updated_entity = Entity(**entity_data)
         self._entities[entity_id] = updated_entity
+        self._indexes.add(entity_id, updated_entity)
 
         # Update frontmatter in file if entity has a path
         if updated_entity.entity_path:
@@ -454,6 +475,7 @@ class EntityRegistry:
             return False
 
         del self._entities[entity_id]
+        self._indexes.remove(entity_id)
 
         # Also remove any lock on this entity
         if entity_id in self._locks:
@@ -40,3 +40,113 @@ def test_chunk_preserves_overlap():
     # Check that consecutive chunks share some content
     if len(chunks) > 1:
         assert chunks[0].content[-10:] in chunks[1].content[:20]
+
+
+def test_chunk_ids_are_deterministic():
+    """Test that re-chunking the same content yields the same IDs."""
+    content = "word " * 100
+    chunker = MarkdownChunker(chunk_size=50, overlap=10)
+
+    first = [chunk.chunk_id for chunk in chunker.chunk(content, source="test.md")]
+    second = [chunk.chunk_id for chunk in chunker.chunk(content, source="test.md")]
+
+    assert first == second
+    assert len(set(first)) == len(first)
+
+
+def test_chunk_ids_depend_on_source_and_content():
+    """Test that IDs change with the source path or chunk content."""
+    chunker = MarkdownChunker(chunk_size=100, overlap=0)
+
+    base = chunker.chunk("same text", source="a.md")[0].chunk_id
+    other_source = chunker.chunk("same text", source="b.md")[0].chunk_id
+    other_content = chunker.chunk("different text", source="a.md")[0].chunk_id
+
+    assert base != other_source
+    assert base != other_content
+
+
+STRUCTURED_DOC = """# Guide
+
+Intro paragraph.
+
+## Install
+
+```bash
+# comment, not a heading
+pip install thing
+```
+
+## Usage
+
+Usage paragraph.
+"""
+
+
+def test_structure_mode_splits_on_headings():
+    """Test that structure mode starts chunks at section boundaries."""
+    chunker = MarkdownChunker(chunk_size=60, mode="structure")
+    chunks = chunker.chunk(STRUCTURED_DOC, source="test.md")
+
+    assert "".join(chunk.content for chunk in chunks) == STRUCTURED_DOC
+    assert chunks[1].content.startswith("## Install")
+    assert chunks[1].metadata["heading_path"] == ["Guide", "Install"]
+    assert chunks[-1].metadata["heading_path"] == ["Guide", "Usage"]
+
+
+def test_structure_mode_never_splits_code_fences():
+    """Test that an oversized fenced block stays in one chunk."""
+    content = "# Code\n\n```python\n" + "x = 1\n" * 50 + "```\n\nAfter.\n"
+    chunker = MarkdownChunker(chunk_size=50, mode="structure")
+    chunks = chunker.chunk(content, source="test.md")
+
+    fenced = [chunk for chunk in chunks if "```python" in chunk.content]
+    assert len(fenced) == 1
+    assert fenced[0].content.rstrip().endswith("```")
+
+
+def test_structure_mode_packs_small_sections():
+    """Test that small sections are packed into one chunk."""
+    chunker = MarkdownChunker(chunk_size=1000, mode="structure")
+    chunks = chunker.chunk(STRUCTURED_DOC, source="test.md")
+
+    assert len(chunks) == 1
+    assert chunks[0].metadata["heading_path"] == ["Guide"]
+
+
+def test_chunk_stream_matches_chunk():
+    """Test that streaming yields the same chunks while reading a window at a time."""
+    import io
+
+    content = "# Title\n\n" + "streamed words and more words\n" * 200
+
+    class SpyReader(io.StringIO):
+        def __init__(self, text):
+            super().__init__(text)
+            self.largest_read = 0
+
+        def read(self, size=-1):
+            self.largest_read = max(self.largest_read, size)
+            return super().read(size)
+
+    chunker = MarkdownChunker(chunk_size=100, overlap=20)
+    reader = SpyReader(content)
+    streamed = list(chunker.chunk_stream(reader, source="big.md"))
+
+    assert [(c.chunk_id, c.start_pos, c.end_pos) for c in streamed] == [
+        (c.chunk_id, c.start_pos, c.end_pos) for c in chunker.chunk(content, source="big.md")
+    ]
+    assert 0 < reader.largest_read <= 100
+
+
+def test_chunk_stream_falls_back_for_structure_mode():
+    """Test that modes needing the whole document still stream correct chunks."""
+    import io
+
+    content = "# A\n\nalpha\n\n# B\n\nbeta\n"
+    chunker = MarkdownChunker(chunk_size=100, overlap=20, mode="structure")
+
+    assert not chunker.streams
+    assert [c.content for c in chunker.chunk_stream(io.StringIO(content), "a.md")] == [
+        c.content for c in chunker.chunk(content, "a.md")
+    ]
@@ -1,7 +1,19 @@
 # tests/test_doc_cache.py
+import json
+import threading
+import time
+
 import pytest
 
-from doc_index.cache import EmbeddingCache
+from doc_index.cache import (
+    BINARY_MAGIC,
+    AsyncEmbeddingCache,
+    EmbeddingCache,
+    LRUCache,
+    QueryResultCache,
+    decode_embedding,
+    encode_embedding,
+)
 
 
 @pytest.fixture
@@ -18,7 +30,8 @@ def test_cache_embedding(cache):
     cache.set(text, embedding)
     result = cache.get(text)
 
-    assert result == embedding
+    # Stored as float32
+    assert result == pytest.approx(embedding)
 
 
 def test_cache_miss(cache):
@@ -47,3 +60,167 @@ def test_cache_clear(cache):
 
     assert cache.get("text1") is None
     assert cache.get("text2") is None
+
+
+def test_cache_clear_incremental_resumes(cache):
+    """Test that an interrupted clear resumes from its cursor."""
+    cache.clear()
+    texts = [f"text{i}" for i in range(50)]
+    cache.set_many(texts, [[0.1]] * len(texts))
+    progress = []
+
+    cursor, deleted = cache.clear_incremental(
+        scan_count=10, max_steps=1, progress=lambda n, c: progress.append(n)
+    )
+    while cursor:
+        cursor, more = cache.clear_incremental(cursor, scan_count=10)
+        deleted += more
+
+    assert deleted == len(texts)
+    assert progress == [progress[0]]
+    assert cache.get_many(texts) == [None] * len(texts)
+
+
+def test_generational_clear():
+    """Test that a generational clear hides old entries from every process."""
+    writer = EmbeddingCache(namespace="test-gen", generational=True)
+    reader = EmbeddingCache(namespace="test-gen", generational=True, generation_refresh=0)
+    writer.set("text", [0.1])
+    assert reader.get("text") == pytest.approx([0.1])
+
+    writer.clear()
+
+    assert writer.get("text") is None
+    assert reader.get("text") is None
+    writer.clear_incremental()
+
+
+def test_cache_get_many_set_many(cache):
+    """Test batch lookups return hits and misses in input order."""
+    cache.set_many(["text1", "text2"], [[0.5, 0.25], [1.0]])
+
+    results = cache.get_many(["text2", "missing", "text1"])
+
+    assert results == [[1.0], None, [0.5, 0.25]]
+
+
+def test_cache_reads_legacy_json(cache):
+    """Test that legacy JSON entries are read and upgraded to binary."""
+    key = cache._key("legacy")
+    cache.client.setex(key, cache.ttl, json.dumps([0.5, 0.25]))
+
+    assert cache.get("legacy") == [0.5, 0.25]
+    assert cache.client.get(key).startswith(BINARY_MAGIC)
+
+
+@pytest.mark.asyncio
+async def test_async_cache_shares_entries_with_sync_cache(cache):
+    """Test that the async cache reads and clears what the sync cache wrote."""
+    async_cache = AsyncEmbeddingCache(namespace="test")
+    cache.set_many(["text1", "text2"], [[0.5, 0.25], [1.0]])
+
+    try:
+        assert await async_cache.get_many(["text2", "missing", "text1"]) == [
+            [1.0], None, [0.5, 0.25]
+        ]
+        await async_cache.set("text3", [0.75])
+        assert cache.get("text3") == [0.75]
+
+        await async_cache.clear()
+        assert await async_cache.get("text1") is None
+    finally:
+        await async_cache.aclose()
+
+
+def test_embedding_encoding_is_packed_float32():
+    """Test that 768-dim vectors encode to about 3KB."""
+    embedding = [0.1] * 768
+
+    value = encode_embedding(embedding)
+
+    assert len(value) == len(BINARY_MAGIC) + 768 * 4
+    assert decode_embedding(value) == pytest.approx(embedding)
+    assert decode_embedding(json.dumps([0.5]).encode()) == [0.5]
+
+
+def test_local_tier_serves_repeated_gets(cache):
+    """Test that repeated lookups are answered by the in-process tier."""
+    cache.set("query", [0.5] * 768)
+    cache.local.clear()
+
+    cache.get("query")
+    cache.get("query")
+
+    stats = cache.get_stats()
+    assert stats["redis_hits"] == 1
+    assert stats["local_hits"] == 1
+
+
+def test_invalidate_drops_local_entry(cache):
+    """Test that invalidation reaches the in-process tier."""
+    cache.set("text1", [0.1])
+    cache.invalidate("text1")
+
+    assert cache.local.get(cache._key("text1")) is None
+    assert cache.get("text1") is None
+
+
+def test_lru_evicts_by_bytes():
+    """Test that the LRU keeps total size under its bound."""
+    lru = LRUCache(max_bytes=100)
+    lru.put("a", b"x" * 40, 40)
+    lru.put("b", b"x" * 40, 40)
+    lru.get("a")  # a is now most recently used
+    lru.put("c", b"x" * 40, 40)
+
+    assert lru.get("b") is None
+    assert lru.get("a") is not None
+    assert lru.current_bytes == 80
+    assert lru.evictions == 1
+
+
+def test_query_cache_hits_until_version_changes():
+    """Test that cached results are keyed by normalized query and index version."""
+    query_cache = QueryResultCache(max_bytes=10_000)
+    results = [{"chunk_id": "c0", "score": 0.9}]
+    query_cache.put(query_cache.key("Install  Guide", 1, top_k=5), results)
+
+    hit = query_cache.get(query_cache.key("install guide", 1, top_k=5))
+    assert hit == results and hit[0] is not results[0]
+    assert query_cache.get(query_cache.key("install guide", 1, top_k=10)) is None
+    assert query_cache.get(query_cache.key("install guide", 2, top_k=5)) is None
+
+    stats = query_cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+
+def test_query_cache_counters_under_concurrent_lookups():
+    """Test that hit/miss counters add up when lookups run from several threads."""
+    query_cache = QueryResultCache()
+    query_cache.put("hit", [])
+
+    def lookup():
+        for _ in range(2000):
+            query_cache.get("hit")
+            query_cache.get("miss")
+
+    threads = [threading.Thread(target=lookup) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = query_cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (8000, 8000)
+
+
+def test_query_cache_expires(monkeypatch):
+    """Test that cached results expire after the TTL."""
+    query_cache = QueryResultCache(ttl=10.0)
+    key = query_cache.key("q", 0)
+    query_cache.put(key, [])
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+    assert query_cache.get(key) is None
@@ -1,5 +1,10 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
-from doc_index.embedder import AnthropicEmbedder
+from doc_index.embedder import AnthropicEmbedder, OllamaEmbedder
 
 
 @pytest.mark.skip("Requires API key")
@@ -35,3 +40,121 @@ def test_cache_key_generation():
 
     assert key1 == key2
     assert key1 != key3
+
+
+class StubOllama:
+    """Local HTTP stub of the Ollama embeddings endpoint."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections = set()
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so clients can reuse connections
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.connections.add(self.client_address)
+                    stub.prompts.append(payload["prompt"])
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                time.sleep(stub.delay)
+                with stub._lock:
+                    stub.in_flight -= 1
+
+                body = json.dumps({"embedding": [float(len(payload["prompt"])), 1.0]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_ollama():
+    """Run a stub Ollama server for the test."""
+    stub = StubOllama(delay=0.02)
+    yield stub
+    stub.close()
+
+
+def test_ollama_embed_batch_preserves_order_and_dedupes(stub_ollama):
+    """Test that duplicate texts are sent once and results keep input order."""
+    embedder = OllamaEmbedder(base_url=stub_ollama.url, use_cache=False)
+    texts = ["a", "bbb", "a", "cc", "bbb"]
+
+    results = embedder.embed_batch(texts)
+
+    assert [r[0] for r in results] == [1.0, 3.0, 1.0, 2.0, 3.0]
+    assert sorted(stub_ollama.prompts) == ["a", "bbb", "cc"]
+
+
+def test_ollama_embed_batch_bounds_concurrency(stub_ollama):
+    """Test that requests run concurrently but within the limit."""
+    embedder = OllamaEmbedder(base_url=stub_ollama.url, concurrency=4, use_cache=False)
+
+    embedder.embed_batch([f"text {i}" for i in range(20)])
+
+    assert 1 < stub_ollama.max_in_flight <= 4
+    stats = embedder.get_stats()
+    assert stats["texts_embedded"] == 20
+    assert stats["texts_per_sec"] > 0
+
+
+def test_ollama_embed_batch_inside_running_loop(stub_ollama):
+    """Test that the sync API works from code already running an event loop."""
+    import asyncio
+
+    embedder = OllamaEmbedder(base_url=stub_ollama.url, use_cache=False)
+
+    async def caller():
+        return embedder.embed_batch(["a", "bb"])
+
+    assert [r[0] for r in asyncio.run(caller())] == [1.0, 2.0]
+
+
+def test_ollama_reuses_connections_across_batches(stub_ollama):
+    """Test that sync batches share one client instead of reconnecting each time."""
+    embedder = OllamaEmbedder(base_url=stub_ollama.url, concurrency=1, use_cache=False)
+
+    for i in range(5):
+        embedder.embed_batch([f"text {i}"])
+    embedder.close()
+
+    assert len(stub_ollama.prompts) == 5
+    assert len(stub_ollama.connections) == 1
+
+
+def test_ollama_counters_under_concurrent_batches(stub_ollama):
+    """Test that throughput counters add up when batches run from several threads."""
+    # One request per thread at a time stays within the stub server's listen backlog
+    embedder = OllamaEmbedder(base_url=stub_ollama.url, concurrency=1, use_cache=False)
+    threads = [
+        threading.Thread(target=embedder.embed_batch, args=([f"t{i}-{j}" for j in range(5)],))
+        for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert embedder.get_stats()["texts_embedded"] == 20
@@ -23,8 +23,9 @@ Test coverage:
 - Cache operations
 """
 
+from datetime import timedelta
 from pathlib import Path
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
 
@@ -400,16 +401,248 @@ class MyClass:
             filepath.unlink()
 
 
+    def test_filter_indexes_follow_updates(self) -> None:
+        """Test that name/path/state filters see updates, archives and deletes."""
+        from entity_store.neon_client import NeonClient
+        from entity_store.registry import EntityRegistry
+
+        registry = EntityRegistry(NeonClient())
+        entity = Entity(
+            entity_name="load_config",
+            entity_type_id=EntityType.FUNCTION,
+            entity_path="pkg/io/config.py",
+            entity_line_start=1,
+        )
+        entity_id = registry.register(entity)
+
+        registry.update(entity_id, entity_name="read_settings", entity_path="pkg/conf/settings.py")
+        assert registry.filter(name_pattern="*config*") == []
+        assert registry.filter(path_pattern="pkg/io/*") == []
+        assert [e.entity_name for e in registry.filter(name_pattern="*settings")] == [
+            "read_settings"
+        ]
+        assert len(registry.filter(path_pattern="pkg/conf/*")) == 1
+
+        registry.archive(entity_id)
+        assert registry.filter(name_pattern="read_settings") == []
+        assert len(registry.filter(name_pattern="read_settings", state=EntityState.ARCHIVED)) == 1
+
+        registry.delete(entity_id)
+        assert registry.filter(state=EntityState.ARCHIVED) == []
+        assert registry._indexes.paths.root.children == {}
+
+    def test_filter_matches_linear_scan(self) -> None:
+        """Test that index-backed filters return what a full fnmatch scan does, in order."""
+        from entity_store.benchmark import scan_filter, synthetic_entities
+        from entity_store.neon_client import NeonClient
+        from entity_store.registry import EntityRegistry
+
+        entities = synthetic_entities(3000)
+        registry = EntityRegistry(NeonClient())
+        for entity in entities:
+            registry.register(entity)
+        deleted = {entity.entity_id for entity in entities[::7]}
+        for entity_id in deleted:
+            registry.delete(entity_id)
+        entities = [e for e in entities if e.entity_id not in deleted]
+
+        cases = [
+            {"type_id": EntityType.METHOD},
+            {"name_pattern": "parse_user_0"},
+            {"name_pattern": "*ser*"},
+            {"name_pattern": "[gs]et_*_1?"},
+            {"name_pattern": "?oad*", "type_id": EntityType.CLASS},
+            {"path_pattern": "pkg0/mod0/file_1*.py"},
+            {"path_pattern": "pkg0/mod0/file_12.py"},
+            {"path_pattern": "*/file_3?.py"},
+            {"path_pattern": "pkg0/mod0/file_1[0-4].py", "name_pattern": "*_config_*"},
+            {"state": EntityState.ARCHIVED},
+            {"name_pattern": "*", "path_pattern": "*"},
+        ]
+        for kwargs in cases:
+            expected = [e.entity_id for e in scan_filter(entities, **kwargs)]
+            assert [e.entity_id for e in registry.filter(**kwargs)] == expected, kwargs
+
+
+class TestBuildIndex:
+    """Tests for whole-repository index builds."""
+
+    @staticmethod
+    def _make_repo(root: Path) -> None:
+        (root / ".gitignore").write_text("build/\n*_generated.py\n")
+        for package in ("app", "lib", "build"):
+            (root / package).mkdir()
+            for i in range(5):
+                (root / package / f"mod{i}.py").write_text(
+                    f"class Model{i}:\n    def run(self):\n        pass\n\n\ndef helper{i}():\n"
+                    "    pass\n"
+                )
+        (root / "app" / "schema_generated.py").write_text("class Generated:\n    pass\n")
+        (root / "lib" / "broken.py").write_text("def broken(:\n")
+        (root / "lib" / ".gitignore").write_text("!keep_generated.py\n")
+        (root / "lib" / "keep_generated.py").write_text("def kept():\n    pass\n")
+
+    def test_discover_files_honors_gitignore(self, tmp_path: Path) -> None:
+        """Test that ignored directories and files are skipped, negations re-included."""
+        from entity_store.builder import discover_files
+
+        self._make_repo(tmp_path)
+        relpaths = {path.relative_to(tmp_path).as_posix() for path in discover_files(tmp_path)}
+
+        assert not any(relpath.startswith("build/") for relpath in relpaths)
+        assert "app/schema_generated.py" not in relpaths
+        assert "lib/keep_generated.py" in relpaths
+        assert len(relpaths) == 12
+
+    def test_parallel_build_matches_serial(self, tmp_path: Path) -> None:
+        """Test that a process-pool build registers the same entities as a serial one."""
+        from entity_store.builder import build_index
+        from entity_store.neon_client import NeonClient
+        from entity_store.registry import EntityRegistry
+
+        self._make_repo(tmp_path)
+        results = []
+        for jobs in (1, 2):
+            registry = EntityRegistry(NeonClient())
+            result = build_index(registry, tmp_path, jobs=jobs, batch_size=3)
+            names = [(e.entity_path, e.entity_name) for e in registry.filter()]
+            results.append((result, names))
+
+        (serial, serial_names), (parallel, parallel_names) = results
+        assert serial_names == parallel_names
+        assert serial.entities == parallel.entities == 31
+        assert parallel.languages["python"].files == 12
+        assert parallel.languages["python"].errors == 1
+        assert len(registry.filter(name_pattern="run", type_id=EntityType.METHOD)) == 10
+
+    def test_entity_paths_are_repo_relative(self, tmp_path: Path, monkeypatch) -> None:
+        """Test that stored paths don't depend on how the root was spelled."""
+        import os
+
+        from entity_store.builder import build_index
+        from entity_store.neon_client import NeonClient
+        from entity_store.registry import EntityRegistry
+
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        self._make_repo(repo)
+        (tmp_path / "elsewhere").mkdir()
+        monkeypatch.chdir(tmp_path / "elsewhere")
+
+        paths = []
+        for root in (repo.resolve(), Path(os.path.relpath(repo))):
+            registry = EntityRegistry(NeonClient())
+            build_index(registry, root, jobs=1)
+            paths.append(sorted({entity.entity_path for entity in registry}))
+
+        assert paths[0] == paths[1]
+        assert "app/mod0.py" in paths[0]
+        assert all(not path.startswith(("/", ".")) for path in paths[0])
+
+    def test_warm_build_uses_parse_cache(self, tmp_path: Path) -> None:
+        """Test that a rebuild of an unchanged tree is served from the parse cache."""
+        from entity_store.builder import build_index
+        from entity_store.neon_client import NeonClient
+        from entity_store.registry import EntityRegistry
+
+        self._make_repo(tmp_path)
+        cache_dir = tmp_path / ".entity-cache"
+        build_index(EntityRegistry(NeonClient()), tmp_path, jobs=1, cache_dir=cache_dir)
+        (tmp_path / "app" / "mod0.py").write_text("def replaced():\n    pass\n")
+
+        registry = EntityRegistry(NeonClient())
+        result = build_index(registry, tmp_path, jobs=1, cache_dir=cache_dir)
+
+        # Everything but the edited file and the one that fails to parse
+        assert result.languages["python"].cached == 10
+        assert result.entities == 29
+        assert registry.filter(name_pattern="replaced")
+
+
 class TestEntityQuery:
     """Tests for GraphQL-like query interface."""
 
-    def test_query_with_type_filter(self) -> None:
+    @staticmethod
+    def _query(repo: Path, *args: str) -> list[dict]:
+        """Run `entity-store query --json` against a repository's index."""
+        import json
+
+        from click.testing import CliRunner
+
+        from entity_store.cli import query
+
+        result = CliRunner().invoke(query, ["--repo", str(repo), "--json", *args])
+        assert result.exit_code == 0, result.output
+        return json.loads(result.output)
+
+    @staticmethod
+    def _index_repo(root: Path) -> None:
+        from entity_store.cache import EntityCache
+
+        entities = [
+            Entity(
+                entity_name=name,
+                entity_type_id=type_id,
+                entity_path=path,
+                entity_line_start=line,
+                entity_signature=f"def {name}()" if type_id != EntityType.CLASS else None,
+            )
+            for name, type_id, path, line in [
+                ("Parser", EntityType.CLASS, "app/parser.py", 1),
+                ("parse", EntityType.METHOD, "app/parser.py", 5),
+                ("Lexer", EntityType.CLASS, "app/lexer.py", 1),
+                ("main", EntityType.FUNCTION, "cli.py", 3),
+            ]
+        ]
+        EntityCache(root / ".entity-cache").write_index(entities)
+
+    def test_query_with_type_filter(self, tmp_path: Path) -> None:
         """Test querying with type filter."""
-        pytest.skip("Query not yet implemented")
-
-    def test_query_with_field_projection(self) -> None:
+        self._index_repo(tmp_path)
+
+        classes = self._query(tmp_path, "--type-id", "class")
+        assert [r["entity_name"] for r in classes] == ["Lexer", "Parser"]
+        assert self._query(tmp_path, "-t", "class", "--path", "app/p*")[0]["entity_line_start"] == 1
+        assert self._query(tmp_path, "--name", "*arse*", "--limit", "1") == [
+            {
+                "entity_name": "Parser",
+                "entity_type_id": "class",
+                "entity_path": "app/parser.py",
+                "entity_line_start": 1,
+            }
+        ]
+
+    def test_query_with_field_projection(self, tmp_path: Path) -> None:
         """Test querying with field projection."""
-        pytest.skip("Query not yet implemented")
+        from click.testing import CliRunner
+
+        from entity_store.cli import query
+
+        self._index_repo(tmp_path)
+
+        rows = self._query(tmp_path, "--name", "main", "--fields", "name,signature,line_end")
+        assert rows == [
+            {"entity_name": "main", "entity_signature": "def main()", "entity_line_end": None}
+        ]
+        assert CliRunner().invoke(query, ["--repo", str(tmp_path), "-f", "bogus"]).exit_code == 2
+        # No index built yet
+        (tmp_path / "empty").mkdir()
+        assert CliRunner().invoke(query, ["--repo", str(tmp_path / "empty")]).exit_code == 1
+
+    def test_query_with_corrupt_index(self, tmp_path: Path) -> None:
+        """Test that a truncated or empty index asks for a rebuild."""
+        from click.testing import CliRunner
+
+        from entity_store.cli import query
+
+        self._index_repo(tmp_path)
+        index_path = tmp_path / ".entity-cache" / "entities.idx"
+
+        for data in (index_path.read_bytes()[:40], b""):
+            index_path.write_bytes(data)
+            result = CliRunner().invoke(query, ["--repo", str(tmp_path)])
+            assert result.exit_code == 1
+            assert "corrupt or outdated" in result.output
 
     def test_search_full_text(self) -> None:
         """Test full-text search."""
@@ -421,12 +654,200 @@ class TestEntityCache:
 
     def test_cache_set_get(self) -> None:
         """Test basic cache set and get."""
-        pytest.skip("Cache not yet implemented")
+        from entity_store.cache import EntityCache
+
+        cache = EntityCache()
+        entity = Entity(
+            entity_name="Model",
+            entity_type_id=EntityType.CLASS,
+            entity_path="app/models.py",
+            entity_line_start=1,
+        )
+
+        assert cache.get("query:classes") is None
+        cache.set("query:classes", ["Model"])
+        cache.set_entity(entity)
+
+        assert cache.get("query:classes") == ["Model"]
+        assert cache.get_entity(entity.entity_id) is entity
+        assert cache.get_entity(uuid4()) is None
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 2, 2)
 
     def test_cache_expiration(self) -> None:
         """Test cache entry expiration."""
-        pytest.skip("Cache not yet implemented")
+        from entity_store.cache import REAP_BATCH, EntityCache
+
+        cache = EntityCache()
+        cache.set("query:expired", 1, ttl=timedelta(seconds=-1))
+        cache.set("query:fresh", 2)
+
+        assert cache.get("query:expired") is None
+        assert cache.get("query:fresh") == 2
+
+        # Expired entries that are never looked up are reaped a batch per set
+        for i in range(2 * REAP_BATCH):
+            cache.set(f"query:stale-{i}", i, ttl=timedelta(seconds=-1))
+        cache.set("query:other", 3)
+        assert len(cache) <= REAP_BATCH + 2
+        assert cache.get_stats()["expirations"] >= REAP_BATCH + 1
 
     def test_cache_invalidation(self) -> None:
         """Test cache invalidation."""
-        pytest.skip("Cache not yet implemented")
+        from entity_store.cache import EntityCache
+
+        cache = EntityCache()
+        for key in ["entity:a1", "entity:a2", "entity:b1", "query:a1", "query:type:class"]:
+            cache.set(key, key)
+
+        cache.invalidate("entity:b1")
+        assert cache.get("entity:b1") is None
+        assert cache.invalidate_pattern("entity:a*") == 2
+        assert cache.invalidate_pattern("*:a1") == 1
+        assert cache.invalidate_pattern("query:type:class") == 1
+        assert cache.invalidate_pattern("entity:*") == 0
+        assert len(cache) == 0 and cache.current_bytes == 0
+
+    def test_cache_lru_eviction(self) -> None:
+        """Test that the least recently used entries go past the count and byte bounds."""
+        from entity_store.cache import EntityCache
+
+        cache = EntityCache(max_entries=3)
+        for key in "abc":
+            cache.set(f"query:{key}", key)
+        cache.get("query:a")
+        cache.set("query:d", "d")
+
+        assert cache.get("query:b") is None
+        assert [cache.get(f"query:{key}") for key in "acd"] == ["a", "c", "d"]
+        assert cache.evictions == 1
+
+        cache = EntityCache(max_bytes=10_000)
+        for i in range(10):
+            cache.set(f"blob:{i}", "x" * 2_000)
+        assert cache.current_bytes <= 10_000
+        assert cache.get("blob:9") is not None and cache.get("blob:0") is None
+        cache.set("blob:huge", "x" * 20_000)
+        assert cache.get("blob:huge") is None
+
+    def test_parse_result_round_trip(self, tmp_path: Path) -> None:
+        """Test that cached parse results come back equal to the parsed entities."""
+        from entity_store.cache import EntityCache
+        from entity_store.parsers.python_parser import PythonParser
+
+        source = tmp_path / "module.py"
+        source.write_text(
+            'class Model:\n    """Doc."""\n\n    def run(self, x: int) -> str:\n        pass\n'
+        )
+        entities = PythonParser().parse_file(source)
+        cache = EntityCache(tmp_path / ".entity-cache")
+
+        assert cache.get_parse_result(source) is None
+        cache.set_parse_result(source, entities)
+        cached = cache.get_parse_result(source)
+
+        assert [e.model_dump() for e in cached] == [e.model_dump() for e in entities]
+        assert (cache.parse_hits, cache.parse_misses) == (1, 1)
+
+    def test_parse_result_validation(self, tmp_path: Path) -> None:
+        """Test that touched files still hit, edited files miss and corrupt entries are misses."""
+        import os
+
+        from entity_store.cache import EntityCache
+        from entity_store.parsers.python_parser import PythonParser
+
+        source = tmp_path / "module.py"
+        source.write_text("def first():\n    pass\n")
+        cache = EntityCache(tmp_path / ".entity-cache")
+        cache.set_parse_result(source, PythonParser().parse_file(source))
+
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+        assert [e.entity_name for e in cache.get_parse_result(source)] == ["first"]
+
+        source.write_text("def second():\n    pass\n")
+        assert cache.get_parse_result(source) is None
+
+        cache.set_parse_result(source, PythonParser().parse_file(source))
+        entry = cache._parse_path(source)
+        entry.write_bytes(entry.read_bytes()[:-7])
+        assert cache.get_parse_result(source) is None
+
+
+class TestEntityIndexFile:
+    """Tests for the memory-mapped L3 entity index."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test that every entity field survives a write and read."""
+        from entity_store.index_file import EntityIndexFile, write_entity_index
+
+        parent = Entity(
+            entity_name="Model",
+            entity_type_id=EntityType.CLASS,
+            entity_path="app/models.py",
+            entity_line_start=1,
+            entity_line_end=40,
+            entity_docstring="Doc with ünïcode.",
+            entity_metadata={"bases": ["Base"], "decorators": []},
+        )
+        child = Entity(
+            entity_name="save",
+            entity_type_id=EntityType.METHOD,
+            entity_state=EntityState.ARCHIVED,
+            entity_path="app/models.py",
+            entity_line_start=10,
+            entity_parent_id=parent.entity_id,
+            entity_signature="def save(self) -> None",
+        )
+        assert write_entity_index(tmp_path / "entities.idx", [child, parent]) == 2
+
+        with EntityIndexFile(tmp_path / "entities.idx") as index:
+            assert len(index) == 2
+            decoded = {e.entity_id: e for e in index.entities(range(len(index)))}
+        assert decoded[parent.entity_id].model_dump() == parent.model_dump()
+        assert decoded[child.entity_id].model_dump() == child.model_dump()
+
+    def test_filter_matches_registry(self, tmp_path: Path) -> None:
+        """Test that index filters find the same entities as the registry."""
+        from entity_store.benchmark import FILTER_QUERIES, synthetic_entities
+        from entity_store.index_file import EntityIndexFile, write_entity_index
+        from entity_store.neon_client import NeonClient
+        from entity_store.registry import EntityRegistry
+
+        entities = synthetic_entities(5_000)
+        registry = EntityRegistry(NeonClient())
+        registry.register_many(entities)
+        write_entity_index(tmp_path / "entities.idx", registry)
+
+        queries = FILTER_QUERIES + [
+            ("name prefix", {"name_pattern": "parse_*"}),
+            ("path glob", {"path_pattern": "*/file_12.py", "name_pattern": "get_*"}),
+            ("missing", {"name_pattern": "nothing"}),
+        ]
+        with EntityIndexFile(tmp_path / "entities.idx") as index:
+            for _name, kwargs in queries:
+                rows = index.filter(**kwargs)
+                expected = {e.entity_id for e in registry.filter(**kwargs)}
+                assert {index.entity(row).entity_id for row in rows} == expected
+                assert index.filter(**kwargs, limit=3) == rows[:3]
+
+    def test_rebuild_swaps_atomically(self, tmp_path: Path) -> None:
+        """Test that a rebuild leaves open readers on the old file and rejects bad files."""
+        from entity_store.benchmark import synthetic_entities
+        from entity_store.index_file import EntityIndexFile, write_entity_index
+
+        path = tmp_path / "entities.idx"
+        write_entity_index(path, synthetic_entities(100))
+        with EntityIndexFile(path) as old:
+            write_entity_index(path, synthetic_entities(10))
+            assert len(old) == 100 and len(old.filter(name_pattern="get_*")) == 10
+            with EntityIndexFile(path) as new:
+                assert len(new) == 10
+        assert list(tmp_path.iterdir()) == [path]
+
+        path.write_bytes(path.read_bytes()[:-1])
+        with pytest.raises(ValueError):
+            EntityIndexFile(path)
+        path.write_bytes(b"not an index" * 10)
+        with pytest.raises(ValueError):
+            EntityIndexFile(path)
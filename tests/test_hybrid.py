@@ -0,0 +1,75 @@
+import pytest
+
+from doc_index.hybrid import BM25Index, reciprocal_rank_fusion, snippet, tokenize
+from doc_index.vector_store import escape_tag, fuse_rankings
+
+
+def test_tokenize_keeps_identifiers():
+    """Test that identifiers survive tokenization intact."""
+    assert tokenize("Call get_stats() on DocumentIndexer") == [
+        "call", "get_stats", "on", "documentindexer"
+    ]
+
+
+def test_rrf_rewards_agreement():
+    """Test that items ranked by both lists beat items ranked by one."""
+    fused = reciprocal_rank_fusion([["a", "b"], ["b", "c"]], k=60)
+
+    assert [item for item, _score in fused] == ["b", "a", "c"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+
+
+def test_rrf_weights():
+    """Test that a heavier list decides ties between its items and others."""
+    fused = reciprocal_rank_fusion([["a"], ["b"]], weights=[1.0, 2.0])
+
+    assert [item for item, _score in fused] == ["b", "a"]
+
+
+def test_bm25_prefers_rare_terms():
+    """Test BM25 scoring of rare vs. common terms and deleted slots."""
+    index = BM25Index([
+        "the indexer stores chunks",
+        "the embedder calls get_stats",
+        None,
+        "the the the",
+    ])
+
+    scores = index.scores("get_stats the")
+
+    assert scores.argmax() == 1
+    assert scores[2] == 0.0
+
+
+def test_fuse_rankings_reports_leg_ranks():
+    """Test fused rows carry each leg's rank."""
+    text = [{"chunk_id": "a", "content": "A"}]
+    vector = [{"chunk_id": "b", "content": "B"}, {"chunk_id": "a", "content": "A"}]
+
+    rows = fuse_rankings(text, vector, top_k=5)
+
+    assert [row["chunk_id"] for row in rows] == ["a", "b"]
+    assert rows[0]["text_rank"] == 1 and rows[0]["vector_rank"] == 2
+    assert rows[1]["text_rank"] is None
+
+
+def test_escape_tag():
+    """Test escaping path punctuation for TAG queries."""
+    assert escape_tag("docs/api-v2.md") == "docs\\/api\\-v2\\.md"
+
+
+def test_snippet_centers_best_match():
+    """Test that the snippet window covers the densest run of query terms."""
+    text = "intro " * 100 + "call get_stats to read throughput " + "tail " * 100
+
+    result = snippet(text, "get_stats throughput", width=60)
+
+    assert "get_stats to read throughput" in result
+    assert result.startswith("...") and result.endswith("...")
+    assert len(result) <= 66
+
+
+def test_snippet_without_match_uses_start():
+    """Test snippets of short texts and texts without matching terms."""
+    assert snippet("short text", "missing") == "short text"
+    assert snippet("alpha beta gamma delta", "missing", width=12) == "alpha beta..."
@@ -45,6 +45,17 @@ def test_search_indexed_docs(temp_docs):
     assert "source" in results[0]
 
 
+def test_search_many(temp_docs):
+    """Test batched search returns one result list per query."""
+    indexer = DocumentIndexer(index_name="test_search_many")
+    indexer.index_directory(temp_docs)
+
+    results = indexer.search_many(["doc 1 content", "doc 2 content"], top_k=3)
+
+    assert len(results) == 2
+    assert all(len(rows) > 0 for rows in results)
+
+
 def test_get_stats():
     """Test getting indexer stats."""
     indexer = DocumentIndexer(index_name="test_stats")
@@ -53,3 +64,17 @@ def test_get_stats():
     assert "total_chunks" in stats
     assert "total_docs" in stats
     assert isinstance(stats["total_chunks"], int)
+
+
+def test_local_store_has_its_own_manifest(temp_docs, tmp_path, monkeypatch):
+    """Test that a dragonfly run does not make a later local run skip every file."""
+    monkeypatch.chdir(tmp_path)
+    DocumentIndexer(index_name="test_backends", chunk_size=100).index_directory(temp_docs)
+
+    local = DocumentIndexer(index_name="test_backends", chunk_size=100, store_backend="local")
+    count = local.index_directory(temp_docs)
+
+    assert count > 0
+    assert local.manifest.path == local.vector_store.path / "manifest.json"
+    assert local.get_stats()["total_chunks"] == count
+    assert local.search("doc 1 content", top_k=3)
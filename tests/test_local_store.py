@@ -0,0 +1,278 @@
+import json
+
+import numpy as np
+import pytest
+
+from doc_index.chunker import DocumentChunk
+from doc_index.local_store import LocalVectorStore
+from doc_index.vector_store import VectorIndexConfig
+
+
+def make_chunk(chunk_id: str, source: str = "test.md") -> DocumentChunk:
+    return DocumentChunk(
+        chunk_id=chunk_id,
+        source=source,
+        content=f"Content of {chunk_id}",
+        start_pos=0,
+        end_pos=10,
+    )
+
+
+@pytest.fixture(params=["FLAT", "HNSW"])
+def store(request, tmp_path):
+    """Create an empty local store for each index type."""
+    store = LocalVectorStore(
+        index_name="test_docs",
+        path=tmp_path / "index",
+        index_config=VectorIndexConfig(index_type=request.param),
+    )
+    store.create_index(dimension=4)
+    return store
+
+
+def one_hot(i: int, dim: int = 4) -> list[float]:
+    vector = [0.0] * dim
+    vector[i] = 1.0
+    return vector
+
+
+def test_search_ranks_by_cosine(store):
+    """Test that search returns nearest chunks first, independent of scale."""
+    store.add_chunks(
+        [make_chunk(f"c{i}") for i in range(4)],
+        [[10.0 * x for x in one_hot(i)] for i in range(4)],
+    )
+
+    results = store.search([0.1, 0.9, 0.0, 0.0], top_k=2)
+
+    assert [r["chunk_id"] for r in results] == ["c1", "c0"]
+    assert results[0]["score"] < results[1]["score"]
+    assert results[0]["content"] == "Content of c1"
+
+
+def test_search_many_matches_search(store):
+    """Test that batched search returns per-query results in order."""
+    store.add_chunks([make_chunk(f"c{i}") for i in range(4)], [one_hot(i) for i in range(4)])
+    queries = [one_hot(2), one_hot(0), [1.0, 1.0, 0.0, 0.0]]
+
+    results = store.search_many(queries, top_k=2)
+
+    assert [rows[0]["chunk_id"] for rows in results] == ["c2", "c0", results[2][0]["chunk_id"]]
+    assert results == [store.search(query, top_k=2) for query in queries]
+    # Rows for the same chunk share one content object
+    shared = [row for rows in results for row in rows if row["chunk_id"] == "c0"]
+    assert len(shared) == 2 and shared[0]["content"] is shared[1]["content"]
+
+
+def test_add_replaces_existing_id(store):
+    """Test that re-adding a chunk ID overwrites it instead of duplicating."""
+    store.add_chunk(make_chunk("c0"), one_hot(0))
+    store.add_chunk(make_chunk("c0", source="moved.md"), one_hot(1))
+
+    results = store.search(one_hot(1), top_k=5)
+
+    assert len(results) == 1
+    assert results[0]["source"] == "moved.md"
+
+
+def test_delete_and_garbage_collect(store):
+    """Test deleting chunks keeps the remaining ones searchable."""
+    store.add_chunks([make_chunk(f"c{i}") for i in range(4)], [one_hot(i) for i in range(4)])
+
+    assert store.delete_chunks(["c0", "missing"]) == 1
+    assert store.collect_garbage({"c1", "c3"}) == 1
+
+    results = store.search(one_hot(3), top_k=5)
+    assert {r["chunk_id"] for r in results} == {"c1", "c3"}
+    assert results[0]["chunk_id"] == "c3"
+
+
+def test_index_version_bumps_on_writes(store):
+    """Test that adds and deletes change the index version."""
+    versions = [store.index_version()]
+    store.add_chunks([make_chunk("c0")], [one_hot(0)])
+    versions.append(store.index_version())
+    store.delete_chunks(["c0"])
+    versions.append(store.index_version())
+
+    assert len(set(versions)) == 3
+
+
+def test_stats_persist_across_instances(store):
+    """Test that saved stats survive a reload and are removed with the index."""
+    store.save_stats({"docs": 2, "chunks": 5})
+
+    assert LocalVectorStore(path=store.path).load_stats() == {"docs": 2, "chunks": 5}
+    store.delete_index()
+    assert store.load_stats() == {}
+
+
+def test_save_and_reload_memory_mapped(store):
+    """Test that a saved index reloads memory-mapped and stays writable."""
+    store.add_chunks([make_chunk(f"c{i}") for i in range(3)], [one_hot(i) for i in range(3)])
+    store.save()
+
+    reloaded = LocalVectorStore(
+        index_name="test_docs", path=store.path, index_config=store.index_config
+    )
+    assert isinstance(reloaded._vectors, np.memmap)
+    assert reloaded.search(one_hot(2), top_k=1)[0]["chunk_id"] == "c2"
+
+    reloaded.delete_chunks(["c2"])
+    reloaded.add_chunk(make_chunk("c3"), one_hot(3))
+    reloaded.save()
+
+    again = LocalVectorStore(
+        index_name="test_docs", path=store.path, index_config=store.index_config
+    )
+    assert again.search(one_hot(3), top_k=1)[0]["chunk_id"] == "c3"
+    assert len(list(store.path.glob("vectors-*.npy"))) == 1
+
+
+def test_content_is_read_from_its_own_file(store):
+    """Test that saved content stays out of meta.json and is mapped on reload."""
+    store.add_chunks([make_chunk("c0"), make_chunk("c1")], [one_hot(0), one_hot(1)])
+    store.save()
+    assert "Content of" not in (store.path / "meta.json").read_text()
+
+    reloaded = LocalVectorStore(path=store.path, index_config=store.index_config)
+    assert reloaded.fetch(["c1"], fields=("content",)) == [
+        {"chunk_id": "c1", "content": "Content of c1"}
+    ]
+    assert reloaded.search_hybrid("c0", one_hot(0), top_k=1)[0]["content"] == "Content of c0"
+
+
+def test_unchanged_index_is_not_rewritten(store):
+    """Test that save() writes nothing until the index changes."""
+    store.add_chunks([make_chunk("c0")], [one_hot(0)])
+    store.save()
+    files = sorted(path.name for path in store.path.iterdir())
+    meta_mtime = (store.path / "meta.json").stat().st_mtime_ns
+
+    reloaded = LocalVectorStore(path=store.path, index_config=store.index_config)
+    reloaded.save()
+    reloaded.delete_chunks(["gone"])
+    reloaded.save()
+    assert sorted(path.name for path in store.path.iterdir()) == files
+    assert (store.path / "meta.json").stat().st_mtime_ns == meta_mtime
+
+    reloaded.delete_chunks(["c0"])
+    reloaded.save()
+    assert sorted(path.name for path in store.path.iterdir()) != files
+
+
+def test_version_1_index_loads(tmp_path):
+    """Test that an index saved with content inline in meta.json still loads."""
+    path = tmp_path / "index"
+    path.mkdir()
+    np.save(path / "vectors-old.npy", np.array([one_hot(0)], dtype=np.float32))
+    row = {
+        "chunk_id": "c0", "source": "test.md", "content": "Old content",
+        "start_pos": 0, "end_pos": 11, "heading_path": "",
+    }
+    (path / "meta.json").write_text(json.dumps({
+        "version": 1, "index_name": "docs", "dimension": 4, "vectors": "vectors-old.npy",
+        "graph": None, "rows": [row],
+    }))
+
+    store = LocalVectorStore(path=path)
+    assert store.search(one_hot(0), top_k=1)[0]["content"] == "Old content"
+
+    store.add_chunk(make_chunk("c1"), one_hot(1))
+    store.save()
+    assert LocalVectorStore(path=path).fetch(["c0"], fields=("content",))[0]["content"] == (
+        "Old content"
+    )
+
+
+def test_dimension_mismatch(store):
+    """Test that embeddings must match the index dimension."""
+    with pytest.raises(ValueError):
+        store.add_chunk(make_chunk("c0"), [1.0, 0.0])
+    with pytest.raises(ValueError):
+        store.create_index(dimension=8)
+
+
+def test_hnsw_recall_against_flat(tmp_path):
+    """Test that HNSW finds nearly the same neighbors as exact search."""
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((500, 16)).astype(np.float32)
+    queries = rng.standard_normal((20, 16)).astype(np.float32)
+    chunks = [make_chunk(f"c{i}") for i in range(len(embeddings))]
+
+    flat = LocalVectorStore(path=tmp_path / "flat")
+    hnsw = LocalVectorStore(
+        path=tmp_path / "hnsw",
+        index_config=VectorIndexConfig(index_type="HNSW", m=8, ef_construction=64, ef_runtime=64),
+    )
+    flat.add_chunks(chunks, embeddings)
+    hnsw.add_chunks(chunks, embeddings)
+
+    hits = 0
+    for query in queries:
+        expected = {r["chunk_id"] for r in flat.search(query, top_k=10)}
+        hits += len(expected & {r["chunk_id"] for r in hnsw.search(query, top_k=10)})
+
+    assert hits / (10 * len(queries)) >= 0.9
+
+
+def test_unknown_index_type():
+    """Test that only FLAT and HNSW are accepted."""
+    with pytest.raises(ValueError):
+        VectorIndexConfig(index_type="IVF")
+
+
+def test_memory_footprint(store):
+    """Test that the store reports the bytes held by its vectors."""
+    store.add_chunks([make_chunk(f"c{i}") for i in range(3)], [one_hot(i) for i in range(3)])
+
+    footprint = store.memory_footprint()
+
+    assert footprint["num_docs"] == 3
+    assert footprint["vector_bytes"] == 3 * 4 * 4
+
+
+def test_quantized_vectors_rejected(tmp_path):
+    """Test that reduced precision is left to the Redis backend."""
+    with pytest.raises(ValueError):
+        LocalVectorStore(path=tmp_path, index_config=VectorIndexConfig(vector_type="INT8"))
+
+
+def test_source_prefix_filter(store):
+    """Test that a source prefix limits results before ranking."""
+    store.add_chunks(
+        [make_chunk("c0", "docs/a.md"), make_chunk("c1", "guides/b.md")],
+        [one_hot(0), one_hot(1)],
+    )
+
+    results = store.search(one_hot(1), top_k=5, source_prefix="docs/")
+
+    assert [r["chunk_id"] for r in results] == ["c0"]
+
+
+def test_hybrid_search_finds_keywords(store):
+    """Test that hybrid search surfaces an exact identifier match."""
+    chunks = [make_chunk(f"c{i}", f"docs/{i}.md") for i in range(4)]
+    chunks[3].content = "Call get_stats to read throughput"
+    store.add_chunks(chunks, [one_hot(i) for i in range(4)])
+
+    results = store.search_hybrid("get_stats", one_hot(0), top_k=2)
+
+    assert {r["chunk_id"] for r in results} == {"c0", "c3"}
+    assert next(r for r in results if r["chunk_id"] == "c3")["text_rank"] == 1
+
+    filtered = store.search_hybrid("get_stats", one_hot(0), top_k=2, source_prefix="docs/3")
+    assert [r["chunk_id"] for r in filtered] == ["c3"]
+
+
+def test_search_field_projection(store):
+    """Test ID-only search and fetching selected fields afterwards."""
+    store.add_chunks([make_chunk("c0", "docs/a.md")], [one_hot(0)])
+
+    results = store.search(one_hot(0), top_k=1, fields=())
+
+    assert set(results[0]) == {"chunk_id", "score"}
+    assert store.fetch(["c0", "gone"], fields=("source",)) == [
+        {"chunk_id": "c0", "source": "docs/a.md"},
+        None,
+    ]
@@ -0,0 +1,141 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from doc_index.manifest import IndexManifest, file_digest
+
+
+@pytest.fixture
+def temp_docs():
+    """Create temporary doc files and a manifest path."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        docs = tmpdir / "docs"
+        docs.mkdir()
+        (docs / "doc1.md").write_text("# Doc 1\n\nContent for doc 1.")
+        (docs / "doc2.md").write_text("# Doc 2\n\nContent for doc 2.")
+        yield docs, tmpdir / "manifest.json"
+
+
+def _record_all(manifest, docs):
+    for path in docs.glob("*.md"):
+        stat = path.stat()
+        manifest.record(
+            path, file_digest(path), [f"{path.stem}-0"], stat.st_mtime_ns, stat.st_size
+        )
+    manifest.save()
+
+
+def test_new_files_are_added(temp_docs):
+    """Test that files missing from the manifest are reported as added."""
+    docs, manifest_path = temp_docs
+    manifest = IndexManifest(manifest_path)
+
+    diff = manifest.diff(sorted(docs.glob("*.md")), docs)
+
+    assert len(diff.added) == 2
+    assert diff.updated == diff.unchanged == diff.removed == []
+
+
+def test_unchanged_files_are_skipped(temp_docs):
+    """Test that a reloaded manifest skips files that did not change."""
+    docs, manifest_path = temp_docs
+    _record_all(IndexManifest(manifest_path), docs)
+
+    diff = IndexManifest(manifest_path).diff(sorted(docs.glob("*.md")), docs)
+
+    assert len(diff.unchanged) == 2
+    assert diff.to_index == []
+
+
+def test_touched_file_with_same_content_is_unchanged(temp_docs):
+    """Test that an mtime change alone does not trigger re-indexing."""
+    docs, manifest_path = temp_docs
+    manifest = IndexManifest(manifest_path)
+    _record_all(manifest, docs)
+
+    stat = (docs / "doc1.md").stat()
+    os.utime(docs / "doc1.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    diff = manifest.diff(sorted(docs.glob("*.md")), docs)
+    assert len(diff.unchanged) == 2
+
+
+def test_modified_and_deleted_files(temp_docs):
+    """Test that edits are updates and missing files are removals."""
+    docs, manifest_path = temp_docs
+    manifest = IndexManifest(manifest_path)
+    _record_all(manifest, docs)
+
+    (docs / "doc1.md").write_text("# Doc 1\n\nRewritten content.")
+    (docs / "doc2.md").unlink()
+
+    diff = manifest.diff(sorted(docs.glob("*.md")), docs)
+
+    assert diff.updated == [docs / "doc1.md"]
+    assert diff.removed == [str(docs / "doc2.md")]
+    assert manifest.remove(str(docs / "doc2.md")) == ["doc2-0"]
+
+
+def test_changed_fingerprint_marks_manifest_stale(temp_docs):
+    """Test that entries saved under other settings are kept but flagged for re-indexing."""
+    docs, manifest_path = temp_docs
+    _record_all(IndexManifest(manifest_path, fingerprint={"chunk_mode": "chars"}), docs)
+
+    assert not IndexManifest(manifest_path, fingerprint={"chunk_mode": "chars"}).stale
+
+    manifest = IndexManifest(manifest_path, fingerprint={"chunk_mode": "structure"})
+    assert manifest.stale
+    assert manifest.entries[str(docs / "doc1.md")].chunk_ids == ["doc1-0"]
+
+    manifest.save()
+    assert not IndexManifest(manifest_path, fingerprint={"chunk_mode": "structure"}).stale
+
+
+def test_version_1_manifest_is_stale(temp_docs):
+    """Test that manifests written before fingerprints load as stale."""
+    docs, manifest_path = temp_docs
+    _record_all(IndexManifest(manifest_path), docs)
+    data = json.loads(manifest_path.read_text())
+    del data["fingerprint"]
+    manifest_path.write_text(json.dumps({**data, "version": 1}))
+
+    manifest = IndexManifest(manifest_path)
+    assert manifest.stale
+    assert len(manifest.entries) == 2
+
+
+def test_relative_and_absolute_paths_share_entries(temp_docs, monkeypatch):
+    """Test that a relative root maps onto entries recorded under the absolute one."""
+    docs, manifest_path = temp_docs
+    manifest = IndexManifest(manifest_path)
+    _record_all(manifest, docs)
+
+    monkeypatch.chdir(docs.parent)
+    relative = Path("./docs")
+    diff = manifest.diff(sorted(relative.glob("*.md")), relative)
+
+    assert len(diff.unchanged) == 2
+    assert diff.added == diff.removed == []
+
+
+def test_relative_keys_from_older_manifests_are_removed(temp_docs, monkeypatch):
+    """Test that entries keyed by a relative path are replaced by absolute ones."""
+    docs, manifest_path = temp_docs
+    monkeypatch.chdir(docs.parent)
+    data = {
+        "version": 2,
+        "fingerprint": {},
+        "files": {
+            "docs/doc1.md": {"mtime_ns": 0, "size": 0, "sha256": "", "chunk_ids": ["old-0"]},
+        },
+    }
+    manifest_path.write_text(json.dumps(data))
+
+    diff = IndexManifest(manifest_path).diff(sorted(docs.glob("*.md")), Path("docs"))
+
+    assert diff.removed == ["docs/doc1.md"]
+    assert len(diff.added) == 2
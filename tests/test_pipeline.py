@@ -0,0 +1,124 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from doc_index.chunker import MarkdownChunker
+from doc_index.pipeline import IndexingPipeline, PipelineConfig, StageTiming
+
+
+class RecordingEmbedder:
+    """Embedder that returns fixed vectors and records batch sizes."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def embed_batch(self, texts):
+        self.batch_sizes.append(len(texts))
+        return [[0.0] * 4 for _ in texts]
+
+
+class RecordingStore:
+    """Vector store that keeps chunks in memory."""
+
+    batch_size = 500
+
+    def __init__(self):
+        self.chunks = []
+
+    def add_chunks(self, chunks, embeddings):
+        assert len(chunks) == len(embeddings)
+        self.chunks.extend(chunks)
+        return len(chunks)
+
+
+@pytest.fixture
+def temp_docs():
+    """Create temporary doc files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        for i in range(6):
+            (tmpdir / f"doc{i}.md").write_text(f"# Doc {i}\n\n" + "content " * 50)
+        yield tmpdir
+
+
+@pytest.mark.parametrize("read_workers", [1, 2])
+def test_pipeline_indexes_all_files(temp_docs, read_workers):
+    """Test that every file flows through all stages."""
+    store = RecordingStore()
+    pipeline = IndexingPipeline(
+        MarkdownChunker(chunk_size=100, overlap=20),
+        RecordingEmbedder(),
+        store,
+        PipelineConfig(read_workers=read_workers, queue_size=2),
+    )
+
+    result = pipeline.run(sorted(temp_docs.glob("*.md")), discover=StageTiming(0.25, 6))
+
+    assert result.docs == 6
+    assert result.chunks == len(store.chunks) > 6
+    assert {chunk.source for chunk in store.chunks} == {
+        str(path) for path in temp_docs.glob("*.md")
+    }
+    assert list(result.timings()) == ["discover", "read", "embed", "store"]
+    assert result.timings()["discover"] == {"seconds": 0.25, "items": 6}
+    assert result.timings()["store"]["items"] == result.chunks
+    for path in temp_docs.glob("*.md"):
+        indexed = result.files[str(path)]
+        assert (indexed.mtime_ns, indexed.size) == (path.stat().st_mtime_ns, path.stat().st_size)
+
+
+def test_pipeline_batches_embeddings_across_files(temp_docs):
+    """Test that embedding batches span file boundaries."""
+    embedder = RecordingEmbedder()
+    pipeline = IndexingPipeline(
+        MarkdownChunker(chunk_size=100, overlap=20),
+        embedder,
+        RecordingStore(),
+        PipelineConfig(read_workers=1, embed_batch_size=16),
+    )
+
+    pipeline.run(sorted(temp_docs.glob("*.md")))
+
+    assert all(size <= 16 for size in embedder.batch_sizes)
+    assert embedder.batch_sizes[0] == 16
+
+
+def test_pipeline_propagates_stage_errors(temp_docs):
+    """Test that a failing stage raises instead of hanging."""
+
+    class FailingStore(RecordingStore):
+        def add_chunks(self, chunks, embeddings):
+            raise RuntimeError("store down")
+
+    pipeline = IndexingPipeline(
+        MarkdownChunker(chunk_size=100, overlap=20),
+        RecordingEmbedder(),
+        FailingStore(),
+        PipelineConfig(read_workers=1, queue_size=1),
+    )
+
+    with pytest.raises(RuntimeError, match="store down"):
+        pipeline.run(sorted(temp_docs.glob("*.md")))
+
+
+def test_pipeline_streams_large_files(temp_docs):
+    """Test that streamed files produce the same chunks and hashes as whole reads."""
+    (temp_docs / "crlf.md").write_bytes(b"# CRLF\r\n\r\n" + b"line\r\n" * 100)
+    files = sorted(temp_docs.glob("*.md"))
+
+    def run(stream_threshold):
+        store = RecordingStore()
+        pipeline = IndexingPipeline(
+            MarkdownChunker(chunk_size=100, overlap=20),
+            RecordingEmbedder(),
+            store,
+            PipelineConfig(read_workers=1, embed_batch_size=4, stream_threshold=stream_threshold),
+        )
+        return pipeline.run(files), store
+
+    whole, whole_store = run(stream_threshold=1 << 30)
+    streamed, streamed_store = run(stream_threshold=0)
+
+    assert streamed.files == whole.files
+    assert [c.chunk_id for c in streamed_store.chunks] == [c.chunk_id for c in whole_store.chunks]
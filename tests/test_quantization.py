@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from doc_index.quantization import bytes_per_vector, decode_bytes, dequantize, quantize
+
+
+@pytest.fixture
+def embeddings():
+    """Random embeddings with varied magnitudes."""
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal((20, 64)) * rng.uniform(0.1, 10, (20, 1))).astype(np.float32)
+
+
+def test_int8_uses_per_vector_scale(embeddings):
+    """Test that INT8 codes use the full range of every vector."""
+    codes, scales = quantize(embeddings, "INT8")
+
+    assert codes.dtype == np.int8
+    assert np.all(np.abs(codes).max(axis=1) == 127)
+    error = np.abs(dequantize(codes, scales) - embeddings).max(axis=1)
+    assert np.all(error <= scales / 2 + 1e-6)
+
+
+def test_float16_round_trip(embeddings):
+    """Test that FLOAT16 halves the size with small error."""
+    encoded, scales = quantize(embeddings, "FLOAT16")
+
+    assert scales is None
+    assert encoded.nbytes == embeddings.nbytes // 2
+    np.testing.assert_allclose(dequantize(encoded), embeddings, rtol=1e-3)
+
+
+def test_decode_bytes_matches_dequantize(embeddings):
+    """Test decoding a single stored blob."""
+    codes, scales = quantize(embeddings[:1], "INT8")
+
+    vector = decode_bytes(codes[0].tobytes(), "INT8", float(scales[0]))
+
+    np.testing.assert_allclose(vector, dequantize(codes, scales)[0])
+
+
+def test_zero_vector_quantizes_to_zero():
+    """Test that an all-zero vector doesn't divide by zero."""
+    codes, scales = quantize([[0.0, 0.0]], "INT8")
+
+    assert codes.tolist() == [[0, 0]]
+    assert scales.tolist() == [1.0]
+
+
+def test_bytes_per_vector():
+    """Test stored sizes per precision."""
+    assert bytes_per_vector(768, "FLOAT32") == 3072
+    assert bytes_per_vector(768, "FLOAT16") == 1536
+    assert bytes_per_vector(768, "INT8") == 772
@@ -0,0 +1,69 @@
+import sys
+
+import pytest
+
+from doc_index.chunker import MarkdownChunker
+from doc_index.tokenizer import EstimatingTokenizer, load_tokenizer
+
+
+class CountingTokenizer(EstimatingTokenizer):
+    """Estimator that counts how often it is called."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def token_offsets(self, text):
+        self.calls += 1
+        return super().token_offsets(text)
+
+
+def test_estimator_offsets():
+    """Test that the estimator splits words and punctuation."""
+    tokenizer = EstimatingTokenizer()
+
+    offsets = tokenizer.token_offsets("Hello, tokenization!")
+
+    assert offsets == [0, 4, 5, 7, 11, 15, 19]
+
+
+def test_load_tokenizer_defaults_to_estimator():
+    """Test that no tokenizer path gives the estimator."""
+    assert isinstance(load_tokenizer(), EstimatingTokenizer)
+
+
+def test_load_tokenizer_falls_back_without_tokenizers(monkeypatch, tmp_path):
+    """Test fallback to the estimator when tokenizers is not installed."""
+    monkeypatch.setitem(sys.modules, "tokenizers", None)
+
+    with pytest.warns(UserWarning, match="falling back"):
+        tokenizer = load_tokenizer(tmp_path / "tokenizer.json")
+
+    assert isinstance(tokenizer, EstimatingTokenizer)
+
+
+def test_token_windows_respect_budget():
+    """Test that token-sized chunks hold at most chunk_size tokens."""
+    tokenizer = CountingTokenizer()
+    chunker = MarkdownChunker(chunk_size=20, overlap=5, tokenizer=tokenizer)
+    content = "word " * 200
+
+    chunks = chunker.chunk(content, source="test.md")
+
+    assert tokenizer.calls == 1
+    assert len(chunks) > 1
+    assert all(chunk.metadata["token_count"] <= 20 for chunk in chunks)
+    assert chunks[0].content.endswith("word ")
+    assert chunks[1].start_pos < chunks[0].end_pos  # overlap
+
+
+def test_structure_mode_counts_tokens():
+    """Test that structure mode measures sections in tokens."""
+    tokenizer = CountingTokenizer()
+    chunker = MarkdownChunker(chunk_size=12, mode="structure", tokenizer=tokenizer)
+    content = "# One\n\nalpha beta gamma\n\n# Two\n\ndelta epsilon zeta\n"
+
+    chunks = chunker.chunk(content, source="test.md")
+
+    assert tokenizer.calls == 1
+    assert [chunk.metadata["heading_path"] for chunk in chunks] == [["One"], ["Two"]]
+    assert all(chunk.metadata["token_count"] <= 12 for chunk in chunks)
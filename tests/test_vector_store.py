@@ -1,7 +1,13 @@
+import asyncio
+
 import pytest
 
 from doc_index.chunker import DocumentChunk
-from doc_index.vector_store import DragonflyVectorStore
+from doc_index.vector_store import (
+    AsyncDragonflyVectorStore,
+    DragonflyVectorStore,
+    schema_attributes,
+)
 
 
 @pytest.fixture
@@ -23,6 +29,37 @@ def test_create_index(vector_store):
     assert vector_store.index_exists()
 
 
+def test_schema_attributes():
+    """Test reading field names from current and older FT.INFO replies."""
+    current = [
+        "index_name", "docs",
+        "attributes", [
+            ["identifier", "source", "attribute", "source", "type", "TEXT"],
+            ["identifier", "source", "attribute", "source_tag", "type", "TAG"],
+        ],
+    ]
+    older = ["index_name", "docs", "fields", [["chunk_id", "type", "TEXT"]]]
+
+    assert schema_attributes(current) == {"source", "source_tag"}
+    assert schema_attributes(older) == {"chunk_id"}
+
+
+def test_create_index_adds_source_tag_to_older_index(vector_store):
+    """Test that an index built without source_tag gains it, so source filters work."""
+    command = vector_store._create_index_command(4)
+    tag = command.index("source_tag")
+    vector_store.client.execute_command(*command[:tag - 2], *command[tag + 2:])
+
+    vector_store.create_index(dimension=4)
+    vector_store.add_chunks(
+        [DocumentChunk("a", "docs/a.md", "A", 0, 1), DocumentChunk("b", "src/b.md", "B", 0, 1)],
+        [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0]],
+    )
+
+    results = vector_store.search([0.0, 1.0, 0.0, 0.0], top_k=2, source_prefix="docs/")
+    assert [r["chunk_id"] for r in results] == ["a"]
+
+
 def test_add_chunks(vector_store):
     """Test adding chunks with embeddings."""
     vector_store.create_index(dimension=768)
@@ -68,3 +105,109 @@ def test_search_similarity(vector_store):
     assert len(results) <= 2
     assert "chunk_id" in results[0]
     assert "score" in results[0]
+
+
+def test_add_chunks_batched(vector_store):
+    """Test bulk adding chunks through pipelined batches."""
+    vector_store.create_index(dimension=768)
+
+    chunks = [
+        DocumentChunk(f"batch-{i}", "test.md", f"Content {i}", i * 10, i * 10 + 9)
+        for i in range(5)
+    ]
+    embeddings = [[0.1 * (i + 1)] * 768 for i in range(5)]
+
+    written = vector_store.add_chunks(chunks, embeddings, batch_size=2)
+
+    assert written == 5
+    stats = vector_store.get_write_stats()
+    assert stats["chunks_written"] == 5
+    assert stats["batches_written"] == 3
+
+    results = vector_store.search(embeddings[0], top_k=5)
+    assert len(results) == 5
+
+
+def test_add_chunks_length_mismatch(vector_store):
+    """Test that mismatched chunks and embeddings are rejected."""
+    chunks = [DocumentChunk("id-1", "test.md", "Content 1", 0, 9)]
+
+    with pytest.raises(ValueError):
+        vector_store.add_chunks(chunks, [])
+
+
+def test_delete_chunks(vector_store):
+    """Test deleting chunks by ID."""
+    vector_store.create_index(dimension=768)
+
+    chunks = [
+        DocumentChunk("del-1", "test.md", "Content 1", 0, 9),
+        DocumentChunk("del-2", "test.md", "Content 2", 10, 19),
+    ]
+    vector_store.add_chunks(chunks, [[0.1] * 768, [0.5] * 768])
+
+    assert vector_store.delete_chunks(["del-1", "missing"]) == 1
+
+    results = vector_store.search([0.1] * 768, top_k=5)
+    assert [r["chunk_id"] for r in results] == ["del-2"]
+
+
+def test_collect_garbage(vector_store):
+    """Test that keys outside the live set are removed."""
+    vector_store.create_index(dimension=768)
+
+    chunks = [
+        DocumentChunk("live", "test.md", "Content 1", 0, 9),
+        DocumentChunk("orphan", "test.md", "Content 2", 10, 19),
+    ]
+    vector_store.add_chunks(chunks, [[0.1] * 768, [0.5] * 768])
+
+    assert vector_store.collect_garbage({"live"}) == 1
+
+    results = vector_store.search([0.1] * 768, top_k=5)
+    assert [r["chunk_id"] for r in results] == ["live"]
+
+
+def test_search_ids_only_and_fetch(vector_store):
+    """Test ID-only search with lazily fetched fields."""
+    vector_store.create_index(dimension=768)
+    vector_store.add_chunk(DocumentChunk("id-1", "test.md", "Content 1", 0, 9), [0.1] * 768)
+
+    results = vector_store.search([0.1] * 768, top_k=1, fields=())
+    assert set(results[0]) == {"chunk_id", "score"}
+
+    fetched = vector_store.fetch(["id-1", "missing"], fields=("content",))
+    assert fetched == [{"chunk_id": "id-1", "content": "Content 1"}, None]
+
+
+def test_stats_persist_until_index_deleted(vector_store):
+    """Test that saved stats are read back in one call and dropped with the index."""
+    vector_store.create_index(dimension=768)
+    vector_store.save_stats({"docs": 2, "chunks": 5})
+
+    assert vector_store.load_stats() == {"docs": 2, "chunks": 5}
+    vector_store.delete_index()
+    assert vector_store.load_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_async_store_matches_sync_store():
+    """Test concurrent async writes and searches against the same index."""
+    store = AsyncDragonflyVectorStore(index_name="test_async_docs", batch_size=2)
+    await store.create_index(dimension=4)
+
+    chunks = [DocumentChunk(f"id-{i}", "test.md", f"Content {i}", 0, 9) for i in range(5)]
+    embeddings = [[float(i == j % 4) for i in range(4)] for j in range(5)]
+    try:
+        assert await store.add_chunks(chunks, embeddings) == 5
+        first, second = await asyncio.gather(
+            store.search([1.0, 0.0, 0.0, 0.0], top_k=1),
+            store.search([0.0, 1.0, 0.0, 0.0], top_k=1, fields=()),
+        )
+
+        assert first[0]["chunk_id"] in {"id-0", "id-4"}
+        assert set(second[0]) == {"chunk_id", "score"}
+        assert await store.delete_chunks(["id-0", "missing"]) == 1
+    finally:
+        await store.delete_index()
+        await store.aclose()